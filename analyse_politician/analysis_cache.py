@@ -0,0 +1,272 @@
+"""
+Spaltenorientierter Cache der Mandatstabelle aus BundestagAnalyzer.
+
+Die Tabelle (eine Zeile pro Mandat) wird einmal aus Neo4j geladen, mit den
+Features aus prepare_data angereichert und pro Wahlperiode als Parquet-Datei
+gespeichert. Bei einem Refresh werden nur Perioden neu geladen, deren
+Fingerprint im Graphen sich geändert hat.
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_CACHE_DIR = HERE / "data" / "mandates"
+MANIFEST = "manifest.json"
+# Erhöhen, wenn sich add_features ändert: ein Manifest mit anderer Version
+# verwirft den Cache und alle Perioden werden neu geladen
+# 2: is_academic bleibt ohne DQR-Niveau leer (statt False)
+# 3: Fingerprint ist ein sha1 über die Zeilenwerte statt Zählern/Summen
+CACHE_VERSION = 3
+
+CURRENT_YEAR = 2025
+
+MANDATE_QUERY = """
+MATCH (p:Politician)-[:HAS_MANDATE]->(m:Mandate)
+MATCH (m)-[:IN_PERIOD]->(period:Period)
+WHERE period.number IN $periods
+MATCH (m)-[:AFFILIATED_WITH]->(party:Party)
+OPTIONAL MATCH (m)-[:REPRESENTS_STATE]->(state:State)
+OPTIONAL MATCH (m)-[:REPRESENTS_CONSTITUENCY]->(const:Constituency)
+OPTIONAL MATCH (p)-[:HAS_CLASSIFICATION]->(c:Classification)
+RETURN
+    m.id as mandate_id,
+    p.detail_page as detail_page,
+    p.firstname as firstname,
+    p.lastname as lastname,
+    p.full_name as full_name,
+    p.birth_year as birth_year,
+    p.death_year as death_year,
+    p.geschlecht as geschlecht,
+    p.geschlecht_confidence as geschlecht_confidence,
+    period.name as period_name,
+    period.number as period_number,
+    period.start_jahr as period_start_year,
+    period.ende_jahr as period_end_year,
+    period.dauer as period_duration,
+    party.name as party_name,
+    state.name as state_name,
+    const.name as constituency_name,
+    party.id as party_id,
+    state.id as state_id,
+    const.id as constituency_id,
+    m.political_party as mandate_party,
+    m.constituency as mandate_constituency,
+    m.federate_state as mandate_state,
+    c.dqr_level as dqr_level,
+    c.confidence as classification_confidence,
+    c.comment as classification_comment
+"""
+
+# Änderungs-Fingerprint pro Periode: die Rohwerte aller Spalten aus MANDATE_QUERY
+# (ohne die Features), gehasht in _fingerprint. Zähler und Summen übersahen
+# z.B. einen Parteiwechsel oder zwei gegenläufig geänderte DQR-Niveaus.
+FINGERPRINT_QUERY = """
+MATCH (p:Politician)-[:HAS_MANDATE]->(m:Mandate)-[:IN_PERIOD]->(period:Period)
+OPTIONAL MATCH (m)-[:AFFILIATED_WITH]->(party:Party)
+OPTIONAL MATCH (m)-[:REPRESENTS_STATE]->(state:State)
+OPTIONAL MATCH (m)-[:REPRESENTS_CONSTITUENCY]->(const:Constituency)
+OPTIONAL MATCH (p)-[:HAS_CLASSIFICATION]->(c:Classification)
+WITH period, [m.id, p.detail_page, p.firstname, p.lastname, p.full_name,
+              p.birth_year, p.death_year, p.geschlecht, p.geschlecht_confidence,
+              party.id, party.name, state.id, state.name, const.id, const.name,
+              m.political_party, m.federate_state, m.constituency,
+              c.dqr_level, c.confidence, c.comment] AS row
+RETURN period.number AS period_number,
+       [period.name, period.start_jahr, period.ende_jahr, period.dauer] AS period,
+       collect(row) AS rows
+"""
+
+CATEGORICAL_COLUMNS = [
+    'firstname', 'lastname', 'full_name', 'geschlecht', 'period_name',
+    'party_name', 'state_name', 'constituency_name',
+    'mandate_party', 'mandate_constituency', 'mandate_state',
+    'gender_normalized', 'gender_confidence_category', 'party_category', 'party_union',
+    'education_category', 'period_epoch', 'generation',
+]
+NULLABLE_INT_COLUMNS = {
+    'birth_year': 'Int16',
+    'death_year': 'Int16',
+    'period_number': 'Int8',
+    'party_id': 'Int16',
+    'state_id': 'Int8',
+    'constituency_id': 'Int16',
+    'period_start_year': 'Int16',
+    'period_end_year': 'Int16',
+    'period_duration': 'Int8',
+    'dqr_level': 'Int8',
+    'age_at_period_start': 'Int16',
+    'age_at_period_end': 'Int16',
+    'age_at_mandate': 'Int16',
+    'current_age': 'Int16',
+}
+FLOAT_COLUMNS = ['geschlecht_confidence', 'classification_confidence']
+BOOLEAN_COLUMNS = ['is_deceased', 'is_academic']
+
+_GENDER_MAP = {
+    'm': 'Männlich', 'male': 'Männlich', 'mann': 'Männlich', 'männlich': 'Männlich',
+    'f': 'Weiblich', 'w': 'Weiblich', 'female': 'Weiblich', 'frau': 'Weiblich', 'weiblich': 'Weiblich',
+}
+
+
+def _to_int(series, dtype):
+    return pd.to_numeric(series, errors='coerce').round().astype(dtype)
+
+
+def add_features(df):
+    """Vektorisierte Fassung von prepare_data aus 02_analyse_data.ipynb"""
+    for col, dtype in NULLABLE_INT_COLUMNS.items():
+        if col in df.columns:
+            df[col] = _to_int(df[col], dtype)
+    # float64 bis nach den Klassengrenzen: float32(0.9) < 0.9 landete sonst in der Klasse darunter
+    for col in FLOAT_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors='coerce').astype('float64')
+
+    df['age_at_period_start'] = (df['period_start_year'] - df['birth_year']).astype('Int16')
+    df['age_at_period_end'] = (df['period_end_year'] - df['birth_year']).astype('Int16')
+    df['age_at_mandate'] = df['age_at_period_start']
+    df['current_age'] = (CURRENT_YEAR - df['birth_year']).astype('Int16')
+    df['is_deceased'] = df['death_year'].notna()
+
+    gender = df['geschlecht'].astype('string').str.lower()
+    df['gender_normalized'] = gender.map(_GENDER_MAP).fillna('Divers/Unbekannt')
+    df.loc[df['geschlecht'].isna(), 'gender_normalized'] = 'Unbekannt'
+
+    df['gender_confidence_category'] = pd.cut(
+        df['geschlecht_confidence'], [-np.inf, 0.7, 0.8, 0.9, np.inf], right=False,
+        labels=['Niedrig (<0.7)', 'Mittel (0.7-0.79)', 'Hoch (0.8-0.89)', 'Sehr hoch (≥0.9)'],
+    ).cat.add_categories('Unbekannt').fillna('Unbekannt')
+
+    df['party_category'] = df['party_name'].fillna('Unbekannt')
+    df['party_union'] = df['party_category'].where(~df['party_category'].isin(['CDU', 'CSU']), 'CDU/CSU')
+
+    df['education_category'] = pd.cut(
+        df['dqr_level'].astype('float'), [-np.inf, 2, 4, 5, 6, 7, np.inf],
+        labels=['Grundbildung (DQR 1-2)', 'Berufliche Bildung (DQR 3-4)', 'Berufliche Spezialisierung (DQR 5)',
+                'Bachelor/Meister (DQR 6)', 'Master (DQR 7)', 'Promotion (DQR 8)'],
+    ).cat.add_categories('Unbekannt').fillna('Unbekannt')
+    # <NA> ohne DQR-Niveau, damit Anteile nur über klassifizierte Mandate gebildet werden
+    df['is_academic'] = (df['dqr_level'] >= 6).astype('boolean')
+
+    df['period_epoch'] = pd.cut(
+        df['period_start_year'].astype('float'), [-np.inf, 1961, 1969, 1982, 1998, 2013, np.inf], right=False,
+        labels=['Adenauer-Ära (1949-1961)', 'Erhard/Kiesinger (1961-1969)', 'Brandt/Schmidt (1969-1982)',
+                'Kohl-Ära (1982-1998)', 'Schröder/Merkel I (1998-2013)', 'Merkel II/Scholz (2013-heute)'],
+    ).cat.add_categories('Unbekannt').fillna('Unbekannt')
+    df['generation'] = pd.cut(
+        df['birth_year'].astype('float'), [-np.inf, 1930, 1945, 1965, 1980, 1995, np.inf], right=False,
+        labels=['Vorkriegsgeneration (vor 1930)', 'Kriegsgeneration (1930-1944)', 'Babyboomer (1945-1964)',
+                'Generation X (1965-1979)', 'Millennials (1980-1994)', 'Generation Z (ab 1995)'],
+    ).cat.add_categories('Unbekannt').fillna('Unbekannt')
+
+    for col in FLOAT_COLUMNS:
+        df[col] = df[col].astype('float32')
+    return apply_dtypes(df)
+
+
+def apply_dtypes(df):
+    for col in CATEGORICAL_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('category')
+    for col, dtype in NULLABLE_INT_COLUMNS.items():
+        if col in df.columns:
+            df[col] = df[col].astype(dtype)
+    for col in BOOLEAN_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype('boolean')
+    return df
+
+
+def _fingerprint(record):
+    """sha1 über Periodendaten und die sortierten Zeilen (Reihenfolge aus Neo4j ist nicht fest)"""
+    digest = hashlib.sha1(json.dumps(record["period"], default=str).encode("utf-8"))
+    for line in sorted(json.dumps(row, ensure_ascii=False, default=str) for row in record["rows"]):
+        digest.update(line.encode("utf-8"))
+        digest.update(b"\n")
+    return digest.hexdigest()
+
+
+def _period_file(cache_dir, period_number):
+    return Path(cache_dir) / f"mandates_p{int(period_number):02d}.parquet"
+
+
+def _load_manifest(cache_dir):
+    """Fingerprints pro Periode; leer, wenn der Cache mit einer anderen CACHE_VERSION gebaut wurde"""
+    path = Path(cache_dir) / MANIFEST
+    if path.exists():
+        with open(path, encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("version") == CACHE_VERSION:
+            return manifest["periods"]
+        print(f"♻️ Cache-Version {manifest.get('version', 1)} veraltet (aktuell {CACHE_VERSION}), baue neu")
+    return {}
+
+
+def _save_manifest(cache_dir, manifest):
+    path = Path(cache_dir) / MANIFEST
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "periods": manifest}, f, indent=1)
+    os.replace(tmp, path)
+
+
+def refresh_cache(driver, cache_dir=DEFAULT_CACHE_DIR, force=False):
+    """
+    Aktualisiert den Parquet-Cache; nur Perioden mit geändertem Fingerprint werden neu geladen.
+
+    Returns:
+        list: Perioden, deren Datei neu geschrieben oder gelöscht wurde
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = _load_manifest(cache_dir)
+
+    with driver.session() as session:
+        current = {
+            str(r["period_number"]): _fingerprint(r)
+            for r in session.run(FINGERPRINT_QUERY)
+            if r["period_number"] is not None
+        }
+        numbers = {str(r["period_number"]): r["period_number"] for r in session.run(
+            "MATCH (period:Period) RETURN DISTINCT period.number AS period_number")}
+
+        changed = [p for p, fp in current.items()
+                   if force or manifest.get(p) != fp or not _period_file(cache_dir, p).exists()]
+        removed = [p for p in manifest if p not in current]
+
+        for period in changed:
+            records = session.run(MANDATE_QUERY, periods=[numbers.get(period, period)])
+            df = pd.DataFrame([record.data() for record in records])
+            manifest[period] = current[period]
+            if df.empty:
+                _period_file(cache_dir, period).unlink(missing_ok=True)
+                continue
+            df = add_features(df)
+            df.to_parquet(_period_file(cache_dir, period), index=False, compression="zstd")
+            print(f"✅ Periode {period}: {len(df)} Mandate gecacht")
+
+    for period in removed:
+        _period_file(cache_dir, period).unlink(missing_ok=True)
+        manifest.pop(period)
+
+    _save_manifest(cache_dir, manifest)
+    print(f"🔄 Cache aktuell: {len(changed)} Perioden neu, {len(removed)} entfernt, "
+          f"{len(current) - len(changed)} unverändert")
+    return changed + removed
+
+
+def load_mandates(cache_dir=DEFAULT_CACHE_DIR, periods=None, columns=None):
+    """Lädt die Mandatstabelle (optional nur bestimmte Perioden/Spalten) aus dem Cache"""
+    files = sorted(Path(cache_dir).glob("mandates_p*.parquet"))
+    if periods is not None:
+        wanted = {_period_file(cache_dir, p).name for p in periods}
+        files = [f for f in files if f.name in wanted]
+    if not files:
+        return pd.DataFrame(columns=columns)
+    dictionary_cols = [c for c in CATEGORICAL_COLUMNS if columns is None or c in columns]
+    table = pq.read_table([str(f) for f in files], columns=columns, read_dictionary=dictionary_cols)
+    return apply_dtypes(table.to_pandas())
@@ -0,0 +1,287 @@
+"""
+Regelbasierte Geschlechtsbestimmung mit Cache; nur unklare Fälle gehen an das LLM.
+
+Reihenfolge der Signale:
+1. Persistenter Cache (bereits bestimmte Politiker)
+2. Vornamen-Tabelle aus bereits klassifizierten Politikern + mitgelieferter Namensliste
+3. Signale aus dem Einleitungsabschnitt ("Politikerin", "eine deutsche", sie/er-Zählung)
+4. LLM (pydantic_ai-Agent), nebenläufig und nur für mehrdeutige Fälle
+"""
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+from neo4j import GraphDatabase
+
+HERE = Path(__file__).resolve().parent
+BUNDLED_NAMES_FILE = HERE / "data" / "vornamen_de.json"
+CLASSIFIED_RESULTS_FILE = HERE / "gender_detection_results.json"
+DEFAULT_CACHE_FILE = HERE / "data" / "gender_cache.json"
+# completion_cache.py (persistenter Cache für LLM-Antworten) liegt beim Enrichment
+ENRICHMENT_DIR = HERE.parent / "llm_enrichment" / "pythonProject1"
+
+MALE, FEMALE, UNKNOWN = "männlich", "weiblich", "unbekannt"
+
+# Ein Vorname gilt als eindeutig, wenn er so oft und so dominant vorkommt
+MIN_NAME_COUNT = 2
+MIN_NAME_SHARE = 0.95
+
+_FEMALE_PATTERNS = re.compile(
+    r"\b(Politikerin|(?:die|eine) Abgeordnete|Juristin|Ministerin|Lehrerin|ist eine deutsche|war eine deutsche)\b"
+)
+_MALE_PATTERNS = re.compile(
+    r"\b(Politiker(?!in)|Abgeordneter|Jurist(?!in)|Minister(?!in)|Lehrer(?!in)|ist ein deutscher|war ein deutscher)\b"
+)
+_SIE = re.compile(r"\b[Ss]ie\b")
+_ER = re.compile(r"\b[Ee]r\b")
+
+POLITICIANS_QUERY = """
+MATCH (p:Politician)
+OPTIONAL MATCH (p)-[:HAS_CONTENT]->(c:Content {section_header: '#'})
+WITH p, head(collect(c)) AS lead
+RETURN p.detail_page AS detail_page,
+       p.full_name AS full_name,
+       p.firstname AS firstname,
+       p.lastname AS lastname,
+       substring(lead.section_content, 0, 500) AS content_preview,
+       p.geschlecht AS current_gender
+ORDER BY p.full_name
+"""
+
+
+def _first_name(politician):
+    name = politician.get("firstname") or (politician.get("full_name") or "").split(" ")[0]
+    return name.split()[0].split("-")[0].strip() if name and name.split() else None
+
+
+def build_name_table(classified=None, bundled_file=BUNDLED_NAMES_FILE):
+    """
+    Baut die Vornamen-Tabelle: Vorname -> Geschlecht (nur eindeutige Namen).
+
+    Args:
+        classified: Iterable von Dicts mit full_name/firstname und geschlecht
+                    (Standard: gender_detection_results.json)
+        bundled_file: Mitgelieferte Namensliste {"weiblich": [...], "männlich": [...]}
+    """
+    counts = defaultdict(Counter)
+    if classified is None and CLASSIFIED_RESULTS_FILE.exists():
+        with open(CLASSIFIED_RESULTS_FILE, encoding="utf-8") as f:
+            classified = json.load(f)
+    for entry in classified or []:
+        name = _first_name(entry)
+        if name and entry.get("geschlecht") in (MALE, FEMALE):
+            counts[name][entry["geschlecht"]] += 1
+
+    table = {}
+    for name, genders in counts.items():
+        gender, n = genders.most_common(1)[0]
+        if n >= MIN_NAME_COUNT and n / sum(genders.values()) >= MIN_NAME_SHARE:
+            table[name] = gender
+
+    with open(bundled_file, encoding="utf-8") as f:
+        bundled = json.load(f)
+    for gender, names in bundled.items():
+        for name in names:
+            # Die Liste ergänzt die Daten; nur wenn deren Mehrheit widerspricht
+            # (oder kein Geschlecht überwiegt), gilt der Name als mehrdeutig
+            genders = counts.get(name)
+            if genders and genders[gender] <= sum(genders.values()) - genders[gender]:
+                table.pop(name, None)
+            else:
+                table.setdefault(name, gender)
+    return table
+
+
+def bio_signal(text):
+    """Geschlechtssignal aus dem Einleitungsabschnitt: (Geschlecht | None, Stärke 0..1)"""
+    if not text:
+        return None, 0.0
+    female = len(_FEMALE_PATTERNS.findall(text))
+    male = len(_MALE_PATTERNS.findall(text))
+    if female and not male:
+        return FEMALE, 0.9
+    if male and not female:
+        return MALE, 0.9
+    # Schwaches Signal: Pronomen (sie ist auch Plural, daher deutliche Mehrheit nötig)
+    sie, er = len(_SIE.findall(text)), len(_ER.findall(text))
+    if er >= 2 and sie == 0:
+        return MALE, 0.6
+    if sie >= 3 and er == 0:
+        return FEMALE, 0.6
+    return None, 0.0
+
+
+def resolve_without_llm(politician, name_table):
+    """Regelbasierte Auflösung; None, wenn der Fall mehrdeutig ist"""
+    by_name = name_table.get(_first_name(politician) or "")
+    by_bio, strength = bio_signal(politician.get("content_preview"))
+
+    if by_name and by_bio and by_name != by_bio:
+        return None
+    if by_name and by_bio:
+        return {"geschlecht": by_name, "confidence": 0.99, "source": "name+bio"}
+    if by_name:
+        return {"geschlecht": by_name, "confidence": 0.95, "source": "name"}
+    if by_bio and strength >= 0.9:
+        return {"geschlecht": by_bio, "confidence": strength, "source": "bio"}
+    return None
+
+
+def load_cache(path=DEFAULT_CACHE_FILE):
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_cache(cache, path=DEFAULT_CACHE_FILE):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, ensure_ascii=False, indent=1)
+    os.replace(tmp, path)
+
+
+def _prompt(pol):
+    return f"""
+        Name: {pol['full_name']}
+        Vorname: {pol['firstname'] or 'Unbekannt'}
+        Nachname: {pol['lastname'] or 'Unbekannt'}
+
+        Beschreibung: {pol['content_preview'] if pol['content_preview'] else 'Keine Beschreibung verfügbar'}
+
+        Bestimme das Geschlecht dieser Person.
+        """
+
+
+def _use_enrichment_modules():
+    """Macht completion_cache, neo4j_writer usw. aus llm_enrichment/pythonProject1 importierbar"""
+    if str(ENRICHMENT_DIR) not in sys.path:
+        sys.path.append(str(ENRICHMENT_DIR))
+
+
+def _agent_runner(agent, completion_cache, system_prompt):
+    """agent.run(prompt).output, bei gesetztem completion_cache über cached_agent_run"""
+    if completion_cache is None:
+        async def run(prompt):
+            return (await agent.run(prompt)).output
+        return run
+
+    if system_prompt is None:
+        raise ValueError("completion_cache braucht den system_prompt des Agenten (Teil des Cache-Schlüssels)")
+    _use_enrichment_modules()
+    from completion_cache import cached_agent_run
+
+    async def run(prompt):
+        return await cached_agent_run(agent, prompt, completion_cache, system_prompt)
+    return run
+
+
+async def _ask_llm(agent, politicians, max_concurrency, completion_cache=None, system_prompt=None):
+    semaphore = asyncio.Semaphore(max_concurrency)
+    run = _agent_runner(agent, completion_cache, system_prompt)
+
+    async def one(pol):
+        async with semaphore:
+            try:
+                output = await run(_prompt(pol))
+                return pol, {"geschlecht": output.geschlecht,
+                             "confidence": output.confidence,
+                             "source": "llm"}
+            except Exception as e:
+                print(f"      ❌ Fehler bei {pol['full_name']}: {e}")
+                return pol, None
+
+    return await asyncio.gather(*(one(pol) for pol in politicians))
+
+
+async def resolve_genders(politicians, agent=None, name_table=None, cache_path=DEFAULT_CACHE_FILE,
+                          max_concurrency=16, completion_cache=None, system_prompt=None):
+    """
+    Bestimmt das Geschlecht für alle Politiker; das LLM nur für mehrdeutige Fälle.
+
+    Args:
+        politicians: Dicts mit detail_page, full_name, firstname, lastname, content_preview
+        agent: pydantic_ai-Agent mit output_type PoliticianGender (None = keine LLM-Aufrufe)
+        name_table: Vornamen-Tabelle (Standard: build_name_table())
+        cache_path: Pfad des persistenten Caches
+        max_concurrency: Maximale Anzahl gleichzeitiger LLM-Anfragen
+        completion_cache: Optionaler CompletionCache (completion_cache.py); identische
+                          Anfragen werden dann nicht erneut an das LLM geschickt
+        system_prompt: instructions des Agenten (Pflicht mit completion_cache)
+
+    Returns:
+        (results, stats): results = {detail_page: {...}}, stats = Zähler + Laufzeit
+    """
+    start = time.perf_counter()
+    name_table = name_table if name_table is not None else build_name_table()
+    cache = load_cache(cache_path)
+    sources = Counter()
+    results = {}
+    ambiguous = []
+
+    for pol in politicians:
+        key = pol["detail_page"]
+        if key in cache:
+            results[key] = cache[key]
+            sources["cache"] += 1
+            continue
+        resolved = resolve_without_llm(pol, name_table)
+        if resolved:
+            results[key] = cache[key] = resolved
+            sources[resolved["source"]] += 1
+        else:
+            ambiguous.append(pol)
+
+    if ambiguous and agent is not None:
+        for pol, resolved in await _ask_llm(agent, ambiguous, max_concurrency, completion_cache, system_prompt):
+            if resolved:
+                results[pol["detail_page"]] = cache[pol["detail_page"]] = resolved
+                sources["llm"] += 1
+            else:
+                sources["llm_error"] += 1
+    else:
+        sources["unresolved"] += len(ambiguous)
+
+    save_cache(cache, cache_path)
+
+    total = len(politicians)
+    llm_calls = sources["llm"] + sources["llm_error"]
+    stats = {
+        "total": total,
+        "sources": dict(sources),
+        "llm_calls": llm_calls,
+        "llm_calls_avoided": total - llm_calls,
+        "runtime_seconds": time.perf_counter() - start,
+    }
+    print(f"🎯 {total} Politiker: {llm_calls} LLM-Aufrufe, {stats['llm_calls_avoided']} vermieden "
+          f"({dict(sources)}) in {stats['runtime_seconds']:.1f} s")
+    return results, stats
+
+
+def fetch_politicians(driver):
+    with driver.session() as session:
+        return [record.data() for record in session.run(POLITICIANS_QUERY)]
+
+
+async def run_gender_enrichment(uri, auth, agent=None, only_missing=True, max_concurrency=16,
+                                completion_cache=None, system_prompt=None):
+    """Kompletter Lauf: laden, auflösen, zurückschreiben (über neo4j_writer.push_genders)"""
+    _use_enrichment_modules()
+    from neo4j_writer import push_genders
+
+    driver = GraphDatabase.driver(uri, auth=auth)
+    try:
+        politicians = fetch_politicians(driver)
+        if only_missing:
+            politicians = [p for p in politicians if not p["current_gender"]]
+        results, stats = await resolve_genders(politicians, agent=agent, max_concurrency=max_concurrency,
+                                               completion_cache=completion_cache, system_prompt=system_prompt)
+        push_genders(driver, ({**r, "detail_page": key} for key, r in results.items()))
+        return stats
+    finally:
+        driver.close()
@@ -0,0 +1,173 @@
+"""
+Vorberechnete Aggregat-Tabellen für die Standardauswertungen aus 02_analyse_data.ipynb.
+
+Die Rollups enthalten nur additive Größen (Anzahlen und Summen) pro Wahlperiode,
+Anteile und Mittelwerte werden erst beim Lesen gebildet. Dadurch lassen sich
+geänderte Perioden einzeln neu berechnen und ersetzen, ohne den Rest anzufassen.
+"""
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from analysis_cache import DEFAULT_CACHE_DIR, load_mandates, refresh_cache
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_ROLLUP_DIR = HERE / "data" / "rollups"
+
+PERIOD_KEYS = ['period_number', 'period_start_year']
+
+# Rollup-Name -> zusätzliche Gruppierungsspalten (immer pro Periode)
+ROLLUPS = {
+    'gender': ['gender_normalized'],
+    'party_gender': ['party_union', 'gender_normalized'],
+    'dqr': ['gender_normalized', 'dqr_level'],
+}
+
+SOURCE_COLUMNS = [
+    'detail_page', 'period_number', 'period_start_year', 'gender_normalized', 'party_union',
+    'dqr_level', 'is_academic', 'age_at_mandate',
+]
+
+
+def _measures(df):
+    """Additive Kennzahlen pro Zeile; Summen davon ergeben die Rollups"""
+    age = df['age_at_mandate'].astype('float')
+    return pd.DataFrame({
+        'mandates': 1,
+        'dqr_known': df['dqr_level'].notna().astype('int32'),
+        'academic': df['is_academic'].fillna(False).astype('int32'),
+        'phd': (df['dqr_level'] == 8).fillna(False).astype('int32'),
+        'age_known': age.notna().astype('int32'),
+        'age_sum': age.fillna(0.0),
+    }, index=df.index)
+
+
+def compute_rollups(df):
+    """Berechnet alle Rollups aus einem Mandats-DataFrame (beliebige Teilmenge von Perioden)"""
+    measures = _measures(df)
+    rollups = {}
+    for name, keys in ROLLUPS.items():
+        frame = pd.concat([df[PERIOD_KEYS + keys], measures], axis=1)
+        if name == 'dqr':
+            frame = frame[frame['dqr_level'].notna()]
+        rollups[name] = (
+            frame.groupby(PERIOD_KEYS + keys, observed=True, dropna=False)
+            .sum()
+            .reset_index()
+        )
+    return rollups
+
+
+def compute_first_mandates(df):
+    """Ein Eintrag pro Politiker: erste Periode und Alter beim ersten Mandat"""
+    first = df.sort_values(['period_start_year', 'period_number']).drop_duplicates('detail_page')
+    return first[['detail_page', 'gender_normalized', 'period_start_year', 'age_at_mandate']].rename(
+        columns={'period_start_year': 'first_period_start_year', 'age_at_mandate': 'age_at_first_mandate'}
+    ).reset_index(drop=True)
+
+
+def _rollup_file(rollup_dir, name):
+    return Path(rollup_dir) / f"{name}.parquet"
+
+
+def _write(df, path):
+    tmp = path.with_suffix(".tmp")
+    df.to_parquet(tmp, index=False, compression="zstd")
+    os.replace(tmp, path)
+
+
+def build_rollups(cache_dir=DEFAULT_CACHE_DIR, rollup_dir=DEFAULT_ROLLUP_DIR, periods=None):
+    """
+    Aktualisiert den Rollup-Speicher aus dem Parquet-Cache der Mandatstabelle.
+
+    Args:
+        cache_dir: Ordner des Mandats-Caches (analysis_cache)
+        rollup_dir: Zielordner der Rollups
+        periods: Nur diese Perioden neu berechnen (None = alle)
+    """
+    os.makedirs(rollup_dir, exist_ok=True)
+    wanted = None if periods is None else {int(p) for p in periods}
+    # Gelöschte Perioden fehlen im Cache und werden unten nur entfernt
+    df = load_mandates(cache_dir, periods=wanted, columns=SOURCE_COLUMNS)
+
+    for name, fresh in compute_rollups(df).items():
+        path = _rollup_file(rollup_dir, name)
+        if wanted is not None and path.exists():
+            old = pd.read_parquet(path)
+            old = old[~old['period_number'].astype(int).isin(wanted)]
+            fresh = pd.concat([old, fresh], ignore_index=True)
+        _write(fresh.sort_values(PERIOD_KEYS, kind="stable").reset_index(drop=True), path)
+
+    # Das erste Mandat hängt von allen Perioden ab; dafür reichen wenige Spalten
+    all_mandates = df if wanted is None else load_mandates(
+        cache_dir, columns=['detail_page', 'period_number', 'period_start_year', 'gender_normalized', 'age_at_mandate'])
+    _write(compute_first_mandates(all_mandates), _rollup_file(rollup_dir, 'first_mandate'))
+
+    scope = "alle Perioden" if wanted is None else f"Perioden {sorted(wanted)}"
+    print(f"📦 Rollups aktualisiert ({scope}, {len(df)} Mandate gelesen)")
+
+
+def update_after_push(driver, cache_dir=DEFAULT_CACHE_DIR, rollup_dir=DEFAULT_ROLLUP_DIR):
+    """Nach einem Push nach Neo4j: Cache auffrischen und nur die geänderten Perioden neu aggregieren"""
+    changed = refresh_cache(driver, cache_dir)
+    if not _rollup_file(rollup_dir, 'gender').exists():
+        build_rollups(cache_dir, rollup_dir)
+    elif changed:
+        build_rollups(cache_dir, rollup_dir, periods=changed)
+    return changed
+
+
+# ---------------------------------------------------------------------------
+# Lesefunktionen für Plots und Dashboards
+# ---------------------------------------------------------------------------
+
+def load_rollup(name, rollup_dir=DEFAULT_ROLLUP_DIR):
+    return pd.read_parquet(_rollup_file(rollup_dir, name))
+
+
+def _by_year(name, keys, rollup_dir):
+    return load_rollup(name, rollup_dir).groupby(['period_start_year'] + keys, observed=True).sum(numeric_only=True)
+
+
+def gender_share_by_year(rollup_dir=DEFAULT_ROLLUP_DIR):
+    """Entspricht df.groupby('period_start_year')['gender_normalized'].value_counts(normalize=True) * 100"""
+    counts = _by_year('gender', ['gender_normalized'], rollup_dir)['mandates'].unstack(fill_value=0)
+    return counts.div(counts.sum(axis=1), axis=0) * 100
+
+
+def academic_share_by_year(by_gender=False, rollup_dir=DEFAULT_ROLLUP_DIR):
+    """
+    Akademikeranteil in Prozent unter den Mandaten mit bekanntem DQR-Niveau,
+    entspricht df.groupby('period_start_year')['is_academic'].mean() * 100
+    """
+    sums = _by_year('gender', ['gender_normalized'], rollup_dir)
+    if not by_gender:
+        sums = sums.groupby(level='period_start_year').sum()
+    share = sums['academic'] / sums['dqr_known'].where(sums['dqr_known'] > 0) * 100
+    return share.unstack(fill_value=0) if by_gender else share
+
+
+def phd_share_by_year(rollup_dir=DEFAULT_ROLLUP_DIR):
+    """Anteil Promovierter (DQR 8) in Prozent unter den Mandaten mit bekanntem DQR-Niveau pro Jahr"""
+    sums = _by_year('gender', [], rollup_dir)
+    return sums['phd'] / sums['dqr_known'].where(sums['dqr_known'] > 0) * 100
+
+
+def mean_age_by_year(rollup_dir=DEFAULT_ROLLUP_DIR):
+    """Entspricht df.groupby(['period_start_year', 'gender_normalized'])['age_at_mandate'].mean().unstack()"""
+    sums = _by_year('gender', ['gender_normalized'], rollup_dir)
+    return (sums['age_sum'] / sums['age_known'].where(sums['age_known'] > 0)).unstack()
+
+
+def dqr_distribution(by_year=False, rollup_dir=DEFAULT_ROLLUP_DIR):
+    """Anzahl Mandate pro DQR-Niveau (optional pro Jahr)"""
+    df = load_rollup('dqr', rollup_dir)
+    keys = ['period_start_year', 'dqr_level'] if by_year else ['dqr_level']
+    counts = df.groupby(keys, observed=True)['mandates'].sum()
+    return counts.unstack(fill_value=0) if by_year else counts
+
+
+def first_mandate_age(rollup_dir=DEFAULT_ROLLUP_DIR):
+    """Alter beim ersten Mandat pro Politiker (entspricht groupby('full_name')['age_at_mandate'].min())"""
+    return load_rollup('first_mandate', rollup_dir)
@@ -0,0 +1,189 @@
+"""
+Section-header census: how many politician pages carry each h2 section.
+
+Two sources, no extra crawl:
+
+* ``HeaderCensus`` (extension, HEADER_CENSUS_ENABLED) counts every section
+  header the content spider extracts – sent with ``section_headers_seen``
+  before SECTION_INCLUDE / SECTION_EXCLUDE drop any – in a bounded
+  Space-Saving sketch, and writes the sorted counts at spider close – one
+  file per content batch (``{batch}`` in HEADER_CENSUS_PATH).
+* ``census_from_graph`` counts the stored Content nodes in one aggregate
+  query; exact and covers all batches, but only sees the sections the
+  policy kept.
+
+Both produce ``{header: count}`` sorted by count (the former
+``h2_counts.json`` format). ``load_census`` merges the batch files.
+
+    python -m bundestags_scraper.census                # from Neo4j
+    python -m bundestags_scraper.census --from-files   # merge batch files
+"""
+
+import argparse
+import heapq
+import json
+import logging
+import os
+from collections import Counter
+from pathlib import Path
+
+from scrapy import signals
+from scrapy.exceptions import NotConfigured
+
+_LOG = logging.getLogger(__name__)
+
+# sent by the content spider with the headers of one page, before filtering
+section_headers_seen = object()
+
+CENSUS_QUERY = """
+MATCH (:Politician)-[:HAS_CONTENT]->(c:Content)
+WHERE c.section_header IS NOT NULL
+RETURN c.section_header AS header, count(*) AS n
+ORDER BY n DESC, header
+"""
+
+
+# --------------------------------------------------------------------------- #
+# Heavy hitters                                                               #
+# --------------------------------------------------------------------------- #
+class SpaceSaving:
+    """
+    Space-Saving top-k sketch (Metwally et al.) with at most ``capacity`` keys.
+
+    Counts of keys that were never evicted are exact; a key that replaced an
+    evicted one inherits its count, which is recorded in ``error`` (the
+    true count lies in ``[count - error, count]``).
+    """
+
+    def __init__(self, capacity: int = 5000):
+        self.capacity = capacity
+        self.counts: dict[str, int] = {}
+        self.error: dict[str, int] = {}
+        self._heap: list[tuple[int, str]] = []     # (count, key), lazily updated
+
+    def __len__(self):
+        return len(self.counts)
+
+    def add(self, key: str, n: int = 1):
+        if key in self.counts:
+            self.counts[key] += n
+        elif len(self.counts) < self.capacity:
+            self.counts[key] = n
+            self.error[key] = 0
+        else:
+            floor, victim = self._pop_min()
+            del self.counts[victim], self.error[victim]
+            self.counts[key] = floor + n
+            self.error[key] = floor
+        heapq.heappush(self._heap, (self.counts[key], key))
+        if len(self._heap) > 4 * self.capacity:
+            self._heap = [(c, k) for k, c in self.counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> tuple[int, str]:
+        while True:
+            count, key = heapq.heappop(self._heap)
+            if self.counts.get(key) == count:        # skip stale entries
+                return count, key
+
+    def most_common(self, n: int | None = None) -> list[tuple[str, int]]:
+        ranked = sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        return ranked if n is None else ranked[:n]
+
+
+# --------------------------------------------------------------------------- #
+# Persistence                                                                 #
+# --------------------------------------------------------------------------- #
+def save_counts(path, ranked):
+    """Write ``[(header, count), ...]`` as a JSON object in that order."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(dict(ranked), fh, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def load_census(directory) -> dict[str, int]:
+    """Merge all census files in ``directory``, sorted by count."""
+    total = Counter()
+    for path in sorted(Path(directory).glob("*.json")):
+        with open(path, encoding="utf-8") as fh:
+            total.update(json.load(fh))
+    return dict(sorted(total.items(), key=lambda kv: (-kv[1], kv[0])))
+
+
+def census_from_graph(driver) -> dict[str, int]:
+    with driver.session() as ses:
+        return {r["header"]: r["n"] for r in ses.run(CENSUS_QUERY)}
+
+
+# --------------------------------------------------------------------------- #
+# Extension                                                                   #
+# --------------------------------------------------------------------------- #
+class HeaderCensus:
+    """Counts section headers of scraped content items; see module docstring."""
+
+    def __init__(self, path: str, capacity: int, stats=None):
+        self.path = path
+        self.sketch = SpaceSaving(capacity)
+        self.stats = stats
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        s = crawler.settings
+        if not s.getbool("HEADER_CENSUS_ENABLED"):
+            raise NotConfigured
+        ext = cls(s.get("HEADER_CENSUS_PATH"), s.getint("HEADER_CENSUS_CAPACITY", 5000),
+                  crawler.stats)
+        crawler.signals.connect(ext.headers_seen, signal=section_headers_seen)
+        crawler.signals.connect(ext.spider_closed, signal=signals.spider_closed)
+        return ext
+
+    def headers_seen(self, headers, spider):
+        for header in headers:
+            if header:
+                self.sketch.add(header)
+
+    def spider_closed(self, spider, reason):
+        if not len(self.sketch):
+            return
+        path = self.path.format(spider=spider.name, batch=getattr(spider, "batch", 0))
+        save_counts(path, self.sketch.most_common())
+        if self.stats:
+            self.stats.set_value("census/headers", len(self.sketch))
+            self.stats.set_value("census/evicted", sum(1 for e in self.sketch.error.values() if e))
+        _LOG.info("[HeaderCensus] %d headers written to %s", len(self.sketch), path)
+
+
+def main(argv=None):
+    from neo4j import GraphDatabase
+    from scrapy.utils.project import get_project_settings
+
+    parser = argparse.ArgumentParser(description="Write the sorted section-header census.")
+    parser.add_argument("--from-files", action="store_true",
+                        help="merge the per-batch files instead of querying Neo4j")
+    parser.add_argument("--out", default=None, help="output JSON (default: data/section_header_counts.json)")
+    args = parser.parse_args(argv)
+
+    settings = get_project_settings()
+    census_dir = Path(settings.get("HEADER_CENSUS_PATH")).parent
+    out = Path(args.out) if args.out else census_dir.parent / "section_header_counts.json"
+
+    if args.from_files:
+        counts = load_census(census_dir)
+    else:
+        driver = GraphDatabase.driver(
+            settings["NEO4J_URI"], auth=(settings["NEO4J_USER"], settings["NEO4J_PASSWORD"])
+        )
+        try:
+            counts = census_from_graph(driver)
+        finally:
+            driver.close()
+
+    save_counts(out, counts.items())
+    print(f"{len(counts)} section headers written to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+Dimension registry: integer surrogate keys for Party, State, Constituency
+and Period.
+
+* Names are normalised once per distinct raw value (cached): whitespace
+  and case variants collapse, party aliases (incl. the fraktionslos /
+  parteilos spellings) map to the canonical party.
+* Each dimension node gets a compact integer ``id``, allocated in the
+  graph from an ``(:IdCounter {label})`` node inside the transaction that
+  creates the node (``link_query``). Concurrent writers (pipeline, several
+  ingest workers) serialise on the counter's write lock, and the
+  ``*_id`` uniqueness constraints in ``pipelines.CONSTRAINTS`` reject any
+  collision instead of letting it merge entities silently.
+* Mandates carry ``party_id``, ``state_id``, ``constituency_id`` copied
+  from the linked node, and an integer ``period_number``.
+* ``period_number`` is an int everywhere (spider, Period.number, Mandate).
+
+``migrate`` brings an existing graph to this schema: integer period
+numbers, duplicate ids dropped, missing ids allocated, counters seeded,
+Mandate id columns backfilled.
+
+    python -m bundestags_scraper.dimensions            # migrate the graph
+"""
+
+import logging
+import re
+
+_LOG = logging.getLogger(__name__)
+
+_SPACE = re.compile(r"\s+")
+_PAREN_SPACE = re.compile(r"\s*\(\s*")
+_PAREN_CLOSE = re.compile(r"\s*\)")
+
+PARTY_ALIASES = {
+    # CDU / CSU
+    "CDU/CSU (CDU)": "CDU",
+    "CSU (GDP)":     "CSU",
+    "CDU/CSU (CSU)": "CSU",
+
+    # SPD
+    "SPD (GDP)":     "SPD",
+
+    # Bündnis 90/Die Grünen
+    "Die Grünen":  "Bündnis 90/Die Grünen",
+    "GRÜNE":       "Bündnis 90/Die Grünen",
+    "Grüne":       "Bündnis 90/Die Grünen",
+    "Bündnis 90":  "Bündnis 90/Die Grünen",
+    "Grüne DDR":   "Bündnis 90/Die Grünen",
+
+    # AfD
+    "AfD (parteilos)":   "AfD",
+    "fraktionslos(AfD)": "AfD",
+
+    # DIE LINKE
+    "Die Linke": "DIE LINKE",
+    "Linke":     "DIE LINKE",
+    "PDS":       "DIE LINKE",
+
+    # Unabhängig / Parteilos
+    "parteilos":                  "Unabhängig / Parteilos",
+    "unabhängig":                 "Unabhängig / Parteilos",
+    "fraktionslos":               "Unabhängig / Parteilos",
+    "fraktionslos (Die PARTEI)":  "Unabhängig / Parteilos",
+    "fraktionslos (LKR)":         "Unabhängig / Parteilos",
+    "fraktionslos(SSW)":          "Unabhängig / Parteilos",
+
+    # BSW
+    "BSW": "BSW",
+}
+
+
+def clean_name(raw: str | None) -> str | None:
+    """Trim, collapse whitespace, one space before '(' and none inside."""
+    if raw is None:
+        return None
+    cleaned = _SPACE.sub(" ", raw).strip()
+    cleaned = _PAREN_SPACE.sub(" (", cleaned)
+    cleaned = _PAREN_CLOSE.sub(")", cleaned)
+    return cleaned or None
+
+
+def lookup_key(raw: str | None) -> str | None:
+    """Case- and whitespace-insensitive key for alias lookups."""
+    cleaned = clean_name(raw)
+    return cleaned.casefold() if cleaned else None
+
+
+def period_number(raw) -> int | None:
+    """'12', ' 12 ', 12, 12.0 → 12; anything else → None."""
+    if raw is None or isinstance(raw, bool):
+        return None
+    if isinstance(raw, int):
+        return raw
+    if isinstance(raw, float):
+        return int(raw) if raw.is_integer() else None
+    text = str(raw).strip()
+    return int(text) if text.isdigit() else None
+
+
+# --------------------------------------------------------------------------- #
+# Dimensions                                                                  #
+# --------------------------------------------------------------------------- #
+class Dimension:
+    """
+    One dimension (label): raw value → canonical name.
+
+    ``aliases`` maps raw spellings to canonical names; keys are matched
+    case- and whitespace-insensitively. Ids live in the graph (see
+    ``link_query``).
+    """
+
+    def __init__(self, label: str, aliases: dict[str, str] | None = None):
+        self.label = label
+        self._aliases = {lookup_key(k): v for k, v in (aliases or {}).items()}
+        self._canonical: dict[str, str] = {}    # lookup_key → first spelling seen
+        self._cache: dict[str, str | None] = {}  # raw → canonical
+
+    def __len__(self):
+        return len(self._canonical)
+
+    def canonical(self, raw: str | None) -> str | None:
+        if raw is None:
+            return None
+        try:
+            return self._cache[raw]
+        except KeyError:
+            pass
+        key = lookup_key(raw)
+        if key is None:
+            name = None
+        elif key in self._aliases:
+            name = self._aliases[key]
+        else:
+            name = self._canonical.setdefault(key, clean_name(raw))
+        self._cache[raw] = name
+        return name
+
+    def seed(self, names):
+        """Adopt the spellings stored in the graph as canonical names."""
+        for name in names:
+            if name is None:
+                continue
+            key = lookup_key(name)
+            if key not in self._aliases:
+                self._canonical.setdefault(key, name)
+        self._cache.clear()
+
+
+class DimensionRegistry:
+    """Party, State and Constituency dimensions of one process."""
+
+    LABELS = ("Party", "State", "Constituency")
+
+    def __init__(self):
+        self.party = Dimension("Party", PARTY_ALIASES)
+        self.state = Dimension("State")
+        self.constituency = Dimension("Constituency")
+
+    def dimensions(self):
+        return (self.party, self.state, self.constituency)
+
+    def load(self, driver):
+        """Seed canonical spellings from the graph (call once per process)."""
+        with driver.session() as ses:
+            for dim in self.dimensions():
+                dim.seed(r["name"] for r in ses.run(f"MATCH (n:{dim.label}) RETURN n.name AS name"))
+        _LOG.info("[DimensionRegistry] %s",
+                  ", ".join(f"{d.label}={len(d)}" for d in self.dimensions()))
+        return self
+
+    def mandate_keys(self, pol: dict) -> dict:
+        """Canonical names for the dimension fields of a politician row."""
+        return {
+            "party": self.party.canonical(pol.get("political_party")),
+            "state": self.state.canonical(pol.get("federate_state")),
+            "const": self.constituency.canonical(pol.get("constituency")),
+        }
+
+
+# --------------------------------------------------------------------------- #
+# Id allocation in the graph                                                  #
+# --------------------------------------------------------------------------- #
+# Takes the next id from the label's counter. ``SET k._lock`` write-locks the
+# counter before it is read, so concurrent transactions cannot read the same
+# value; the lock is held until commit.
+_ALLOCATE_ID = """
+    FOREACH (_ IN CASE WHEN {var}.id IS NULL THEN [1] ELSE [] END |
+        MERGE (k:IdCounter {{label: '{label}'}})
+        ON CREATE SET k.next = 0
+        SET k._lock = true
+        SET k.next = k.next + 1
+        SET {var}.id = k.next
+        REMOVE k._lock
+    )
+"""
+
+
+def link_query(label: str, rel: str, mandate_key: str) -> str:
+    """MERGE a dimension node by ``$name`` (id from the counter) and link ``$mid`` to it."""
+    return f"""
+    MERGE (n:{label} {{name:$name}})
+    WITH n
+    {_ALLOCATE_ID.format(var="n", label=label)}
+    WITH n
+    MATCH (m:Mandate {{id:$mid}})
+    MERGE (m)-[:{rel}]->(n)
+    SET m.{mandate_key} = n.id
+    """
+
+
+# counter ≥ highest stored id; idempotent, run with the constraints
+_SEED_COUNTER = """
+OPTIONAL MATCH (n:{label})
+WITH coalesce(max(n.id), 0) AS top
+MERGE (k:IdCounter {{label: '{label}'}})
+SET k.next = CASE WHEN coalesce(k.next, 0) > top THEN k.next ELSE top END
+"""
+
+
+def ensure_id_counters(driver):
+    with driver.session() as ses:
+        for label in DimensionRegistry.LABELS:
+            ses.run(_SEED_COUNTER.format(label=label)).consume()
+
+
+_REGISTRY: DimensionRegistry | None = None
+
+
+def get_registry() -> DimensionRegistry:
+    """One DimensionRegistry per process (pipeline writers, ingest worker)."""
+    global _REGISTRY
+    if _REGISTRY is None:
+        _REGISTRY = DimensionRegistry()
+    return _REGISTRY
+
+
+# --------------------------------------------------------------------------- #
+# Migration                                                                   #
+# --------------------------------------------------------------------------- #
+# string period numbers → int (Period and the former string-keyed lookups)
+MIGRATE_PERIODS = """
+MATCH (per:Period)
+WHERE per.number IS NOT NULL AND toString(per.number) = per.number
+SET per.number = toInteger(per.number)
+"""
+
+# ids stored more than once (allocated by concurrent writers before the
+# counters existed): keep the first node by name, reallocate the others
+_DROP_DUPLICATE_IDS = """
+MATCH (n:{label}) WHERE n.id IS NOT NULL
+WITH n.id AS id, n ORDER BY n.name
+WITH id, collect(n) AS nodes
+WHERE size(nodes) > 1
+UNWIND nodes[1..] AS n
+REMOVE n.id
+"""
+
+_ASSIGN_MISSING_IDS = """
+MATCH (n:{label}) WHERE n.id IS NULL
+WITH n ORDER BY n.name
+""" + _ALLOCATE_ID.replace("{var}", "n")
+
+MIGRATE_MANDATES = [
+    """
+    MATCH (m:Mandate)-[:IN_PERIOD]->(per:Period)
+    SET m.period_number = per.number
+    """,
+    """
+    MATCH (m:Mandate)-[:AFFILIATED_WITH]->(pa:Party)
+    SET m.party_id = pa.id
+    """,
+    """
+    MATCH (m:Mandate)-[:REPRESENTS_STATE]->(st:State)
+    SET m.state_id = st.id
+    """,
+    """
+    MATCH (m:Mandate)-[:REPRESENTS_CONSTITUENCY]->(co:Constituency)
+    SET m.constituency_id = co.id
+    """,
+]
+
+
+def migrate(driver):
+    """Integer period numbers, unique ids on dimension nodes, id columns on Mandates."""
+    with driver.session() as ses:
+        ses.run(MIGRATE_PERIODS).consume()
+        for label in DimensionRegistry.LABELS:
+            ses.run(_DROP_DUPLICATE_IDS.format(label=label)).consume()
+            ses.run(_SEED_COUNTER.format(label=label)).consume()
+            ses.run(_ASSIGN_MISSING_IDS.format(label=label)).consume()
+        for query in MIGRATE_MANDATES:
+            ses.run(query).consume()
+    _LOG.info("[dimensions] migration done")
+
+
+def main(argv=None):
+    import argparse
+
+    from neo4j import GraphDatabase
+    from scrapy.utils.project import get_project_settings
+
+    parser = argparse.ArgumentParser(description="Migrate the graph to integer dimension keys.")
+    parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    settings = get_project_settings()
+    driver = GraphDatabase.driver(
+        settings["NEO4J_URI"], auth=(settings["NEO4J_USER"], settings["NEO4J_PASSWORD"])
+    )
+    try:
+        from bundestags_scraper.pipelines import ensure_constraints
+
+        migrate(driver)
+        # after the migration: the id constraints need duplicate-free ids
+        ensure_constraints(driver)
+        registry = get_registry().load(driver)
+        print(", ".join(f"{d.label}: {len(d)} names" for d in registry.dimensions()))
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Pure HTML extraction for the spiders.
+
+Everything here works on ``(body: bytes, url, encoding)`` and returns plain
+dicts/lists, so it can run either inline in a callback or in a worker
+process of the parse pool (see parse_pool.py). No Scrapy objects, no spider
+state, no Neo4j: redirect resolution and item construction stay on the
+reactor side.
+"""
+
+import re
+import unicodedata
+from urllib.parse import urljoin
+
+from parsel import Selector
+
+# --------------------------------------------------------------------------- #
+# Shared                                                                      #
+# --------------------------------------------------------------------------- #
+
+
+def _selector(body: bytes, encoding: str) -> Selector:
+    return Selector(text=body.decode(encoding or "utf-8", errors="replace"))
+
+
+def page_meta(sel: Selector) -> dict:
+    """Title and rel=canonical href (``""`` if the page has none)."""
+    return {
+        "title": sel.xpath("normalize-space(//title/text())").get(),
+        "canonical": sel.xpath('//link[@rel="canonical"]/@href').get() or "",
+    }
+
+
+# --------------------------------------------------------------------------- #
+# Politician detail pages (politician_content_spider)                         #
+# --------------------------------------------------------------------------- #
+
+
+def extract_sections(sel: Selector) -> dict | None:
+    """
+    h2 title → section text of a Wikipedia article body.
+
+    Text before the first h2 is stored under ``'#'``; parsing stops at the
+    ``normdaten`` block. Returns None if the content container is missing
+    or empty.
+    """
+    container = sel.xpath(
+        "//div[@id='mw-content-text']/div[contains(@class,'mw-parser-output')]"
+    )
+    if not container:
+        return None
+    children = container.xpath("./*")
+    if not children:
+        return None
+
+    sections = {}
+    current = "#"
+    sections[current] = []
+
+    for elem in children:
+        if elem.xpath("@id").get() == "normdaten":
+            break
+        if elem.root.tag == "div" and elem.xpath(".//h2"):
+            title = elem.xpath(".//h2//text()").get(default="").strip()
+            if title:
+                current = title
+                sections[current] = []
+            continue
+        text = elem.xpath("string()").get()
+        if text:
+            sections[current].append(" ".join(text.split()))
+
+    return {key: "\n".join(parts).strip() for key, parts in sections.items()}
+
+
+def normalize_header(header: str) -> str:
+    """Match key for section headers: NFKC, casefolded, single spaces, no trailing ':'."""
+    header = unicodedata.normalize("NFKC", header or "")
+    return " ".join(header.split()).rstrip(":").strip().casefold()
+
+
+class SectionPolicy:
+    """
+    Which sections of a detail page are kept (SECTION_INCLUDE / SECTION_EXCLUDE).
+
+    Headers are compared after ``normalize_header``. A non-empty include list
+    keeps only those sections; the exclude list is applied in any case.
+    """
+
+    def __init__(self, include=(), exclude=()):
+        self.include = {normalize_header(h) for h in include}
+        self.exclude = {normalize_header(h) for h in exclude}
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(settings.getlist("SECTION_INCLUDE"), settings.getlist("SECTION_EXCLUDE"))
+
+    def keeps(self, header: str) -> bool:
+        key = normalize_header(header)
+        if self.include and key not in self.include:
+            return False
+        return key not in self.exclude
+
+
+def parse_content_page(body: bytes, url: str, encoding: str) -> dict:
+    sel = _selector(body, encoding)
+    return {**page_meta(sel), "sections": extract_sections(sel)}
+
+
+# --------------------------------------------------------------------------- #
+# Member lists (politician_spider)                                            #
+# --------------------------------------------------------------------------- #
+
+HEADER_RULES = {
+    "full_name": ["mitglied", "name"],
+    "lifespan": ["lebens", "geburt"],
+    "political_party": ["partei", "fraktion"],
+    "federate_state": ["land"],
+    "constituency": ["wahlkreis"],
+    "remarks": ["bemerkung"],
+}
+
+
+def extract_headers(table: Selector) -> list[str]:
+    """
+    Extract and clean header texts from a table.
+
+    Strips small/sup tags, handles <br> as space, and normalizes whitespace.
+    """
+    headers = []
+    for th in table.xpath(".//th"):
+        header_parts = th.xpath(".//text()[not(ancestor::small)] | .//br").getall()
+        cleaned_parts = []
+        for part in header_parts:
+            if part == "<br>":
+                if cleaned_parts:
+                    cleaned_parts[-1] = cleaned_parts[-1].rstrip().rstrip("-")
+            else:
+                if cleaned_parts and cleaned_parts[-1] == "<br>":
+                    part = part.lstrip()
+                cleaned_parts.append(part)
+        header = "".join(cleaned_parts)
+        header = re.sub(r"[\u00ad]", "", header)
+        header = re.sub(r"[\xa0]", " ", header)
+        header = re.sub(r"\s+", " ", header).strip()
+        headers.append(header)
+    return headers
+
+
+def map_headers(headers: list[str]) -> dict[str, int]:
+    """Map header labels to field keys (column index) by keyword matching."""
+    header_mapping = {}
+    for idx, header in enumerate(headers):
+        header_lower = header.lower()
+        if "wahlkreisnr" in header_lower:
+            continue
+        for field, keywords in HEADER_RULES.items():
+            if any(keyword in header_lower for keyword in keywords):
+                header_mapping[field] = idx
+                break
+    return header_mapping
+
+
+def _extract_name(row: dict, cell: Selector, base_url: str):
+    """full_name, detail_page (absolute, unresolved), firstname, lastname."""
+    a_tag = cell.xpath(".//a")
+    href = a_tag.xpath("@href").get()
+    row["full_name"] = a_tag.xpath("normalize-space(text())").get()
+    row["detail_page"] = urljoin(base_url, href) if href else None
+    sort_value = cell.attrib.get("data-sort-value", "").split("@")[0]
+    if sort_value and "," in sort_value:
+        row["lastname"], row["firstname"] = map(str.strip, sort_value.split(",", 1))
+
+
+def _extract_lifespan(row: dict, cell: Selector):
+    lifespan_text = cell.xpath("normalize-space(.)").get()
+    if not lifespan_text:
+        return
+    years = lifespan_text.replace("–", "-").split("-")
+    row["birth_year"] = years[0].strip()
+    if len(years) > 1:
+        row["death_year"] = years[1].strip()
+
+
+def parse_row(tr: Selector, header_map: dict, base_url: str, period_number=None) -> dict:
+    """One member-table row → dict with PoliticianItem fields."""
+    row = {}
+    cells = tr.xpath("./td")
+
+    def cell(idx):
+        if idx is None:
+            return None
+        return cells[idx] if idx < len(cells) else None
+
+    if (c := cell(header_map.get("full_name"))):
+        _extract_name(row, c, base_url)
+    if (c := cell(header_map.get("lifespan"))):
+        _extract_lifespan(row, c)
+    for field in ("political_party", "federate_state", "constituency", "remarks"):
+        if (c := cell(header_map.get(field))):
+            row[field] = c.xpath("normalize-space(.)").get()
+
+    row.update({
+        "item_type": "politician",
+        "source_page": base_url,
+        "legislative_period_number": period_number,
+    })
+    return row
+
+
+def parse_member_list(body: bytes, url: str, encoding: str, period_number=None) -> dict:
+    """Page meta plus the rows of the table after the 'Abgeordnete' heading (None if absent)."""
+    sel = _selector(body, encoding)
+    table = sel.xpath("//h2[@id='Abgeordnete']/../following::table[1]")
+    rows = None
+    if table:
+        header_map = map_headers(extract_headers(table))
+        rows = [parse_row(tr, header_map, url, period_number)
+                for tr in table.xpath(".//tbody/tr")]
+    return {**page_meta(sel), "rows": rows}
@@ -0,0 +1,43 @@
+"""
+Content-addressed store for raw page HTML.
+
+In lean-item mode (setting LEAN_ITEMS) the full ``response.text`` is written
+here as soon as the response is parsed, and items only carry ``html_ref``
+(the sha1 of the HTML). Page nodes in Neo4j keep that reference instead of
+the HTML itself.
+
+Layout: ``<root>/<ref[:2]>/<ref>.html.gz``
+"""
+
+import gzip
+import hashlib
+import os
+from pathlib import Path
+
+
+class HtmlStore:
+    def __init__(self, root):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def path(self, ref: str) -> Path:
+        return self.root / ref[:2] / f"{ref}.html.gz"
+
+    def put(self, html: str) -> str:
+        data = html.encode("utf-8")
+        ref = hashlib.sha1(data).hexdigest()
+        path = self.path(ref)
+        if not path.exists():
+            path.parent.mkdir(exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.tmp")
+            with gzip.open(tmp, "wb", compresslevel=5) as fh:
+                fh.write(data)
+            os.replace(tmp, path)
+        return ref
+
+    def get(self, ref: str) -> str:
+        with gzip.open(self.path(ref), "rb") as fh:
+            return fh.read().decode("utf-8")
+
+    def __contains__(self, ref: str) -> bool:
+        return self.path(ref).exists()
@@ -0,0 +1,159 @@
+"""
+Ingestion worker: drains the write-behind queue into Neo4j.
+
+Each batch read from the queue is written in ONE Neo4j transaction (item
+types in dependency order, see pipelines.WRITE_ORDER). Its last offset is
+acknowledged only after the transaction has committed. A crash between the
+commit and the ack replays the batch, which is harmless because every
+statement is a MERGE.
+
+Several workers can run side by side. ``--workers N --worker-id i`` makes a
+worker handle partition i of N (see write_queue.partition_key). A politician
+may then be written before its Period; it MERGEs a Period stub that the
+period item fills in later.
+
+    python -m bundestags_scraper.ingest_worker                  # drain and exit
+    python -m bundestags_scraper.ingest_worker --follow         # keep polling
+    python -m bundestags_scraper.ingest_worker --workers 4 --worker-id 2
+"""
+
+import argparse
+import logging
+import time
+from collections import defaultdict
+
+from neo4j import GraphDatabase
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+from scrapy.utils.project import get_project_settings
+
+from bundestags_scraper.dimensions import get_registry
+from bundestags_scraper.pipelines import (
+    _CONTENT_TYPES, WRITE_ORDER, ContentHashes, Neo4jPipeline, ensure_constraints,
+)
+from bundestags_scraper.write_queue import WriteQueue
+
+_LOG = logging.getLogger(__name__)
+
+_RETRYABLE = (ServiceUnavailable, SessionExpired, TransientError)
+
+
+def _write_mixed_batch(tx, batch):
+    by_type = defaultdict(list)
+    for _, item_type, data in batch:
+        by_type[item_type].append(data)
+    rank = {t: i for i, t in enumerate(WRITE_ORDER)}
+    for item_type in sorted(by_type, key=lambda t: rank.get(t, len(rank))):
+        Neo4jPipeline.write_batch(tx, item_type, by_type[item_type])
+
+
+class IngestWorker:
+    def __init__(self, queue: WriteQueue, driver, worker_id: int = 0, workers: int = 1,
+                 batch_size: int = 1000):
+        self.queue = queue
+        self.driver = driver
+        self.worker_id = worker_id
+        self.workers = workers
+        self.batch_size = batch_size
+        self.written = 0
+        self.skipped = 0
+        # the crawler only skips sections stored before it started (and none
+        # if Neo4j was unreachable then), so unchanged sections are filtered
+        # again here against the current graph
+        self.hashes = ContentHashes().load(driver)
+        # dimension ids continue after the ones already in the graph
+        get_registry().load(driver)
+
+    def _changed_only(self, batch):
+        kept = []
+        for entry in batch:
+            _, item_type, data = entry
+            if item_type in _CONTENT_TYPES and self.hashes.is_unchanged(data):
+                self.skipped += 1
+                continue
+            kept.append(entry)
+        return kept
+
+    def _remember(self, batch):
+        """Only after the commit: a failed write must be retried, not skipped."""
+        for _, item_type, data in batch:
+            self.hashes.remember_committed(item_type, [data])
+
+    def drain(self) -> int:
+        """Write everything currently pending in this partition; returns item count."""
+        written = 0
+        after = self.queue.acked(self.worker_id, self.workers)
+        while True:
+            high_water = self.queue.max_offset()
+            batch = self.queue.read(after, self.batch_size, self.worker_id, self.workers)
+            if not batch:
+                # nothing of ours up to high_water → move the ack so purging works
+                if high_water > after:
+                    self.queue.ack(high_water, self.worker_id, self.workers)
+                return written
+
+            start = time.perf_counter()
+            changed = self._changed_only(batch)
+            if changed:
+                with self.driver.session() as ses:
+                    ses.execute_write(_write_mixed_batch, changed)
+                self._remember(changed)
+            after = batch[-1][0]
+            self.queue.ack(after, self.worker_id, self.workers)
+
+            written += len(batch)
+            self.written += len(batch)
+            _LOG.info("[IngestWorker %d/%d] %d items → offset %d (%.0f items/s)",
+                      self.worker_id, self.workers, len(batch), after,
+                      len(batch) / max(time.perf_counter() - start, 1e-9))
+
+    def run(self, follow: bool = False, poll_interval: float = 1.0, purge: bool = False):
+        while True:
+            try:
+                self.drain()
+            except _RETRYABLE as exc:
+                # Neo4j unavailable: items stay in the queue, retry later
+                _LOG.warning("[IngestWorker] Neo4j unavailable (%s), retrying", exc)
+                time.sleep(poll_interval * 5)
+                continue
+            if purge:
+                self.queue.purge_acknowledged(self.workers)
+            if not follow:
+                return self.written
+            time.sleep(poll_interval)
+
+
+def main(argv=None):
+    settings = get_project_settings()
+    parser = argparse.ArgumentParser(description="Drain the write-behind queue into Neo4j.")
+    parser.add_argument("--queue", default=settings.get("NEO4J_QUEUE_PATH"))
+    parser.add_argument("--workers", type=int, default=1, help="total number of workers")
+    parser.add_argument("--worker-id", type=int, default=0, help="partition of this worker")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--follow", action="store_true", help="keep polling for new items")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--purge", action="store_true",
+                        help="delete items acknowledged by all partitions")
+    args = parser.parse_args(argv)
+    if not 0 <= args.worker_id < args.workers:
+        parser.error("--worker-id must be in [0, --workers)")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    queue = WriteQueue(args.queue)
+    driver = GraphDatabase.driver(
+        settings["NEO4J_URI"], auth=(settings["NEO4J_USER"], settings["NEO4J_PASSWORD"])
+    )
+    try:
+        ensure_constraints(driver)
+        worker = IngestWorker(queue, driver, args.worker_id, args.workers, args.batch_size)
+        written = worker.run(follow=args.follow, poll_interval=args.poll_interval, purge=args.purge)
+        _LOG.info("[IngestWorker] done, %d items processed, %d unchanged sections skipped",
+                  written, worker.skipped)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        driver.close()
+        queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/items.html
 
+from dataclasses import dataclass
+
 import scrapy
 
 class BaseItem(scrapy.Item):
@@ -48,8 +50,21 @@ class SourcePageItem(BaseItem):
     url = scrapy.Field()
     title = scrapy.Field()
     full_html = scrapy.Field()
+    html_ref = scrapy.Field()   # HtmlStore reference (lean-item mode)
     source_domain = scrapy.Field()
     
 class SourceDomainItem(BaseItem):
     domain = scrapy.Field()
-    description = scrapy.Field()
\ No newline at end of file
+    description = scrapy.Field()
+
+
+@dataclass(slots=True)
+class SectionRecord:
+    """
+    Compact PoliticianContent for lean-item mode: no per-instance dict,
+    no Field metadata, understood by ItemAdapter like any other item.
+    """
+    source_page: str
+    section_header: str
+    section_content: str
+    item_type: str = "politician_content"
@@ -3,11 +3,19 @@
 # See documentation in:
 # https://docs.scrapy.org/en/latest/topics/spider-middleware.html
 
+import logging
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
 from scrapy import signals
+from scrapy.exceptions import NotConfigured
 
 # useful for handling different item types with a single interface
 from itemadapter import is_item, ItemAdapter
 
+_LOG = logging.getLogger(__name__)
+
 
 class BundestagsScraperSpiderMiddleware:
     # Not all methods need to be defined. If a method is not defined,
@@ -101,3 +109,155 @@ class BundestagsScraperDownloaderMiddleware:
 
     def spider_opened(self, spider):
         spider.logger.info("Spider opened: %s" % spider.name)
+
+
+# --------------------------------------------------------------------------- #
+#  AIMD concurrency controller                                                #
+# --------------------------------------------------------------------------- #
+
+def _retry_after_seconds(value: bytes | None) -> float | None:
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return None
+    text = value.decode("latin-1").strip()
+    try:
+        return max(0.0, float(text))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class _SlotState:
+    __slots__ = ("concurrency", "acked", "base_delay", "pause_until",
+                 "last_decrease", "latency")
+
+    def __init__(self, concurrency: int, base_delay: float):
+        self.concurrency = concurrency
+        self.acked = 0
+        self.base_delay = base_delay
+        self.pause_until = 0.0
+        self.last_decrease = 0.0
+        self.latency = None   # EWMA of download latency in seconds
+
+
+class AimdConcurrencyMiddleware:
+    """
+    Adjusts each download slot's concurrency with AIMD.
+
+    Additive increase: +1 after a full window of successful responses,
+    but only while the latency EWMA stays below AIMD_TARGET_LATENCY.
+    Multiplicative decrease: concurrency * AIMD_DECREASE_FACTOR on a 429
+    or 503, at most once per latency window. In-flight responses from
+    before the cut therefore do not cut again.
+
+    Retry-After pauses the slot: its delay is raised for that long, then
+    reset to the original DOWNLOAD_DELAY. Must be ordered above
+    RetryMiddleware (550), so it sees 429/503 before they become retries.
+
+    Stats: aimd/concurrency/<slot> (current), aimd/history (last
+    AIMD_HISTORY_SIZE [seconds since start, slot, concurrency] changes),
+    aimd/throttled, aimd/increases, aimd/decreases,
+    aimd/retry_after_seconds.
+    """
+
+    THROTTLE_CODES = {429, 503}
+
+    def __init__(self, crawler):
+        s = crawler.settings
+        if not s.getbool("AIMD_ENABLED"):
+            raise NotConfigured
+        self.crawler = crawler
+        self.stats = crawler.stats
+        self.start_concurrency = s.getint("AIMD_START_CONCURRENCY", 8)
+        self.min_concurrency = s.getint("AIMD_MIN_CONCURRENCY", 1)
+        self.max_concurrency = s.getint("AIMD_MAX_CONCURRENCY", s.getint("CONCURRENT_REQUESTS"))
+        self.decrease_factor = s.getfloat("AIMD_DECREASE_FACTOR", 0.5)
+        self.target_latency = s.getfloat("AIMD_TARGET_LATENCY", 2.0)
+        self.max_retry_after = s.getfloat("AIMD_MAX_RETRY_AFTER", 120.0)
+        self.history_size = s.getint("AIMD_HISTORY_SIZE", 1000)
+        self._states: dict[str, _SlotState] = {}
+        self._started = time.monotonic()
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        return cls(crawler)
+
+    # –– helpers --------------------------------------------------------
+    def _slot(self, request):
+        key = request.meta.get("download_slot")
+        return key, self.crawler.engine.downloader.slots.get(key)
+
+    def _state(self, key, slot) -> _SlotState:
+        state = self._states.get(key)
+        if state is None:
+            state = self._states[key] = _SlotState(self.start_concurrency, slot.delay)
+            self._apply(key, slot, state)
+        return state
+
+    def _apply(self, key, slot, state):
+        slot.concurrency = state.concurrency
+        self.stats.set_value(f"aimd/concurrency/{key}", state.concurrency)
+        self.stats.max_value(f"aimd/max_concurrency/{key}", state.concurrency)
+        history = self.stats.get_value("aimd/history")
+        if history is None:
+            history = deque(maxlen=self.history_size)
+            self.stats.set_value("aimd/history", history)
+        history.append([round(time.monotonic() - self._started, 1), key, state.concurrency])
+
+    # –– middleware -----------------------------------------------------
+    def process_response(self, request, response, spider):
+        key, slot = self._slot(request)
+        if slot is None:
+            return response
+        state = self._state(key, slot)
+        now = time.monotonic()
+
+        latency = request.meta.get("download_latency")
+        if latency is not None:
+            state.latency = latency if state.latency is None else 0.8 * state.latency + 0.2 * latency
+
+        if response.status in self.THROTTLE_CODES:
+            self._on_throttle(key, slot, state, response, now)
+            return response
+
+        if state.pause_until and now >= state.pause_until:
+            slot.delay = state.base_delay
+            state.pause_until = 0.0
+
+        state.acked += 1
+        if (state.acked >= state.concurrency
+                and state.concurrency < self.max_concurrency
+                and (state.latency or 0.0) < self.target_latency):
+            state.acked = 0
+            state.concurrency += 1
+            self.stats.inc_value("aimd/increases")
+            self._apply(key, slot, state)
+        return response
+
+    def _on_throttle(self, key, slot, state, response, now):
+        self.stats.inc_value("aimd/throttled")
+        self.stats.inc_value(f"aimd/throttled/{response.status}")
+
+        retry_after = _retry_after_seconds(response.headers.get("Retry-After"))
+        if retry_after:
+            retry_after = min(retry_after, self.max_retry_after)
+            self.stats.inc_value("aimd/retry_after_seconds", retry_after)
+            state.pause_until = max(state.pause_until, now + retry_after)
+            slot.delay = max(slot.delay, retry_after)
+
+        window = max(state.latency or 0.0, 1.0)
+        if now - state.last_decrease < window:
+            return
+        state.last_decrease = now
+        state.acked = 0
+        new = max(self.min_concurrency, int(state.concurrency * self.decrease_factor))
+        if new != state.concurrency:
+            state.concurrency = new
+            self.stats.inc_value("aimd/decreases")
+            self._apply(key, slot, state)
+            _LOG.info("[AIMD] %s: HTTP %s → concurrency %d (retry-after %s)",
+                      key, response.status, new, retry_after)
@@ -0,0 +1,50 @@
+"""
+Optional process pool for HTML extraction (setting PARSE_POOL_WORKERS).
+
+With the default of 0 the extraction functions run inline in the callback,
+on the reactor thread. With N > 0, callbacks hand ``(body, url, encoding)``
+to a ``ProcessPoolExecutor`` and await the plain-dict result, so lxml
+parsing uses N cores while the reactor keeps downloading.
+
+Workers are started with the ``spawn`` method: forking a process that
+already runs the Twisted reactor and the Neo4j driver threads is not safe.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from scrapy import signals
+from twisted.internet.defer import Deferred
+
+_LOG = logging.getLogger(__name__)
+
+_POOL: ProcessPoolExecutor | None = None
+
+
+def get_pool(crawler) -> ProcessPoolExecutor | None:
+    """Process-wide pool, created on first use and shut down with the engine."""
+    global _POOL
+    workers = crawler.settings.getint("PARSE_POOL_WORKERS", 0)
+    if workers <= 0:
+        return None
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        crawler.signals.connect(shutdown, signal=signals.engine_stopped)
+        _LOG.info("[ParsePool] %d worker processes", workers)
+    return _POOL
+
+
+def shutdown():
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown(wait=True, cancel_futures=True)
+        _POOL = None
+
+
+def submit(pool: ProcessPoolExecutor, fn, *args) -> Deferred:
+    """Run ``fn(*args)`` in the pool; the Deferred fires on the reactor thread."""
+    return Deferred.fromFuture(asyncio.wrap_future(pool.submit(fn, *args)))
@@ -1,16 +1,17 @@
 import logging, hashlib
 from itemadapter import ItemAdapter
 from neo4j import GraphDatabase, Transaction
+from neo4j.exceptions import DriverError, Neo4jError
 from typing import Dict, List
 from urllib.parse import urlparse
 
-from bundestags_scraper.items import (
-    SourceDomainItem, 
-    SourcePageItem, 
-    LegislativePeriodItem,
-    PoliticianItem, 
-    PoliticianContent,
+from bundestags_scraper.dimensions import (
+    ensure_id_counters,
+    get_registry,
+    link_query,
+    period_number,
 )
+from bundestags_scraper.urls import canonicalize_url
 
 _LOG = logging.getLogger(__name__)
 
@@ -18,68 +19,141 @@ _LOG = logging.getLogger(__name__)
 #  Helpers                                                                    #
 # --------------------------------------------------------------------------- #
 
-def _mandate_id(period_nr: str, pol_url: str) -> str:
+def _mandate_id(period_nr: int | str, pol_url: str) -> str:
     data = f"{period_nr}#{pol_url}".encode("utf-8")
     return hashlib.sha1(data).hexdigest()
 
-PARTY_ALIASES = {
-    # CDU / CSU
-    "CDU/CSU (CDU)": "CDU",
-    "CSU (GDP)":     "CSU",
-    "CDU/CSU (CSU)": "CSU",
-
-    # SPD
-    "SPD (GDP)":     "SPD",
-
-    # Bündnis 90/Die Grünen
-    "Die Grünen":  "Bündnis 90/Die Grünen",
-    "GRÜNE":       "Bündnis 90/Die Grünen",
-    "Grüne":       "Bündnis 90/Die Grünen",
-    "Bündnis 90":  "Bündnis 90/Die Grünen",
-    "Grüne DDR":   "Bündnis 90/Die Grünen",
-
-    # AfD
-    "AfD (parteilos)":   "AfD",
-    "fraktionslos(AfD)": "AfD",
-
-    # DIE LINKE
-    "Die Linke": "DIE LINKE",
-    "Linke":     "DIE LINKE",
-    "PDS":       "DIE LINKE",
-
-    # Unabhängig / Parteilos
-    "parteilos":                  "Unabhängig / Parteilos",
-    "unabhängig":                 "Unabhängig / Parteilos",
-    "fraktionslos":               "Unabhängig / Parteilos",
-    "fraktionslos (Die PARTEI)":  "Unabhängig / Parteilos",
-    "fraktionslos (LKR)":         "Unabhängig / Parteilos",
-    "fraktionslos(SSW)":          "Unabhängig / Parteilos",
-
-    # BSW
-    "BSW": "BSW",
-}
+def _content_id(pc: dict) -> str:
+    data = f"{pc['source_page']}#{pc['section_header']}".encode("utf-8")
+    return hashlib.sha1(data).hexdigest()
+
+def _text_hash(text: str | None) -> str:
+    return hashlib.sha1((text or "").encode("utf-8")).hexdigest()
 
 def normalize_party_name(raw: str | None) -> str | None:
-    if raw is None:
-        return None
-    cleaned = raw.strip()
-    return PARTY_ALIASES.get(cleaned, cleaned)
+    """Canonical party name (aliases, case and whitespace variants; cached)."""
+    return get_registry().party.canonical(raw)
+
+# --------------------------------------------------------------------------- #
+#  Schema                                                                     #
+# --------------------------------------------------------------------------- #
+
+# Every MERGE/MATCH key used below.  Without these, each statement starts with
+# a NodeByLabelScan; with them the planner uses NodeUniqueIndexSeek.
+CONSTRAINTS = {
+    "domain_name":             ("Domain", "name"),
+    "page_url":                ("Page", "url"),
+    "period_number":           ("Period", "number"),
+    "politician_detail_page":  ("Politician", "detail_page"),
+    "mandate_id":              ("Mandate", "id"),
+    "content_id":              ("Content", "id"),
+    "party_name":              ("Party", "name"),
+    "state_name":              ("State", "name"),
+    "constituency_name":       ("Constituency", "name"),
+    # integer dimension keys; a duplicate allocation fails the write
+    "party_id":                ("Party", "id"),
+    "state_id":                ("State", "id"),
+    "constituency_id":         ("Constituency", "id"),
+    "id_counter_label":        ("IdCounter", "label"),
+}
+
+_PARTY_LINK = link_query("Party", "AFFILIATED_WITH", "party_id")
+_STATE_LINK = link_query("State", "REPRESENTS_STATE", "state_id")
+_CONSTITUENCY_LINK = link_query("Constituency", "REPRESENTS_CONSTITUENCY", "constituency_id")
+
+
+def ensure_constraints(driver):
+    with driver.session() as ses:
+        for name, (label, prop) in CONSTRAINTS.items():
+            try:
+                ses.run(
+                    f"CREATE CONSTRAINT {name} IF NOT EXISTS "
+                    f"FOR (n:{label}) REQUIRE n.{prop} IS UNIQUE"
+                ).consume()
+            except Neo4jError as exc:
+                # e.g. duplicates left over from runs without constraints
+                _LOG.warning("[Neo4jPipeline] constraint %s not created: %s", name, exc)
+    ensure_id_counters(driver)
+
+# --------------------------------------------------------------------------- #
+#  Content change detection                                                   #
+# --------------------------------------------------------------------------- #
+
+_CONTENT_TYPES = {"content", "politician_content"}
+
+# item fields that are used as node keys
+_URL_FIELDS = ("url", "source_page", "detail_page")
+
+
+class ContentHashes:
+    """
+    In-memory map cid → text hash of all Content nodes, bulk-loaded once.
+
+    Sections whose text hash is already stored are dropped before they
+    reach Bolt; on a re-crawl that is nearly all of them.
+    """
+
+    def __init__(self):
+        self._hashes: Dict[str, str] = {}
+
+    def load(self, driver):
+        with driver.session() as ses:
+            result = ses.run(
+                "MATCH (c:Content) WHERE c.text_hash IS NOT NULL "
+                "RETURN c.id AS cid, c.text_hash AS hash"
+            )
+            self._hashes = {r["cid"]: r["hash"] for r in result}
+        _LOG.info("[ContentHashes] %d content hashes preloaded", len(self._hashes))
+        return self
+
+    def is_unchanged(self, pc: dict) -> bool:
+        return self._hashes.get(_content_id(pc)) == _text_hash(pc.get("section_content"))
+
+    def remember(self, pc: dict):
+        self._hashes[_content_id(pc)] = _text_hash(pc.get("section_content"))
+
+    def remember_committed(self, item_type: str, rows):
+        """Record the hashes of ``rows`` once their transaction has committed."""
+        if item_type in _CONTENT_TYPES:
+            for pc in rows:
+                self.remember(pc)
+
+    def __len__(self):
+        return len(self._hashes)
 
 # --------------------------------------------------------------------------- #
 #  Batch helper                                                               #
 # --------------------------------------------------------------------------- #
 
 BATCH_SIZE = 1000
-_BATCHED_TYPES = {"page", "politician", "content"}  # item_type values
+_BATCHED_TYPES = {"domain", "page", "politician", "content", "politician_content"}  # item_type values
+
+# written with one UNWIND statement per batch instead of one statement per row
+_SET_WRITERS = {"domain": "_doms", "page": "_pages"}
+_ROW_WRITERS = {
+    "legislative_period": "_period",
+    "politician":         "_politician",
+    "content":            "_content",
+    "politician_content": "_content",
+}
+
+# dependency order for mixed batches: later types MATCH nodes of earlier ones
+WRITE_ORDER = ["domain", "page", "legislative_period", "politician",
+               "content", "politician_content"]
 
 
 class _BatchBuffer:
     """
     Collects items per type and flushes them once BATCH_SIZE is reached.
+
+    Content hashes are recorded only after the batch has committed, so a
+    failed write is not mistaken for an unchanged section later on.
     """
 
-    def __init__(self, driver):
+    def __init__(self, driver, batch_size: int = BATCH_SIZE, hashes: "ContentHashes | None" = None):
         self.driver = driver
+        self.batch_size = batch_size
+        self.hashes = hashes
         self.buf: Dict[str, List[dict]] = {t: [] for t in _BATCHED_TYPES}
 
     # –– public ---------------------------------------------------------
@@ -88,7 +162,7 @@ class _BatchBuffer:
             return
         bucket = self.buf[item_type]
         bucket.append(data)
-        if len(bucket) >= BATCH_SIZE:
+        if len(bucket) >= self.batch_size:
             self._flush_type(item_type)
 
     def flush_all(self):
@@ -102,18 +176,11 @@ class _BatchBuffer:
             return
         self.buf[item_type] = []  # clear early → easier error recovery
 
-        def _write(tx: Transaction):
-            for row in batch:
-                if item_type == "page":
-                    Neo4jPipeline._page(tx, row)
-                elif item_type == "politician":
-                    Neo4jPipeline._politician(tx, row)
-                elif item_type == "content":
-                    Neo4jPipeline._content(tx, row)
-
         # one transaction = one network round-trip
         with self.driver.session() as ses:
-            ses.execute_write(_write)
+            ses.execute_write(Neo4jPipeline.write_batch, item_type, batch)
+        if self.hashes is not None:
+            self.hashes.remember_committed(item_type, batch)
 
 # --------------------------------------------------------------------------- #
 #  Main pipeline                                                              #
@@ -123,16 +190,30 @@ class Neo4jPipeline:
     """
     Writes Scrapy items into Neo4j.
 
-    High-volume items (Page, Politician, Content) are buffered and written
-    in batches to reduce network I/O.  Low-volume items (Domain, Period)
-    are still written immediately.
+    High-volume items (Domain, Page, Politician, Content) are buffered and
+    written in batches to reduce network I/O.  Domains and pages are written
+    with set-oriented UNWIND statements that MERGE both ends of the
+    BELONGS_TO_DOMAIN edge, so they do not depend on arrival order.
+    Periods are still written immediately.
+
+    With NEO4J_WRITE_BEHIND enabled, items are only appended to a durable
+    local queue (see write_queue.py) and ``ingest_worker.py`` writes them to
+    Neo4j, so the crawl neither waits for nor depends on the database.
     """
 
      # ----------  Scrapy hooks  ----------------------------------------
-    def __init__(self, uri: str, user: str, pwd: str):
+    def __init__(self, uri: str, user: str, pwd: str,
+                 write_behind: bool = False, queue_path: str | None = None,
+                 stats=None):
         self._uri, self._user, self._pwd = uri, user, pwd
         self._driver = None
         self._buffer: _BatchBuffer | None = None
+        self._write_behind = write_behind
+        self._queue_path = queue_path
+        self._queue = None
+        self._hashes = ContentHashes()
+        self._stats = stats
+        self._seen_pages: set[str] = set()
 
     @classmethod
     def from_crawler(cls, crawler):
@@ -140,14 +221,54 @@ class Neo4jPipeline:
             crawler.settings["NEO4J_URI"],
             crawler.settings["NEO4J_USER"],
             crawler.settings["NEO4J_PASSWORD"],
+            write_behind=crawler.settings.getbool("NEO4J_WRITE_BEHIND"),
+            queue_path=crawler.settings.get("NEO4J_QUEUE_PATH"),
+            stats=crawler.stats,
         )
 
+    @staticmethod
+    def write_batch(tx: Transaction, item_type: str, rows: List[dict]):
+        """Write a list of items of one item_type inside ``tx``."""
+        if item_type in _SET_WRITERS:
+            getattr(Neo4jPipeline, _SET_WRITERS[item_type])(tx, rows)
+        elif item_type in _ROW_WRITERS:
+            writer = getattr(Neo4jPipeline, _ROW_WRITERS[item_type])
+            for row in rows:
+                writer(tx, row)
+        else:
+            _LOG.warning("[Neo4jPipeline] no writer for item_type=%r", item_type)
+
     def open_spider(self, _):
+        if self._write_behind:
+            from bundestags_scraper.write_queue import WriteQueue
+
+            _LOG.info("[Neo4jPipeline] write-behind → %s", self._queue_path)
+            self._queue = WriteQueue(self._queue_path)
+            self._preload_hashes()
+            return
         _LOG.info("[Neo4jPipeline] connect → %s", self._uri)
         self._driver = GraphDatabase.driver(self._uri, auth=(self._user, self._pwd))
-        self._buffer = _BatchBuffer(self._driver)
+        ensure_constraints(self._driver)
+        self._hashes.load(self._driver)
+        get_registry().load(self._driver)
+        self._buffer = _BatchBuffer(self._driver, hashes=self._hashes)
+
+    def _preload_hashes(self):
+        """
+        Write-behind: read the content hashes once so unchanged sections are
+        not queued. Neo4j being down only costs the skip, not the crawl.
+        """
+        driver = GraphDatabase.driver(self._uri, auth=(self._user, self._pwd))
+        try:
+            self._hashes.load(driver)
+        except (Neo4jError, DriverError) as exc:
+            _LOG.warning("[Neo4jPipeline] content hashes not loaded, queueing every section: %s", exc)
+        finally:
+            driver.close()
 
     def close_spider(self, _):
+        if self._queue:
+            self._queue.close()
         # flush remaining batched items
         if self._buffer:
             self._buffer.flush_all()
@@ -156,29 +277,56 @@ class Neo4jPipeline:
 
     # ----------  Item router  --------------------------------------------
     def process_item(self, item, spider):
-        adapter = ItemAdapter(item)
-        data = adapter.asdict()
+        # the adapter wraps the item without copying it; helpers only need
+        # data["key"] / data.get("key")
+        data = ItemAdapter(item)
         item_type = data.get("item_type")
 
+        self._canonicalize(data)
+        if item_type == "page":
+            if data["url"] in self._seen_pages:
+                self._inc("canonical/pages_collapsed")
+                return item
+            self._seen_pages.add(data["url"])
+
+        if item_type in _CONTENT_TYPES:
+            if self._hashes.is_unchanged(data):
+                self._inc("neo4j/content_unchanged")
+                return item
+            self._inc("neo4j/content_written")
+
+        if self._queue:
+            self._queue.append(item_type, data.asdict())
+            # the queue is durable: the section will be written by the worker
+            self._hashes.remember_committed(item_type, [data])
+            return item
+
         # high-volume types → buffer
         if item_type in _BATCHED_TYPES and self._buffer:
             self._buffer.add(item_type, data)
             return item
 
-        # everything else → immediate write
+        # everything else → immediate write (routed by item_type, so plain
+        # records such as SectionRecord work as well as scrapy.Items)
         with self._driver.session() as ses:
-            if isinstance(item, SourceDomainItem):
-                ses.write_transaction(self._dom, data)
-            elif isinstance(item, SourcePageItem):
-                ses.write_transaction(self._page, data)
-            elif isinstance(item, LegislativePeriodItem):
-                ses.write_transaction(self._period, data)
-            elif isinstance(item, PoliticianItem):
-                ses.write_transaction(self._politician, data)
-            elif isinstance(item, PoliticianContent):
-                ses.write_transaction(self._content, data)
+            ses.execute_write(self.write_batch, item_type, [data])
+        self._hashes.remember_committed(item_type, [data])
         return item
 
+    def _inc(self, key: str):
+        if self._stats:
+            self._stats.inc_value(key)
+
+    def _canonicalize(self, data):
+        """Rewrite URL keys in place to their canonical form (see urls.py)."""
+        for field in _URL_FIELDS:
+            value = data.get(field)
+            if value:
+                canonical = canonicalize_url(value)
+                if canonical != value:
+                    data[field] = canonical
+                    self._inc("canonical/urls_rewritten")
+
     # ----------  Cypher helpers  -----------------------------------------
     # ───────────────── page helper ──────────────────────────────────
     @staticmethod
@@ -205,34 +353,54 @@ class Neo4jPipeline:
         
     # Domain ----------------------------------------------------------------
     @staticmethod
-    def _dom(tx: Transaction, d):
+    def _doms(tx: Transaction, rows):
+        # a page may have created the domain first → fill description later
         tx.run(
-            "MERGE (d:Domain {name:$name}) "
-            "ON CREATE SET d.description=$desc",
-            name=d["domain"],
-            desc=d.get("description"),
+            """
+            UNWIND $rows AS row
+            MERGE (d:Domain {name:row.name})
+            ON CREATE SET d.description = row.desc
+            ON MATCH  SET d.description = coalesce(d.description, row.desc)
+            """,
+            rows=[{"name": d["domain"], "desc": d.get("description")} for d in rows],
         )
 
+    @staticmethod
+    def _dom(tx: Transaction, d):
+        Neo4jPipeline._doms(tx, [d])
+
     # Page ------------------------------------------------------------------
     @staticmethod
-    def _page(tx: Transaction, p):
+    def _pages(tx: Transaction, rows):
         tx.run(
             """
-            MERGE (pg:Page {url:$url})
-            ON CREATE SET pg.title = $title,
-                          pg.html  = $html
-            ON MATCH  SET pg.title = coalesce(pg.title, $title),
-                          pg.html  = coalesce(pg.html,  $html)
-            WITH pg
-            MATCH (d:Domain {name:$dom})
+            UNWIND $rows AS row
+            MERGE (d:Domain {name:row.dom})
+            MERGE (pg:Page {url:row.url})
+            ON CREATE SET pg.title    = row.title,
+                          pg.html     = row.html,
+                          pg.html_ref = row.html_ref
+            ON MATCH  SET pg.title    = coalesce(pg.title, row.title),
+                          pg.html     = coalesce(pg.html,  row.html),
+                          pg.html_ref = coalesce(row.html_ref, pg.html_ref)
             MERGE (pg)-[:BELONGS_TO_DOMAIN]->(d)
             """,
-            url=p["url"],
-            title=p.get("title"),
-            html=p.get("full_html"),
-            dom=p["source_domain"],
+            rows=[
+                {
+                    "url": p["url"],
+                    "title": p.get("title"),
+                    "html": p.get("full_html"),
+                    "html_ref": p.get("html_ref"),
+                    "dom": p["source_domain"],
+                }
+                for p in rows
+            ],
         )
 
+    @staticmethod
+    def _page(tx: Transaction, p):
+        Neo4jPipeline._pages(tx, [p])
+
     @staticmethod
     def _merge_page(tx: Transaction, p):
         Neo4jPipeline._ensure_page(
@@ -242,14 +410,19 @@ class Neo4jPipeline:
     # Period ----------------------------------------------------------------
     @staticmethod
     def _period(tx: Transaction, pr):
+        nr = period_number(pr["period_number"])
+        if nr is None:
+            _LOG.warning("[Neo4jPipeline] period without number skipped: %r (%r)",
+                         pr.get("name"), pr.get("period_number"))
+            return
         tx.run(
             """
             MERGE (per:Period {number:$nr})
-            ON CREATE SET per.name       = $name,
-                          per.start_date = $st,
-                          per.end_date   = $end
+            SET per.name       = coalesce(per.name, $name),
+                per.start_date = coalesce(per.start_date, $st),
+                per.end_date   = coalesce(per.end_date, $end)
             """,
-            nr=pr["period_number"],
+            nr=nr,
             name=pr["name"],
             st=pr["start_date"],
             end=pr["end_date"],
@@ -265,7 +438,7 @@ class Neo4jPipeline:
                 MERGE (per)-[:HAS_SOURCE_PAGE]->(pg)
                 """,
                 src=pr["source_page"],
-                nr=pr["period_number"],
+                nr=nr,
             )
             
         # link to detail list page
@@ -277,7 +450,7 @@ class Neo4jPipeline:
                 MATCH (det:Page {url:$url})
                 MERGE (per)-[:HAS_DETAIL_PAGE]->(det)
                 """,
-                nr=pr["period_number"],
+                nr=nr,
                 url=pr["detail_page"],
             )
 
@@ -285,7 +458,8 @@ class Neo4jPipeline:
     @staticmethod
     def _politician(tx: Transaction, pol):
         src, det = pol["source_page"], pol["detail_page"]
-        normalized_party = normalize_party_name(pol.get("political_party"))
+        nr = period_number(pol.get("legislative_period_number"))
+        dims = get_registry().mandate_keys(pol)
         
         
         # core node ----------------------------------------------------
@@ -344,20 +518,22 @@ class Neo4jPipeline:
             
             
         # period edge --------------------------------------------------
-        if pol.get("legislative_period_number"):
+        # MERGE, not MATCH: with several ingest workers the Period item may
+        # be written after its politicians; _period fills in the stub
+        if nr is not None:
             tx.run(
                 """
                 MATCH (po:Politician {detail_page:$det})
-                MATCH (per:Period {number:$nr})
+                MERGE (per:Period {number:$nr})
                 MERGE (po)-[:SERVED_DURING]->(per)
                 """,
                 det=det,
-                nr=pol["legislative_period_number"],
+                nr=nr,
             )
 
         # ── Mandate (one per politician & period combination) ────────────────
         # mandate node ---------------------------------------------
-            mandate_id = _mandate_id(pol["legislative_period_number"], det)
+            mandate_id = _mandate_id(nr, det)
             tx.run(
                 """
                 MERGE (m:Mandate {id:$mid})
@@ -369,11 +545,13 @@ class Neo4jPipeline:
                               m.federate_state  = coalesce(m.federate_state,$state),
                               m.constituency    = coalesce(m.constituency,$const),
                               m.remarks         = coalesce(m.remarks,$remarks)
+                SET m.period_number = $nr
                 """,
                 mid=mandate_id,
-                party=normalized_party,
-                state=pol.get("federate_state"),
-                const=pol.get("constituency"),
+                nr=nr,
+                party=dims["party"],
+                state=dims["state"],
+                const=dims["const"],
                 remarks=pol.get("remarks")
             )
             # connect Mandate
@@ -386,66 +564,44 @@ class Neo4jPipeline:
                 MERGE (m)-[:IN_PERIOD]->(per)
                 """,
                 det=det,
-                nr=pol["legislative_period_number"],
+                nr=nr,
                 mid=mandate_id,
             )
 
             # Party / State / Constituency edges (optional) --------
-            if pol.get("political_party"):
-                tx.run(
-                    """
-                    MERGE (pa:Party {name:$party})
-                    WITH pa
-                    MATCH (m:Mandate {id:$mid})
-                    MERGE (m)-[:AFFILIATED_WITH]->(pa)
-                    """,
-                    party=normalized_party,
-                    mid=mandate_id,
-                )
-            if pol.get("federate_state"):
-                tx.run(
-                    """
-                    MERGE (st:State {name:$state})
-                    WITH st
-                    MATCH (m:Mandate {id:$mid})
-                    MERGE (m)-[:REPRESENTS_STATE]->(st)
-                    """,
-                    state=pol["federate_state"],
-                    mid=mandate_id,
-                )
-            if pol.get("constituency"):
-                tx.run(
-                    """
-                    MERGE (co:Constituency {name:$const})
-                    WITH co
-                    MATCH (m:Mandate {id:$mid})
-                    MERGE (m)-[:REPRESENTS_CONSTITUENCY]->(co)
-                    """,
-                    const=pol["constituency"],
-                    mid=mandate_id,
-                )
+            # ids come from the IdCounter nodes (see dimensions.py)
+            if dims["party"]:
+                tx.run(_PARTY_LINK, name=dims["party"], mid=mandate_id)
+            if dims["state"]:
+                tx.run(_STATE_LINK, name=dims["state"], mid=mandate_id)
+            if dims["const"]:
+                tx.run(_CONSTITUENCY_LINK, name=dims["const"], mid=mandate_id)
             
 
     # Content ---------------------------------------------------------------
     @staticmethod
     def _content(tx: Transaction, pc):
-        cid = hashlib.sha1(
-            f"{pc['source_page']}#{pc['section_header']}".encode("utf-8")
-        ).hexdigest()
+        cid = _content_id(pc)
 
         Neo4jPipeline._ensure_page(tx, url=pc["source_page"])
 
-        tx.run(
+        # overwrite changed text; sections without text_hash predate change
+        # detection and are compared by their text
+        changed = tx.run(
             """
             MERGE (c:Content {id:$cid})
-            ON CREATE SET c.section_header  = $hdr,
-                          c.section_content = $txt
-            ON MATCH  SET c.section_content = coalesce(c.section_content, $txt)
+            ON CREATE SET c.section_header  = $hdr
+            WITH c, coalesce(c.text_hash <> $hash,
+                             c.section_content <> $txt, true) AS changed
+            SET c.section_content = $txt,
+                c.text_hash       = $hash
+            RETURN changed
             """,
             cid=cid,
             hdr=pc["section_header"],
             txt=pc["section_content"],
-        )
+            hash=_text_hash(pc["section_content"]),
+        ).single()["changed"]
         
         tx.run(
             """
@@ -457,12 +613,17 @@ class Neo4jPipeline:
             url=pc["source_page"],
         )
         
+        # content_changed_at (epoch ms) tells the enrichment stage to
+        # re-process this politician
         tx.run(
             """
             MATCH (po:Politician {detail_page:$url})
             MATCH (c:Content {id:$cid})
             MERGE (po)-[:HAS_CONTENT]->(c)
+            FOREACH (_ IN CASE WHEN $changed THEN [1] ELSE [] END |
+                SET po.content_changed_at = timestamp())
             """,
             url=pc["source_page"],
             cid=cid,
+            changed=changed,
         )
@@ -56,6 +56,20 @@ DOWNLOAD_DELAY = 0.0001
 #DOWNLOADER_MIDDLEWARES = {
 #    "bundestags_scraper.middlewares.BundestagsScraperDownloaderMiddleware": 543,
 #}
+# AIMD must run above RetryMiddleware (550) to see 429/503 first
+DOWNLOADER_MIDDLEWARES = {
+    "bundestags_scraper.middlewares.AimdConcurrencyMiddleware": 560,
+}
+
+# Per-slot concurrency controller (see AimdConcurrencyMiddleware);
+# CONCURRENT_REQUESTS stays the global upper bound
+AIMD_ENABLED           = True
+AIMD_START_CONCURRENCY = 8
+AIMD_MIN_CONCURRENCY   = 1
+AIMD_MAX_CONCURRENCY   = 64
+AIMD_DECREASE_FACTOR   = 0.5
+AIMD_TARGET_LATENCY    = 2.0    # seconds; no increase above this
+AIMD_MAX_RETRY_AFTER   = 120.0  # cap for Retry-After pauses
 
 # Enable or disable extensions
 # See https://docs.scrapy.org/en/latest/topics/extensions.html
@@ -110,6 +124,50 @@ NEO4J_URI      = _cfg["uri"]
 NEO4J_USER     = _cfg["username"]
 NEO4J_PASSWORD = _cfg["password"]
 
+# Write-behind: append items to a local durable queue and let
+# `python -m bundestags_scraper.ingest_worker` write them to Neo4j.
+NEO4J_WRITE_BEHIND = False
+NEO4J_QUEUE_PATH   = str(PROJECT_ROOT / "data" / "write_queue.sqlite3")
+
+# URL canonicalisation: requests are deduplicated on the canonical URL with
+# known redirect titles resolved (cache persisted across crawls)
+DUPEFILTER_CLASS   = "bundestags_scraper.urls.CanonicalDupeFilter"
+URL_REDIRECT_CACHE = str(PROJECT_ROOT / "data" / "redirects.json")
+
+# Lean items: page HTML goes to a gzip store on disk (Page.html_ref), content
+# sections are yielded as slotted SectionRecord instead of scrapy.Item.
+LEAN_ITEMS     = False
+HTML_STORE_DIR = str(PROJECT_ROOT / "data" / "html_store")
+
+# Parse pool: >0 moves HTML extraction of the politician / content spiders
+# into that many worker processes (0 = parse on the reactor thread)
+PARSE_POOL_WORKERS = 0
+
+# Sections of politician pages that are not stored (matched after
+# normalisation: case, whitespace, trailing ':'). A non-empty SECTION_INCLUDE
+# keeps only the listed sections. The '#' lead is kept on purpose: it often
+# names degree and profession.
+SECTION_INCLUDE = []
+SECTION_EXCLUDE = [
+    "Weblinks",
+    "Einzelnachweise",
+    "Literatur",
+    "Siehe auch",
+    "Abgeordneter",
+    "Abgeordnete",
+]
+
+# Section-header census, counted from every extracted section before the section
+# policy drops any (one file per content batch; merged by
+# `python -m bundestags_scraper.census --from-files`, or recomputed from the kept
+# sections in Neo4j by `python -m bundestags_scraper.census`)
+EXTENSIONS = {
+    "bundestags_scraper.census.HeaderCensus": 500,
+}
+HEADER_CENSUS_ENABLED  = True
+HEADER_CENSUS_CAPACITY = 5000
+HEADER_CENSUS_PATH     = str(PROJECT_ROOT / "data" / "header_census" / "{spider}_batch_{batch}.json")
+
 ITEM_PIPELINES = {
     "bundestags_scraper.pipelines.Neo4jPipeline": 300,
 }
@@ -4,7 +4,11 @@ import pathlib
 from urllib.parse import urlparse
 
 from neo4j import GraphDatabase
+from scrapy.utils.defer import maybe_deferred_to_future
+from bundestags_scraper import parse_pool
+from bundestags_scraper.html_store import HtmlStore
 from bundestags_scraper.items import SourcePageItem, SourceDomainItem
+from bundestags_scraper.urls import RedirectCache, get_redirect_cache
 
 # --------------------------------------------------------------------------- #
 # Logging helper                                                              #
@@ -72,6 +76,24 @@ class SourceMixin:
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.seen_domains = set()
+        self._html_store = None
+
+    @property
+    def lean_items(self) -> bool:
+        """LEAN_ITEMS: spill HTML to the HtmlStore, yield compact section records."""
+        settings = getattr(self, "settings", None)
+        return bool(settings and settings.getbool("LEAN_ITEMS"))
+
+    @property
+    def redirects(self) -> RedirectCache:
+        """Process-wide redirect cache (shared with the dupefilter)."""
+        return get_redirect_cache(getattr(self, "settings", None))
+
+    @property
+    def html_store(self) -> HtmlStore:
+        if self._html_store is None:
+            self._html_store = HtmlStore(self.settings.get("HTML_STORE_DIR"))
+        return self._html_store
     
     def get_domain(self, response):
         """
@@ -93,33 +115,60 @@ class SourceMixin:
                 description=f"Domain extracted from {response.url}",
             )
 
-    def generate_source_page_item(self, response):
+    def generate_source_page_item(self, response, meta=None):
         """
         Create and return a SourcePageItem for the current response.
 
         Captures the page URL, title, full HTML, and domain.
 
         :param response: A Scrapy Response object.
+        :param meta: Result of extraction.page_meta, if already extracted.
         :return: SourcePageItem.
         """
         domain = self.get_domain(response)
         self.log_event("debug", "yield_source_page_item", domain=domain, url=response.url)
+        title = (meta["title"] if meta is not None
+                 else response.xpath('normalize-space(//title/text())').get())
+        if self.lean_items:
+            return SourcePageItem(
+                item_type='page',
+                url=response.url,
+                title=title,
+                html_ref=self.html_store.put(response.text),
+                source_domain=domain
+            )
         return SourcePageItem(
             item_type='page',
             url=response.url,
-            title=response.xpath('normalize-space(//title/text())').get(),
+            title=title,
             full_html=response.text,
             source_domain=domain
         )
         
-    def add_source_page(self, response):
+    def add_source_page(self, response, meta=None):
         """
         Add SourceDomainItem (only if first time seeing this domain),
         Add a SourcePageItem (always).
+        Also records redirects / rel=canonical of the response.
         """
+        self.redirects.learn(response, href=meta["canonical"] if meta is not None else None)
         if (dom := self.generate_source_domain_item(response)):
             yield dom
-        yield self.generate_source_page_item(response)
+        yield self.generate_source_page_item(response, meta)
+
+    async def extract(self, fn, response, *args):
+        """
+        Run an extraction.py function on the response body.
+
+        Inline by default; in the parse pool when PARSE_POOL_WORKERS > 0,
+        in which case the reactor only waits for the resulting dict.
+        """
+        args = (response.body, response.url, response.encoding, *args)
+        crawler = getattr(self, "crawler", None)
+        pool = parse_pool.get_pool(crawler) if crawler else None
+        if pool is None:
+            return fn(*args)
+        return await maybe_deferred_to_future(parse_pool.submit(pool, fn, *args))
         
     def validate_item(self, item, mandatory, url):
         missing = [f for f in mandatory if not item.get(f)]
@@ -171,4 +220,7 @@ class Neo4jMixin():
     @classmethod
     def from_crawler(cls, crawler, *args, **kwargs):
         kwargs["crawler"] = crawler
-        return cls(*args, **kwargs)
\ No newline at end of file
+        spider = cls(*args, **kwargs)
+        # what scrapy.Spider.from_crawler does: spider.crawler / spider.settings
+        spider._set_crawler(crawler)
+        return spider
\ No newline at end of file
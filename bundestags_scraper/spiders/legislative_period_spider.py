@@ -42,7 +42,7 @@ class LegislativePeriodSpider(LoggingMixin, SourceMixin, scrapy.Spider):
                 if href and text and 'Wahlperiode' in text:
                     m = re.search(r"\((\d+)\.\s*Wahlperiode\)", text)
                     
-                    period = m.group(1) if m else None
+                    period = int(m.group(1)) if m else None
                     
                     self.log_event("debug", "yield_period_item", period=period, name=text)
                     
@@ -2,7 +2,10 @@ import json
 import logging
 import unicodedata, html, re
 import scrapy
-from bundestags_scraper.items import PoliticianContent
+from bundestags_scraper.census import section_headers_seen
+from bundestags_scraper.extraction import SectionPolicy, normalize_header, parse_content_page
+from bundestags_scraper.items import PoliticianContent, SectionRecord
+from bundestags_scraper.urls import canonicalize_url
 from .base_spider import LoggingMixin, SourceMixin, Neo4jMixin
 
 class PoliticianContentSpider(LoggingMixin, SourceMixin, Neo4jMixin, scrapy.Spider):
@@ -18,6 +21,32 @@ class PoliticianContentSpider(LoggingMixin, SourceMixin, Neo4jMixin, scrapy.Spid
     def __init__(self, batch: int = 0, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.batch = int(batch) 
+        self._section_policy = None
+
+    @property
+    def section_policy(self) -> SectionPolicy:
+        if self._section_policy is None:
+            self._section_policy = SectionPolicy.from_settings(self.settings)
+        return self._section_policy
+
+    def filter_sections(self, sections: dict) -> dict:
+        """Apply SECTION_INCLUDE / SECTION_EXCLUDE; dropped sections are counted per header."""
+        # the header census counts every section, including the ones dropped here
+        self.crawler.signals.send_catch_log(section_headers_seen, headers=list(sections), spider=self)
+        stats = self.crawler.stats
+        kept = {}
+        for key, text in sections.items():
+            if self.section_policy.keeps(key):
+                kept[key] = text
+                continue
+            size = len(text.encode("utf-8"))
+            norm = normalize_header(key)
+            stats.inc_value("sections/dropped")
+            stats.inc_value("sections/dropped_bytes", size)
+            stats.inc_value(f"sections/dropped/{norm}")
+            stats.inc_value(f"sections/dropped_bytes/{norm}", size)
+        stats.inc_value("sections/kept", len(kept))
+        return kept
 
     def start_requests(self):
         skip  = self.batch * self.BATCH_SIZE
@@ -43,57 +72,36 @@ class PoliticianContentSpider(LoggingMixin, SourceMixin, Neo4jMixin, scrapy.Spid
                 self.log_event("debug", "queue_detail_page", url=rec["url"])
                 yield scrapy.Request(rec["url"], callback=self.parse)
 
-    def parse(self, response):
+    async def parse(self, response):
         '''yield self.generate_source_page_item(response)'''
         self.log_event("info", "start_parse_content", url=response.url)
-        
-        for src in self.add_source_page(response):
+
+        # lxml work runs in the parse pool if PARSE_POOL_WORKERS > 0
+        page = await self.extract(parse_content_page, response)
+
+        for src in self.add_source_page(response, page):
             yield src
-        
-        
-        container = response.xpath(
-            "//div[@id='mw-content-text']/div[contains(@class,'mw-parser-output')]"
-        )
-        if not container:
+
+        sections = page["sections"]
+        if sections is None:
             self.log_event("warning", "no_content_container", url=response.url)
             return
-        children = container.xpath('./*')
-        if not children:
-            self.log_event("warning", "no_content_container_children", url=response.url)
-            return
-
-        sections = {}
-        current = '#'
-        sections[current] = []
-
-        for elem in children:
-            if elem.xpath("@id").get() == 'normdaten':
-                # self.logger.debug(f"Reached 'normdaten' at {response.url}, ending parse loop.")
-                break
-            if elem.root.tag == 'div' and elem.xpath('.//h2'):
-                title = elem.xpath('.//h2//text()').get(default='').strip()
-                if title:
-                    current = title
-                    sections[current] = []
-                continue
-            text = elem.xpath('string()').get()
-            if text:
-                cleaned = ' '.join(text.split())
-                sections[current].append(cleaned)
 
-        
-        for key in list(sections.keys()):
-            sections[key] = '\n'.join(sections[key]).strip()
-            #if not sections[key]:
-                #self.logger.debug(f"Section '{key}' on {response.url} is empty after joining.")
+        sections = self.filter_sections(sections)
+        self.log_event("debug", "yield_politician_content_item", url=response.url)
 
+        # key of the politician this page was requested for (before any redirect)
+        source_page = canonicalize_url(response.meta.get("redirect_urls", [response.url])[0])
 
-        self.log_event("debug", "yield_politician_content_item", url=response.url)
+        if self.lean_items:
+            for key, text in sections.items():
+                yield SectionRecord(source_page, key, text)
+            return
         
         for key in sections:
             yield PoliticianContent(
                 item_type='politician_content',
-                source_page= response.url,
+                source_page= source_page,
                 section_header = key,
                 section_content = sections[key]
-            )
\ No newline at end of file
+            )
@@ -0,0 +1,171 @@
+"""
+URL canonicalisation shared by request scheduling and pipeline keys.
+
+Two layers:
+
+* ``canonicalize_url`` is pure and deterministic. It strips the fragment,
+  lowercases scheme and host, and normalises the percent-encoding: the
+  path is decoded, NFC-normalised, spaces become ``_`` (MediaWiki titles)
+  and it is re-encoded with uppercase hex. ``/wiki/%C5%BBory`` and
+  ``/wiki/Żory#Leben`` give the same key. The query is normalised per
+  key/value pair, so an encoded ``%26`` or ``%3D`` stays data and never
+  becomes a separator.
+* ``RedirectCache`` maps redirect titles to the article they point to,
+  learned from HTTP redirects and from ``<link rel="canonical">`` (MediaWiki
+  serves redirect titles with status 200). It is persisted as JSON
+  (URL_REDIRECT_CACHE), so later crawls resolve redirect titles before
+  fetching them.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import unicodedata
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit, urlunsplit
+
+from scrapy.dupefilters import RFPDupeFilter
+from scrapy.utils.job import job_dir
+
+_LOG = logging.getLogger(__name__)
+
+_PATH_SAFE = "/:@!$&'()*+,;=-._~"
+# inside a query key or value: no separators, and '+' would read as a space
+_QUERY_SAFE = "/:@!$'()*,;-._~?"
+
+
+def _nfc(text: str) -> str:
+    return unicodedata.normalize("NFC", text)
+
+
+@lru_cache(maxsize=200_000)
+def canonicalize_url(url: str | None) -> str | None:
+    if not url:
+        return url
+    parts = urlsplit(url.strip())
+    path = unicodedata.normalize("NFC", unquote(parts.path))
+    if path.startswith("/wiki/"):
+        path = path.replace(" ", "_")
+    pairs = [(_nfc(k), _nfc(v)) for k, v in parse_qsl(parts.query, keep_blank_values=True)]
+    return urlunsplit((
+        parts.scheme.lower(),
+        parts.netloc.lower(),
+        quote(path, safe=_PATH_SAFE) or "/",
+        urlencode(pairs, safe=_QUERY_SAFE, quote_via=quote),
+        "",
+    ))
+
+
+class RedirectCache:
+    """canonical URL → canonical URL of the article it redirects to."""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self._map: dict[str, str] = {}
+        self._dirty = False
+        if self.path and self.path.exists():
+            with open(self.path, encoding="utf-8") as fh:
+                self._map = json.load(fh)
+
+    def __len__(self):
+        return len(self._map)
+
+    def add(self, src: str, dst: str):
+        src, dst = canonicalize_url(src), canonicalize_url(dst)
+        if src and dst and src != dst and self._map.get(src) != dst:
+            self._map[src] = dst
+            self._dirty = True
+
+    def resolve(self, url: str | None) -> str | None:
+        """Canonical form of ``url`` with known redirects followed."""
+        key = canonicalize_url(url)
+        seen = set()
+        while key in self._map and key not in seen:   # guard against cycles
+            seen.add(key)
+            key = self._map[key]
+        return key
+
+    def learn(self, response, href=None):
+        """
+        Record HTTP redirects and the page's rel=canonical target.
+
+        ``href`` is the canonical link if it was already extracted (``""``
+        for none); otherwise it is looked up in the response.
+        """
+        target = response.url
+        if href is None and hasattr(response, "xpath"):
+            href = response.xpath('//link[@rel="canonical"]/@href').get()
+        if href:
+            target = response.urljoin(href)
+        for src in response.meta.get("redirect_urls", []) + [response.url]:
+            self.add(src, target)
+        return canonicalize_url(target)
+
+    def save(self):
+        if not (self.path and self._dirty):
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self._map, fh, ensure_ascii=False, indent=0, sort_keys=True)
+        os.replace(tmp, self.path)
+        self._dirty = False
+        _LOG.info("[RedirectCache] %d redirects saved to %s", len(self._map), self.path)
+
+
+_CACHES: dict[str, RedirectCache] = {}
+
+
+def get_redirect_cache(settings) -> RedirectCache:
+    """One RedirectCache per file and process (dupefilter, spiders, pipeline)."""
+    path = settings.get("URL_REDIRECT_CACHE") if settings else None
+    key = str(path)
+    if key not in _CACHES:
+        _CACHES[key] = RedirectCache(path)
+    return _CACHES[key]
+
+
+class CanonicalFingerprinter:
+    """Request fingerprint on ``method + resolved canonical URL`` (dupefilter only)."""
+
+    def __init__(self, redirects: RedirectCache):
+        self.redirects = redirects
+
+    def fingerprint(self, request) -> bytes:
+        key = f"{request.method} {self.redirects.resolve(request.url)}"
+        return hashlib.sha1(key.encode("utf-8")).digest()
+
+
+class CanonicalDupeFilter(RFPDupeFilter):
+    """
+    Request dupefilter on the canonical URL with known redirects resolved.
+
+    Requests that only differ in encoding, fragment or (known) redirect
+    title are dropped; ``canonical/requests_collapsed`` counts dropped
+    requests whose URL was not already in resolved canonical form (no
+    per-URL state, so memory stays flat on long crawls).
+    """
+
+    @classmethod
+    def from_crawler(cls, crawler):
+        redirects = get_redirect_cache(crawler.settings)
+        df = cls(
+            job_dir(crawler.settings),
+            crawler.settings.getbool("DUPEFILTER_DEBUG"),
+            fingerprinter=CanonicalFingerprinter(redirects),
+        )
+        df.redirects = redirects
+        df.stats = crawler.stats
+        return df
+
+    def request_seen(self, request) -> bool:
+        seen = super().request_seen(request)
+        if seen and self.redirects.resolve(request.url) != request.url:
+            self.stats.inc_value("canonical/requests_collapsed")
+        return seen
+
+    def close(self, reason):
+        self.redirects.save()
+        return super().close(reason)
@@ -0,0 +1,135 @@
+"""
+One-off migration of existing node keys to canonical URLs (see urls.py).
+
+Rewrites Page.url, Politician.detail_page, and the ids derived from the
+politician key (Content.id from the canonical source page, Mandate.id from
+period and canonical detail page) where the canonical form differs. Keys whose
+canonical form already exists on another node are not touched: those
+nodes are real duplicates and are listed for a manual merge.
+
+    python -m bundestags_scraper.utils.canonicalize_keys            # dry run
+    python -m bundestags_scraper.utils.canonicalize_keys --apply
+"""
+
+import argparse
+from itertools import islice
+
+from neo4j import GraphDatabase
+from scrapy.utils.project import get_project_settings
+
+from bundestags_scraper.pipelines import _content_id, _mandate_id
+from bundestags_scraper.urls import canonicalize_url
+
+KEYS = [
+    ("Page", "url"),
+    ("Politician", "detail_page"),
+]
+
+CONTENT_QUERY = """
+MATCH (po:Politician)-[:HAS_CONTENT]->(c:Content)
+RETURN c.id AS id, po.detail_page AS source_page, c.section_header AS section_header
+"""
+
+MANDATE_QUERY = """
+MATCH (po:Politician)-[:HAS_MANDATE]->(m:Mandate)
+OPTIONAL MATCH (m)-[:IN_PERIOD]->(per:Period)
+RETURN m.id AS id, po.detail_page AS detail_page,
+       coalesce(m.period_number, per.number) AS period_number
+"""
+
+
+def _chunks(rows, size=1000):
+    it = iter(rows)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def plan_renames(values):
+    """values: existing keys → ({old: new}, [(old, new) collisions])."""
+    existing = set(values)
+    renames, collisions = {}, []
+    targets = set()
+    for old in values:
+        new = canonicalize_url(old)
+        if new == old:
+            continue
+        if new in existing or new in targets:
+            collisions.append((old, new))
+        else:
+            renames[old] = new
+            targets.add(new)
+    return renames, collisions
+
+
+def plan_derived(rows, new_id):
+    """rows with an ``id`` → ({old: new}, [(old, new) collisions]) for ids recomputed by ``new_id(row)``."""
+    existing = {r["id"] for r in rows}
+    renames, collisions = {}, []
+    targets = set()
+    for r in rows:
+        new = new_id(r)
+        if new is None or new == r["id"]:
+            continue
+        if new in existing or new in targets:
+            collisions.append((r["id"], new))
+        else:
+            renames[r["id"]] = new
+            targets.add(new)
+    return renames, collisions
+
+
+def _mandate_row_id(r):
+    if r["period_number"] is None:
+        return None
+    return _mandate_id(r["period_number"], canonicalize_url(r["detail_page"]))
+
+
+def _report_and_rename(ses, label, prop, renames, collisions, apply):
+    print(f"{label}.{prop}: {len(renames)} to rewrite, {len(collisions)} duplicates")
+    for old, new in collisions[:20]:
+        print(f"  duplicate: {old} -> {new}")
+    if apply:
+        for chunk in _chunks(renames.items()):
+            ses.run(
+                f"UNWIND $rows AS row MATCH (n:{label} {{{prop}: row[0]}}) SET n.{prop} = row[1]",
+                rows=[list(pair) for pair in chunk],
+            ).consume()
+
+
+def migrate(driver, apply=False):
+    with driver.session() as ses:
+        for label, prop in KEYS:
+            values = [r["v"] for r in ses.run(
+                f"MATCH (n:{label}) WHERE n.{prop} IS NOT NULL RETURN n.{prop} AS v")]
+            renames, collisions = plan_renames(values)
+            _report_and_rename(ses, label, prop, renames, collisions, apply)
+
+        # Content and Mandate ids hash the (now canonical) politician key;
+        # otherwise a re-crawl MERGEs a second node next to the old one
+        contents = ses.run(CONTENT_QUERY).data()
+        renames, collisions = plan_derived(contents, lambda r: _content_id(
+            {"source_page": canonicalize_url(r["source_page"]), "section_header": r["section_header"]}))
+        _report_and_rename(ses, "Content", "id", renames, collisions, apply)
+
+        mandates = ses.run(MANDATE_QUERY).data()
+        renames, collisions = plan_derived(mandates, _mandate_row_id)
+        _report_and_rename(ses, "Mandate", "id", renames, collisions, apply)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rewrite graph keys to canonical URLs.")
+    parser.add_argument("--apply", action="store_true", help="write changes (default: dry run)")
+    args = parser.parse_args(argv)
+
+    settings = get_project_settings()
+    driver = GraphDatabase.driver(
+        settings["NEO4J_URI"], auth=(settings["NEO4J_USER"], settings["NEO4J_PASSWORD"])
+    )
+    try:
+        migrate(driver, apply=args.apply)
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
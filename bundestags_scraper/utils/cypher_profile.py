@@ -0,0 +1,232 @@
+"""
+Profile the Cypher statements of Neo4jPipeline and compare them to a baseline.
+
+Every helper (_dom, _page, _period, _politician, _content, and _ensure_page
+through them) is called with synthetic items under https://profile.invalid/;
+_content runs for a PoliticianContent dict and for a lean SectionRecord.
+A proxy transaction prefixes each statement with PROFILE and records db hits,
+rows and the operators of the executed plan. Each helper runs twice, once
+creating the nodes and once matching them. The transaction is rolled back at
+the end, so the profiled database is left untouched.
+
+Usage (against the local Neo4j from docker-compose.yaml / settings.py):
+
+    python -m bundestags_scraper.utils.cypher_profile                 # check
+    python -m bundestags_scraper.utils.cypher_profile --update-baseline
+
+The check fails (exit code 1) if a statement uses a label or all-nodes scan,
+or if its db hits grew by more than --max-ratio compared to the baseline.
+The baseline (cypher_profile_baseline.json next to this file) is written with
+--update-baseline against the docker-compose Neo4j; without it only the scan
+check runs.
+"""
+
+import argparse
+import copy
+import json
+import logging
+import sys
+from pathlib import Path
+
+from itemadapter import ItemAdapter
+from neo4j import GraphDatabase
+from scrapy.utils.project import get_project_settings
+
+from bundestags_scraper.items import SectionRecord
+from bundestags_scraper.pipelines import Neo4jPipeline, ensure_constraints
+
+_LOG = logging.getLogger(__name__)
+
+BASELINE_FILE = Path(__file__).with_name("cypher_profile_baseline.json")
+
+FORBIDDEN_OPERATORS = {"NodeByLabelScan", "AllNodesScan"}
+
+_BASE = "https://profile.invalid"
+
+# --------------------------------------------------------------------------- #
+#  Synthetic items                                                            #
+# --------------------------------------------------------------------------- #
+
+SAMPLE_ITEMS = [
+    ("_dom", {"domain": "profile.invalid", "description": "profiling"}),
+    ("_page", {
+        "url": f"{_BASE}/list", "title": "List", "full_html": "<html></html>",
+        "source_domain": "profile.invalid",
+    }),
+    ("_period", {
+        "period_number": -1, "name": "Profiling period",
+        "start_date": "2000-01-01", "end_date": "2004-01-01",
+        "source_page": f"{_BASE}/list", "detail_page": f"{_BASE}/period",
+    }),
+    ("_politician", {
+        "legislative_period_number": -1, "full_name": "Erika Muster",
+        "firstname": "Erika", "lastname": "Muster",
+        "birth_year": 1960, "death_year": None,
+        "political_party": "Profilpartei", "federate_state": "Profilland",
+        "constituency": "Profilkreis", "remarks": None,
+        "source_page": f"{_BASE}/list", "detail_page": f"{_BASE}/erika",
+    }),
+    ("_content", {
+        "source_page": f"{_BASE}/erika", "section_header": "Leben",
+        "section_content": "Erika Muster studierte Profilwissenschaften.",
+    }),
+    # lean-item mode: dataclass record, wrapped in an ItemAdapter like in process_item
+    ("_content", SectionRecord(
+        source_page=f"{_BASE}/erika", section_header="Ausbildung",
+        section_content="Erika Muster wurde in Profilkunde promoviert.",
+    )),
+]
+
+# --------------------------------------------------------------------------- #
+#  Profiling                                                                  #
+# --------------------------------------------------------------------------- #
+
+
+def _walk(plan):
+    """Yield every operator of a profiled plan (depth first)."""
+    yield plan
+    for child in plan.get("children", []):
+        yield from _walk(child)
+
+
+def summarize_profile(plan) -> dict:
+    operators = sorted({op["operatorType"].split("@")[0] for op in _walk(plan)})
+    return {
+        "db_hits": sum(op.get("dbHits", 0) for op in _walk(plan)),
+        "rows": plan.get("rows", 0),
+        "operators": operators,
+    }
+
+
+class _ProfilingTx:
+    """
+    Stands in for a neo4j Transaction: runs every statement under PROFILE
+    and records the plan summary under "<phase>:<helper>:<n>".
+    """
+
+    def __init__(self, tx, records: dict):
+        self._tx = tx
+        self._records = records
+        self.label = ""
+        self._n = 0
+
+    def start(self, label: str):
+        self.label, self._n = label, 0
+
+    def run(self, query, parameters=None, **kwargs):
+        result = self._tx.run("PROFILE " + query, parameters, **kwargs)
+        fetched = _Fetched(list(result))
+        summary = result.consume()
+        entry = summarize_profile(summary.profile)
+        entry["query"] = " ".join(query.split())[:120]
+        self._records[f"{self.label}:{self._n}"] = entry
+        self._n += 1
+        return fetched
+
+
+class _Fetched:
+    """Records of an already consumed result, for helpers that read them."""
+
+    def __init__(self, records):
+        self._records = records
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def single(self):
+        return self._records[0] if self._records else None
+
+
+def profile_pipeline(driver) -> dict:
+    """Profile all pipeline statements; returns {statement key: summary}."""
+    ensure_constraints(driver)
+    records: dict = {}
+    with driver.session() as ses:
+        tx = ses.begin_transaction()
+        try:
+            proxy = _ProfilingTx(tx, records)
+            for phase in ("create", "match"):
+                for helper, item in SAMPLE_ITEMS:
+                    data = ItemAdapter(copy.copy(item))
+                    item_type = data.get("item_type")
+                    proxy.start(f"{phase}:{helper}" + (f"[{item_type}]" if item_type else ""))
+                    getattr(Neo4jPipeline, helper)(proxy, data)
+        finally:
+            tx.rollback()
+    return records
+
+
+# --------------------------------------------------------------------------- #
+#  Baseline comparison                                                        #
+# --------------------------------------------------------------------------- #
+
+
+def compare(current: dict, baseline: dict, max_ratio: float = 2.0, min_slack: int = 10) -> list:
+    """Return a list of human-readable regressions (empty list == pass)."""
+    problems = []
+    for key, entry in current.items():
+        scans = FORBIDDEN_OPERATORS.intersection(entry["operators"])
+        if scans:
+            problems.append(f"{key}: uses {', '.join(sorted(scans))} ({entry['query']})")
+
+        base = baseline.get(key)
+        if base is None:
+            continue
+        allowed = max(base["db_hits"] * max_ratio, base["db_hits"] + min_slack)
+        if entry["db_hits"] > allowed:
+            problems.append(
+                f"{key}: db hits {base['db_hits']} -> {entry['db_hits']} ({entry['query']})"
+            )
+
+    for key in baseline.keys() - current.keys():
+        _LOG.warning("statement %s is in the baseline but was not executed", key)
+    return problems
+
+
+def _print_table(records: dict):
+    for key, entry in records.items():
+        print(f"{key:<40} {entry['db_hits']:>7} hits {entry['rows']:>4} rows  "
+              f"{' '.join(entry['operators'])}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store the current profile as the new baseline")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--max-ratio", type=float, default=2.0,
+                        help="allowed db-hit growth factor per statement")
+    args = parser.parse_args(argv)
+
+    settings = get_project_settings()
+    driver = GraphDatabase.driver(
+        settings["NEO4J_URI"], auth=(settings["NEO4J_USER"], settings["NEO4J_PASSWORD"])
+    )
+    try:
+        records = profile_pipeline(driver)
+    finally:
+        driver.close()
+
+    _print_table(records)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as fh:
+            json.dump(records, fh, ensure_ascii=False, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+    else:
+        print(f"No baseline at {args.baseline}; only checking for scans.")
+
+    problems = compare(records, baseline, max_ratio=args.max_ratio)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
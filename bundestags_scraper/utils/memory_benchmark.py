@@ -0,0 +1,88 @@
+"""
+Peak-RSS benchmark for the content crawl with and without LEAN_ITEMS.
+
+Each mode runs in its own child process (one crawl per process, since the
+Twisted reactor cannot be restarted). The child reports its own peak RSS
+from ``resource.getrusage(RUSAGE_SELF).ru_maxrss``.
+
+    python -m bundestags_scraper.utils.memory_benchmark --batch 0
+    python -m bundestags_scraper.utils.memory_benchmark --items 5000 --write-behind
+
+Use --write-behind to measure the crawler alone, without Neo4j write time.
+"""
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+_SPIDER = "politician_content_spider"
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_child(lean: bool, batch: int, items: int, write_behind: bool):
+    from scrapy.crawler import CrawlerProcess
+    from scrapy.utils.project import get_project_settings
+
+    settings = get_project_settings()
+    settings.set("LEAN_ITEMS", lean)
+    settings.set("NEO4J_WRITE_BEHIND", write_behind)
+    settings.set("LOG_LEVEL", "WARNING")
+    if items:
+        settings.set("CLOSESPIDER_ITEMCOUNT", items)
+
+    process = CrawlerProcess(settings)
+    crawler = process.create_crawler(_SPIDER)
+    start = time.perf_counter()
+    process.crawl(crawler, batch=batch)
+    process.start()
+
+    stats = crawler.stats.get_stats()
+    print(json.dumps({
+        "lean_items": lean,
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "seconds": round(time.perf_counter() - start, 1),
+        "items": stats.get("item_scraped_count", 0),
+        "responses": stats.get("response_received_count", 0),
+    }))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Peak RSS of the content crawl, lean vs. full items.")
+    parser.add_argument("--batch", type=int, default=0, help="spider batch (2000 politicians each)")
+    parser.add_argument("--items", type=int, default=0, help="stop after N items (0 = full batch)")
+    parser.add_argument("--write-behind", action="store_true")
+    parser.add_argument("--child", choices=["full", "lean"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child == "lean", args.batch, args.items, args.write_behind)
+        return
+
+    results = []
+    for mode in ("full", "lean"):
+        cmd = [sys.executable, "-m", __spec__.name, "--child", mode,
+               "--batch", str(args.batch), "--items", str(args.items)]
+        if args.write_behind:
+            cmd.append("--write-behind")
+        out = subprocess.run(cmd, check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+
+    print(f"{'mode':<6} {'peak RSS':>10} {'items':>8} {'seconds':>8}")
+    for r in results:
+        mode = "lean" if r["lean_items"] else "full"
+        print(f"{mode:<6} {r['peak_rss_mb']:>8.1f}MB {r['items']:>8} {r['seconds']:>8.1f}")
+    full, lean = results
+    if full["peak_rss_mb"]:
+        print(f"peak RSS reduced by {100 * (1 - lean['peak_rss_mb'] / full['peak_rss_mb']):.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Throughput of extraction.parse_content_page, inline vs. parse pool.
+
+Reads a corpus of politician pages from the HtmlStore (HTML_STORE_DIR,
+filled by a crawl with LEAN_ITEMS=True) and parses it once inline and once
+per pool size, reporting pages/s and the speed-up over inline parsing.
+
+    python -m bundestags_scraper.utils.parse_benchmark
+    python -m bundestags_scraper.utils.parse_benchmark --workers 1 2 4 8 --limit 2000
+"""
+
+import argparse
+import gzip
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from bundestags_scraper.extraction import parse_content_page
+
+_URL = "https://de.wikipedia.org/wiki/Benchmark"
+
+
+def load_corpus(root, limit=0) -> list[bytes]:
+    paths = sorted(Path(root).glob("*/*.html.gz"))
+    if limit:
+        paths = paths[:limit]
+    corpus = []
+    for path in paths:
+        with gzip.open(path, "rb") as fh:
+            corpus.append(fh.read())
+    return corpus
+
+
+def _parse(body: bytes) -> int:
+    sections = parse_content_page(body, _URL, "utf-8")["sections"]
+    return len(sections or ())
+
+
+def run_inline(corpus) -> float:
+    start = time.perf_counter()
+    for body in corpus:
+        _parse(body)
+    return time.perf_counter() - start
+
+
+def run_pool(corpus, workers: int) -> float:
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+        list(pool.map(_parse, corpus[:workers]))            # warm up the workers
+        start = time.perf_counter()
+        list(pool.map(_parse, corpus, chunksize=1))         # one page per task, like the spiders
+        return time.perf_counter() - start
+
+
+def main(argv=None):
+    from scrapy.utils.project import get_project_settings
+
+    parser = argparse.ArgumentParser(description="Parse throughput, inline vs. process pool.")
+    parser.add_argument("--corpus", default=None, help="HtmlStore directory (default: HTML_STORE_DIR)")
+    parser.add_argument("--limit", type=int, default=0, help="parse at most N pages")
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    args = parser.parse_args(argv)
+
+    root = args.corpus or get_project_settings().get("HTML_STORE_DIR")
+    corpus = load_corpus(root, args.limit)
+    if not corpus:
+        raise SystemExit(f"No pages in {root} – run a crawl with LEAN_ITEMS=True first.")
+
+    inline = run_inline(corpus)
+    print(f"{len(corpus)} pages, {os.cpu_count()} CPUs")
+    print(f"{'mode':<10} {'pages/s':>9} {'speed-up':>9}")
+    print(f"{'inline':<10} {len(corpus) / inline:>9.1f} {1.0:>9.2f}")
+    for workers in args.workers:
+        elapsed = run_pool(corpus, workers)
+        print(f"{f'pool x{workers}':<10} {len(corpus) / elapsed:>9.1f} {inline / elapsed:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
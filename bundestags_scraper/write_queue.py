@@ -0,0 +1,144 @@
+"""
+Durable local queue between the Scrapy pipeline and Neo4j (write-behind).
+
+Items are serialised with msgpack and appended to a SQLite database in WAL
+mode. Each committed append survives a crash of the crawler process.
+Ingestion workers (see ``ingest_worker.py``) read the log in offset order
+and store an acknowledged offset per partition once a batch is in Neo4j.
+
+Items are partitioned by the politician they belong to (``detail_page`` for
+politicians, ``source_page`` for content, ``url`` for pages). A politician
+and its content sections therefore always land in the same partition, in
+arrival order, when several workers drain the queue in parallel.
+"""
+
+import logging
+import sqlite3
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import msgpack
+
+_LOG = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    offset    INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_type TEXT    NOT NULL,
+    shard     INTEGER NOT NULL,
+    payload   BLOB    NOT NULL
+);
+CREATE TABLE IF NOT EXISTS acks (
+    partition TEXT    PRIMARY KEY,
+    offset    INTEGER NOT NULL
+);
+"""
+
+_KEY_FIELDS = ("detail_page", "source_page", "url", "domain", "period_number")
+
+
+def partition_key(data: dict) -> str:
+    """The field that decides which worker handles an item."""
+    for field in _KEY_FIELDS:
+        if data.get(field):
+            return str(data[field])
+    return ""
+
+
+def shard_of(data: dict) -> int:
+    return zlib.crc32(partition_key(data).encode("utf-8")) & 0xFFFF
+
+
+def partition_name(worker_id: int, workers: int) -> str:
+    return f"{worker_id}/{workers}"
+
+
+class WriteQueue:
+    """
+    Append-only item log with per-partition acknowledged offsets.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # NORMAL in WAL mode: durable against process crashes, cheap commits
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    # –– producer -------------------------------------------------------
+    def append(self, item_type: str, data: dict) -> int:
+        cur = self._db.execute(
+            "INSERT INTO items (item_type, shard, payload) VALUES (?, ?, ?)",
+            (item_type, shard_of(data), msgpack.packb(data, use_bin_type=True)),
+        )
+        return cur.lastrowid
+
+    def append_many(self, rows: List[Tuple[str, dict]]):
+        self._db.execute("BEGIN")
+        try:
+            self._db.executemany(
+                "INSERT INTO items (item_type, shard, payload) VALUES (?, ?, ?)",
+                [(t, shard_of(d), msgpack.packb(d, use_bin_type=True)) for t, d in rows],
+            )
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    # –– consumer -------------------------------------------------------
+    def acked(self, worker_id: int = 0, workers: int = 1) -> int:
+        row = self._db.execute(
+            "SELECT offset FROM acks WHERE partition = ?",
+            (partition_name(worker_id, workers),),
+        ).fetchone()
+        return row[0] if row else 0
+
+    def read(self, after: int, limit: int, worker_id: int = 0, workers: int = 1
+             ) -> List[Tuple[int, str, dict]]:
+        """Next ``limit`` items of this partition with offset > ``after``."""
+        rows = self._db.execute(
+            "SELECT offset, item_type, payload FROM items "
+            "WHERE offset > ? AND shard % ? = ? ORDER BY offset LIMIT ?",
+            (after, workers, worker_id, limit),
+        ).fetchall()
+        return [(off, typ, msgpack.unpackb(payload, raw=False)) for off, typ, payload in rows]
+
+    def ack(self, offset: int, worker_id: int = 0, workers: int = 1):
+        self._db.execute(
+            "INSERT INTO acks (partition, offset) VALUES (?, ?) "
+            "ON CONFLICT(partition) DO UPDATE SET offset = MAX(offset, excluded.offset)",
+            (partition_name(worker_id, workers), offset),
+        )
+
+    def max_offset(self) -> int:
+        return self._db.execute("SELECT COALESCE(MAX(offset), 0) FROM items").fetchone()[0]
+
+    def pending(self, worker_id: int = 0, workers: int = 1) -> int:
+        return self._db.execute(
+            "SELECT COUNT(*) FROM items WHERE offset > ? AND shard % ? = ?",
+            (self.acked(worker_id, workers), workers, worker_id),
+        ).fetchone()[0]
+
+    def iter_unacked(self, worker_id: int = 0, workers: int = 1, batch_size: int = 1000
+                     ) -> Iterator[List[Tuple[int, str, dict]]]:
+        after = self.acked(worker_id, workers)
+        while batch := self.read(after, batch_size, worker_id, workers):
+            yield batch
+            after = batch[-1][0]
+
+    def purge_acknowledged(self, workers: int = 1) -> int:
+        """
+        Delete items every partition of a ``workers``-way split has acknowledged.
+        """
+        acks = [self.acked(w, workers) for w in range(workers)]
+        if not all(acks):
+            return 0
+        cur = self._db.execute("DELETE FROM items WHERE offset <= ?", (min(acks),))
+        _LOG.info("[WriteQueue] purged %d acknowledged items", cur.rowcount)
+        return cur.rowcount
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+DEFAULT_CACHE_PATH = os.path.join("final_data", "completion_cache.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS completions (
+    key         TEXT PRIMARY KEY,
+    model       TEXT NOT NULL,
+    value       TEXT NOT NULL,
+    created     REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits        INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS completions_last_access ON completions(last_access);
+"""
+
+
+class CacheMiss(LookupError):
+    """Im cache_only-Modus gibt es für diese Anfrage keine gespeicherte Antwort"""
+
+
+def _sha256(text):
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def make_key(model, temperature, system_prompt, user_payload):
+    """Schlüssel aus Modell, Temperatur, sha256(System-Prompt) und sha256(User-Payload)"""
+    parts = [model, f"{float(temperature):.3f}", _sha256(system_prompt), _sha256(user_payload)]
+    return _sha256("\x1f".join(parts))
+
+
+class CompletionCache:
+    """
+    Persistenter Cache für Chat-Completions (SQLite).
+
+    - Gleiche Anfrage (Modell, Temperatur, System-Prompt, Payload) ⇒ gespeicherte Antwort,
+      kein API-Aufruf und keine Kosten.
+    - max_entries begrenzt die Größe; verdrängt wird der am längsten nicht gelesene Eintrag (LRU).
+    - cache_only=True: Fehlschläge werfen CacheMiss statt die API zu rufen
+      (deterministische Offline-Läufe und Benchmarks).
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=200_000, cache_only=False):
+        self.path = path
+        self.max_entries = max_entries
+        self.cache_only = cache_only
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._size = self.conn.execute("SELECT count(*) FROM completions").fetchone()[0]
+
+    def __len__(self):
+        return self._size
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Lesen / Schreiben
+    # ------------------------------------------------------------------
+
+    def get(self, key):
+        """Gespeicherte Antwort (dict) oder None; zählt Treffer und Fehlschläge"""
+        row = self.conn.execute("SELECT value FROM completions WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self.conn:
+            self.conn.execute(
+                "UPDATE completions SET last_access = ?, hits = hits + 1 WHERE key = ?",
+                (time.time(), key),
+            )
+        return json.loads(row[0])
+
+    def put(self, key, model, value):
+        now = time.time()
+        with self.conn:
+            exists = self.conn.execute("SELECT 1 FROM completions WHERE key = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO completions (key, model, value, created, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, model, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            if exists is None:
+                self._size += 1
+            self.writes += 1
+            if self.max_entries and self._size > self.max_entries:
+                self._evict(self._size - self.max_entries)
+
+    def _evict(self, n):
+        self.conn.execute(
+            "DELETE FROM completions WHERE key IN "
+            "(SELECT key FROM completions ORDER BY last_access LIMIT ?)",
+            (n,),
+        )
+        self._size -= n
+        self.evictions += n
+
+    def lookup(self, model, temperature, system_prompt, user_payload):
+        """
+        (key, value): value ist die gespeicherte Antwort oder None.
+
+        Im cache_only-Modus wird bei einem Fehlschlag CacheMiss geworfen.
+        """
+        key = make_key(model, temperature, system_prompt, user_payload)
+        value = self.get(key)
+        if value is None and self.cache_only:
+            raise CacheMiss(f"Keine gespeicherte Antwort für {model} (Schlüssel {key[:12]}…)")
+        return key, value
+
+    # ------------------------------------------------------------------
+    # Statistik
+    # ------------------------------------------------------------------
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
+
+    def print_stats(self):
+        s = self.stats()
+        print(f"🗄️ Completion-Cache: {s['hits']} Treffer, {s['misses']} Fehlschläge "
+              f"({s['hit_ratio']:.1%}), {s['entries']} Einträge, {s['evictions']} verdrängt")
+
+
+# ---------------------------------------------------------------------------
+# pydantic_ai-Agenten (Notebooks in analyse_politician)
+# ---------------------------------------------------------------------------
+
+async def cached_agent_run(agent, prompt, cache, system_prompt, model_name=None, temperature=None):
+    """
+    agent.run(prompt) mit Completion-Cache; liefert das Ausgabeobjekt (result.output).
+
+    system_prompt: derselbe Text, der dem Agenten als instructions/system_prompt übergeben
+    wurde; er geht in den Schlüssel ein, damit ein geänderter Prompt nicht alte Antworten trifft.
+    Die strukturierte Ausgabe wird als JSON gespeichert und beim Treffer über
+    agent.output_type.model_validate wiederhergestellt.
+    """
+    model_name = model_name or str(getattr(agent.model, "model_name", agent.model))
+    if temperature is None:
+        temperature = (getattr(agent, "model_settings", None) or {}).get("temperature", 0.0)
+    system_prompt = f"{system_prompt}\n{getattr(agent.output_type, '__name__', '')}"
+
+    key, value = cache.lookup(model_name, temperature, system_prompt, prompt)
+    if value is not None:
+        return agent.output_type.model_validate(value["output"])
+
+    result = await agent.run(prompt)
+    cache.put(key, model_name, {"output": result.output.model_dump(mode="json")})
+    return result.output
@@ -0,0 +1,144 @@
+import json
+import re
+
+# Explizite Abschlussnennungen nach den Zuordnungsregeln im SYSTEM_PROMPT (text_to_dqr.py).
+# (DQR-Niveau, Kommentar, Muster) – das höchste belastbare Niveau gewinnt.
+RULES = [
+    # Titel nur mit Bezug auf die Person selbst („Promotion zum Dr.“, „promovierte 1975“);
+    # „Dr. med. Lilli Jahn“ oder „ein promovierter Vater“ zählen nicht.
+    (8, "Promotion (Dr.)", r"\bzum\s+Dr\.\s?-?\s?(?:rer\.\s?\w+\.|phil\.|jur\.|iur\.|med\.(?:\s?dent\.|\s?vet\.)?|"
+                           r"oec\.|theol\.|agr\.|sc\.\s?\w+\.|paed\.|Ing\.)"),
+    (8, "Promotion", r"\bpromovierte\b|\bwurde\b[^.]{0,80}\bpromoviert\b"),
+    (7, "Volljurist (2. Staatsexamen)", r"\b(?:zweite[snr]?|2\.)\s+(?:juristische[snr]?\s+)?Staats(?:examen|prüfung)"),
+    (7, "Volljurist", r"\b(?:Volljurist(?:in)?|Assessorexamen|Große[nr]? [Jj]uristische[nr]? Staatsprüfung)\b|"
+                      r"\b(?:als|zum|zur)\s+(?:selbst(?:st)?ändige[rn]?\s+)?(?:Rechtsanwalt|Rechtsanwältin|Notar(?:in)?|"
+                      r"Richter(?:in)?|Staatsanwalt|Staatsanwältin)\b"),
+    (7, "Lehramt mit 2. Staatsprüfung", r"\bAssessor des Lehramt|\b(?:als|zum|zur)\s+(?:Ober)?Studien(?:rat|rätin|direktor)"),
+    (7, "Diplom (Univ.)", r"\bDiplom-?\s?\w*\s?\((?:Univ\.|Universität|TU|TH)\)"),
+    (7, "Magister/Master", r"\b(?:Magister(?:\s?Artium)?|Master of \w+|Masterabschluss)\b"),
+    (6, "Diplom (FH)", r"\bDiplom-?\s?\w*\s?\(FH\)"),
+    (6, "Bachelor", r"\bBachelor"),
+    (6, "Meister", r"\b\w*[Mm]eister(?:prüfung|brief|titel)\b|\bMeister im \w+handwerk"),
+    (6, "Erstes Staatsexamen", r"\b(?:erste[snr]?|1\.)\s+(?:juristische[snr]?\s+)?Staats(?:examen|prüfung)"),
+    (4, "Allgemeine Hochschulreife (Abitur)", r"\b(?:Abitur|Reifeprüfung|[Aa]llgemeine[n]? Hochschulreife)"),
+    (4, "Fachhochschulreife", r"\b(?:Fachhochschulreife|[Ff]achgebundene[n]? Hochschulreife)"),
+    (4, "Abgeschlossene Berufsausbildung", r"\b(?:Gesellenprüfung|Gesellenbrief|Facharbeiterbrief|Kaufmannsgehilfenprüfung)"),
+    (3, "Mittlerer Schulabschluss", r"\b(?:[Mm]ittlere[n]? Reife|Realschulabschluss|[Mm]ittlere[n]? Schulabschluss)"),
+    (2, "Hauptschulabschluss", r"\b(?:Hauptschulabschluss|Volksschulabschluss)"),
+]
+
+# Hinweise auf Abschlüsse, deren Niveau die Regeln nicht sicher bestimmen können.
+# (mögliches Niveau, Muster): liegt ein solcher Hinweis über dem besten Regeltreffer,
+# entscheidet das LLM.
+OPEN_SIGNALS = [
+    (8, r"\b(?:Promotion|Doktorarbeit|Dissertation|Doktorand|Dr\.)"),
+    (7, r"\b(?:[Ss]tudi(?:um|erte|ert|en|engang)|Universität|Hochschule|Akademie)"),
+    (7, r"\b(?:Diplom|Staatsexamen|Staatsprüfung|Referendar|Lehramt|Lehrer(?:in)?\b|Ingenieur|"
+        r"höhere[nr]? Dienst|Laufbahn)"),
+    (6, r"\b(?:Fachschule|Techniker|Fachwirt|Betriebswirt|gehobene[nr]? Dienst)"),
+    (4, r"\b(?:Ausbildung|Lehre\b|Lehrling|Lehrzeit|[Kk]aufmann|[Kk]auffrau|Schlosser|Geselle|"
+        r"mittlere[nr]? Dienst|Gymnasium|Oberschule)"),
+]
+
+# Treffer in diesem Umfeld zählen nicht (Ehrentitel, Abbrüche, andere Personen)
+_HONORARY = re.compile(r"Ehren|h\.\s?c\.|E\.\s?h\.|honoris", re.IGNORECASE)
+_ABORTED = re.compile(r"abgebrochen|abbrach|\bbrach\b[^.]{0,60}\bab\b|ohne Abschluss|nicht abgeschlossen", re.IGNORECASE)
+
+_COMPILED_RULES = [(level, comment, re.compile(pattern)) for level, comment, pattern in RULES]
+_COMPILED_OPEN = [(level, re.compile(pattern)) for level, pattern in OPEN_SIGNALS]
+
+RULE_CONFIDENCE = 3
+
+
+def _context(text, start, end, before=40, after=25):
+    return text[max(0, start - before):end + after]
+
+
+def apply_rules(text):
+    """
+    Wendet die Regeln auf den Retrieval-Text an.
+
+    Returns:
+        (dqr, comment, confidence) wie text_to_dqr, oder None, wenn der Fall
+        mehrdeutig ist (Abbruch erwähnt, kein Treffer, oder ein offener Hinweis
+        könnte auf ein höheres Niveau deuten).
+    """
+    if not text or _ABORTED.search(text):
+        return None
+
+    best = None
+    for level, comment, pattern in _COMPILED_RULES:
+        if best is not None and level <= best[0]:
+            break
+        for match in pattern.finditer(text):
+            if level == 8 and _HONORARY.search(_context(text, match.start(), match.end())):
+                continue
+            best = (level, comment)
+            break
+    if best is None:
+        return None
+
+    level, comment = best
+    for open_level, pattern in _COMPILED_OPEN:
+        if open_level > level and pattern.search(text):
+            return None
+    return level, comment, RULE_CONFIDENCE
+
+
+def classify(text, llm_fn):
+    """
+    Regeln zuerst, LLM nur für mehrdeutige Fälle.
+
+    llm_fn(text) muss das Tupel von text_to_dqr liefern
+    (dqr, comment, confidence, prompt_tokens, completion_tokens, cached_tokens).
+
+    Returns:
+        (Tupel wie text_to_dqr, used_llm)
+    """
+    result = apply_rules(text)
+    if result is not None:
+        return (*result, 0, 0, 0), False
+    return llm_fn(text), True
+
+
+def evaluate(test_data_path="testdata/filtered_minister_with_content.json",
+             log_path="test_log_files/gpt-4.1_v6_openai_embedding.json"):
+    """
+    Übereinstimmung der Regeln mit dem Goldstandard auf dem Retrieval-Text des v6-Laufs.
+
+    Berichtet den Anteil der Fälle, die ohne LLM entschieden werden, deren
+    Genauigkeit und zum Vergleich die Genauigkeit des LLM auf denselben Fällen.
+    """
+    with open(test_data_path, encoding="utf-8") as f:
+        gold = {p['ID']: int(p['DQR Niveau']) for p in json.load(f)}
+    with open(log_path, encoding="utf-8") as f:
+        log = json.load(f)
+
+    decided = correct = llm_correct = 0
+    mismatches = []
+    for entry in log:
+        expected = gold.get(entry['ID'])
+        if expected is None:
+            continue
+        result = apply_rules(entry.get('retrieved_content') or "")
+        if result is None:
+            continue
+        decided += 1
+        correct += result[0] == expected
+        llm_correct += entry['dqr_predict'] == expected
+        if result[0] != expected:
+            mismatches.append((entry['vorname'], entry['nachname'], expected, result[0], result[1]))
+
+    total = len(log)
+    print(f"📊 Regel-Engine auf {total} Politikern (Retrieval-Text aus {log_path})")
+    print(f"   Ohne LLM entschieden: {decided} ({decided / total:.1%} der LLM-Aufrufe gespart)")
+    if decided:
+        print(f"   Übereinstimmung mit Goldstandard: {correct / decided:.1%} ({correct}/{decided})")
+        print(f"   LLM (v6) auf denselben Fällen:    {llm_correct / decided:.1%} ({llm_correct}/{decided})")
+    for vorname, nachname, expected, predicted, comment in mismatches:
+        print(f"   ❌ {vorname} {nachname}: erwartet {expected}, Regel {predicted} ({comment})")
+    return {"total": total, "decided": decided, "correct": correct, "llm_correct": llm_correct}
+
+
+if __name__ == '__main__':
+    evaluate()
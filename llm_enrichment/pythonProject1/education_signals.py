@@ -0,0 +1,148 @@
+import json
+from collections import deque
+
+# Begriffe, die auf Bildungsinformationen hinweisen (klein geschrieben, Präfix-Match am Wortanfang).
+# Die Liste ist bewusst großzügig: ein Fehltreffer kostet nur den normalen LLM-Aufruf,
+# ein fehlender Begriff dagegen ein falsches „0; Keine Angabe“.
+SIGNAL_TERMS = [
+    # Schule
+    "abitur", "reifeprüfung", "hochschulreife", "fachhochschulreife", "mittlere reife",
+    "schulabschluss", "schule", "schulbesuch", "schulzeit", "gymnasium", "realschul",
+    "hauptschul", "volksschul", "grundschul", "oberschul", "mittelschul", "gesamtschul",
+    "berufsschul", "fachschul", "handelsschul", "internat", "lyzeum",
+    # Studium und Grade
+    "studi", "student", "universität", "hochschul", "fachhochschul", "technische hochschule",
+    "akademie", "diplom", "magister", "bachelor", "master", "staatsexamen", "staatsprüfung",
+    "examen", "referendar", "assessor", "promo", "dr.", "doktor", "dissertation",
+    "habilit", "professor", "lehramt", "approbation",
+    # Berufsbildung
+    "ausbildung", "lehre", "lehrling", "lehrzeit", "geselle", "gesellenprüfung", "meister",
+    "techniker", "fachwirt", "betriebswirt", "kaufmann", "kauffrau", "ingenieur",
+    "volontariat", "umschulung", "abschluss", "abgebrochen", "abbruch",
+    # Berufe/Laufbahnen mit zwingender Qualifikation
+    "jurist", "rechtsanwalt", "richter", "staatsanwalt", "arzt", "ärztin", "apotheker",
+    "lehrer", "gehobenen dienst", "höheren dienst", "mittleren dienst", "laufbahn",
+]
+
+# Ergebnis ohne Bildungssignal, wie es SYSTEM_PROMPT für diesen Fall vorgibt
+NO_SIGNAL_RESULT = (0, "Keine Angabe zum Bildungsabschluss (kein Bildungssignal im Text)", None)
+
+
+class AhoCorasick:
+    """
+    Aho-Corasick-Automat für viele Suchbegriffe in einem Durchlauf über den Text.
+
+    Treffer zählen nur, wenn sie am Wortanfang beginnen; nach rechts ist der Begriff
+    ein Präfix („studi“ trifft „studierte“, „Studium“, „Studienrat“).
+    """
+
+    def __init__(self, terms):
+        self.goto = [{}]
+        self.fail = [0]
+        self.out = [[]]
+        for term in terms:
+            self._add(term.lower())
+        self._build()
+
+    def _add(self, term):
+        state = 0
+        for ch in term:
+            nxt = self.goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self.goto)
+                self.goto[state][ch] = nxt
+                self.goto.append({})
+                self.fail.append(0)
+                self.out.append([])
+            state = nxt
+        self.out[state].append(term)
+
+    def _build(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self.goto[state].items():
+                queue.append(nxt)
+                f = self.fail[state]
+                while f and ch not in self.goto[f]:
+                    f = self.fail[f]
+                self.fail[nxt] = self.goto[f].get(ch, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def iter_matches(self, text):
+        """(start, end, term) für alle Treffer am Wortanfang"""
+        text = text.lower()
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in self.goto[state]:
+                state = self.fail[state]
+            state = self.goto[state].get(ch, 0)
+            for term in self.out[state]:
+                start = i - len(term) + 1
+                if start == 0 or not text[start - 1].isalnum():
+                    yield start, i + 1, term
+
+    def has_match(self, text):
+        return next(self.iter_matches(text), None) is not None
+
+
+_AUTOMATON = None
+
+
+def _automaton():
+    global _AUTOMATON
+    if _AUTOMATON is None:
+        _AUTOMATON = AhoCorasick(SIGNAL_TERMS)
+    return _AUTOMATON
+
+
+def scan_person(person, automaton=None):
+    """
+    Durchsucht alle Abschnitte eines Politikers nach Bildungssignalen.
+
+    Returns:
+        dict: content_id -> [(start, end, term), ...]; leer, wenn kein Signal vorkommt.
+              Die Spans eignen sich als Retrieval-Hinweise (welche Abschnitte, wo).
+    """
+    automaton = automaton or _automaton()
+    hits = {}
+    for content in person.get('neo4j_content', []):
+        spans = list(automaton.iter_matches(content.get('section_content') or ""))
+        if spans:
+            hits[content['content_id']] = spans
+    return hits
+
+
+def signal_terms(hits):
+    """Sortierte Menge der gefundenen Begriffe (für das Ergebnis-Log)"""
+    return sorted({term for spans in hits.values() for _, _, term in spans})
+
+
+def evaluate(test_data_path="testdata/filtered_minister_with_content.json"):
+    """
+    Wie viele Personen der Testdaten würden ohne API-Aufruf mit 0 beantwortet,
+    und wie viele davon haben laut Goldstandard tatsächlich einen Abschluss?
+    """
+    import ast
+
+    with open(test_data_path, encoding="utf-8") as f:
+        people = json.load(f)
+
+    skipped = false_zero = 0
+    for person in people:
+        content = person.get('neo4j_content', [])
+        if isinstance(content, str):
+            content = ast.literal_eval(content)
+        if not scan_person({'neo4j_content': content}):
+            skipped += 1
+            if str(person.get('DQR Niveau', '0')).strip() not in ("", "0"):
+                false_zero += 1
+
+    print(f"📊 Bildungssignal-Scan über {len(people)} Personen")
+    print(f"   Ohne Signal (API-Aufrufe gespart): {skipped}")
+    print(f"   Davon mit Abschluss im Goldstandard: {false_zero}")
+    return {"people": len(people), "skipped": skipped, "false_zero": false_zero}
+
+
+if __name__ == '__main__':
+    evaluate()
@@ -1,22 +1,41 @@
 import json
+from pathlib import Path
 
-def filter_education_content(input_file='minister_with_neo4j_content.json', output_file='minister_education_filtered.json'):
+# geschrieben von `python -m bundestags_scraper.census` (zählt auch die vom Crawler verworfenen Abschnitte)
+CENSUS_FILE = Path(__file__).resolve().parents[2] / "data" / "section_header_counts.json"
+
+
+def load_header_counts(path=CENSUS_FILE):
+    """Header-Zählung {section_header: Anzahl Seiten}; leer, wenn noch kein Census geschrieben wurde"""
+    path = Path(path)
+    if not path.exists():
+        print(f"⚠️ Kein Header-Census unter {path} (python -m bundestags_scraper.census)")
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def filter_education_content(input_file='minister_with_neo4j_content.json', output_file='minister_education_filtered.json',
+                             census_file=CENSUS_FILE):
     """
     Filtert die JSON-Datei und entfernt die häufigsten Felder, die keine Bildungsinformationen enthalten
     """
+    header_counts = load_header_counts(census_file)
     # JSON laden
     with open(input_file, 'r', encoding='utf-8') as f:
         data = json.load(f)
     
-    # Felder die gefiltert werden sollen (häufigste, keine Bildungsinfos)
+    # Felder die gefiltert werden sollen (häufige, keine Bildungsinfos). Die Liste bleibt
+    # von Hand gepflegt: der Census sagt, wie oft ein Header vorkommt, nicht ob er
+    # Bildungsangaben enthält ("Leben" ist der häufigste). Die Zahlen kommen aus dem Census.
     fields_to_filter = {
-        '#',  # Root-Element - 165x
-        'Weblinks',  # 163x
-        'Einzelnachweise',  # 158x
-        'Literatur',  # 114x
-        'Abgeordneter',  # 46x
-        'Abgeordnete',  # 13x
-        'Siehe auch'  # 41x
+        '#',  # Root-Element
+        'Weblinks',
+        'Einzelnachweise',
+        'Literatur',
+        'Abgeordneter',
+        'Abgeordnete',
+        'Siehe auch'
     }
     
     # Gefilterte Daten erstellen
@@ -52,6 +71,9 @@ def filter_education_content(input_file='minister_with_neo4j_content.json', outp
     print(f"Gefilterte JSON gespeichert als: {output_file}")
     print(f"Anzahl Personen: {len(data)}")
     print(f"Gefilterte Felder: {', '.join(fields_to_filter)}")
+    if header_counts:
+        for header in sorted(fields_to_filter, key=lambda h: -header_counts.get(h, 0)):
+            print(f"  {header:<40} | {header_counts.get(header, 0):>6}x im Census")
     print(f"Section-Headers vor Filterung: {total_sections_before}")
     print(f"Section-Headers nach Filterung: {total_sections_after}")
     print(f"Entfernte Sections: {total_sections_before - total_sections_after}")
@@ -71,5 +93,12 @@ def filter_education_content(input_file='minister_with_neo4j_content.json', outp
         percentage = (count / len(data)) * 100
         print(f"  {header:<40} | {count:>3}x | {percentage:>5.1f}% der Personen")
 
+    # Kandidaten für fields_to_filter: häufigste Header im Census, die noch nicht gefiltert werden
+    if header_counts:
+        print("\n=== HÄUFIGSTE UNGEFILTERTE HEADER IM CENSUS (Top 20) ===")
+        candidates = [(h, n) for h, n in header_counts.items() if h not in fields_to_filter]
+        for header, count in candidates[:20]:
+            print(f"  {header:<40} | {count:>6}x")
+
 if __name__ == "__main__":
     filter_education_content() 
\ No newline at end of file
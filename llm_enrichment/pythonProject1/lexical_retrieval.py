@@ -0,0 +1,226 @@
+import ast
+import json
+import math
+import re
+
+# Wortstämme für Bildungsinformationen; ein Token trifft, wenn es mit dem Stamm beginnt
+EDUCATION_TERMS = [
+    "studi", "student", "universit", "hochschul", "fachhochschul", "akadem",
+    "abitur", "reifeprüfung", "hochschulreife", "mittlere reife",
+    "schul", "gymnasium", "realschul", "hauptschul", "volksschul", "oberschul",
+    "ausbildung", "lehre", "lehrling", "geselle", "meister",
+    "abschluss", "absolv", "examen", "staatsexamen", "diplom", "magister",
+    "bachelor", "master", "promo", "promoviert", "doktor", "dissertation",
+    "habilit", "referendar", "assessor", "approbation", "volontariat",
+]
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Neo4j-Volltextindex (Lucene, German Analyzer mit Stemming)
+FULLTEXT_INDEX = "content_text"
+
+FULLTEXT_INDEX_QUERY = f"""
+CREATE FULLTEXT INDEX {FULLTEXT_INDEX} IF NOT EXISTS
+FOR (c:Content) ON EACH [c.section_content, c.section_header]
+OPTIONS {{indexConfig: {{`fulltext.analyzer`: 'german'}}}}
+"""
+
+# Lucene-Scoring ist BM25; Treffer werden auf die Politiker des Batches eingeschränkt
+FULLTEXT_SEARCH_QUERY = f"""
+CALL db.index.fulltext.queryNodes('{FULLTEXT_INDEX}', $query) YIELD node, score
+MATCH (p:Politician)-[:HAS_CONTENT]->(node)
+WHERE elementId(p) IN $ids
+WITH elementId(p) AS id, node, score
+ORDER BY score DESC
+WITH id, collect({{content_id: node.id, score: score}})[..$top_n] AS hits
+RETURN id, hits
+"""
+
+
+def tokenize(text):
+    return _TOKEN.findall((text or "").lower())
+
+
+def _term_tokens(term):
+    return tuple(tokenize(term))
+
+
+class BM25Index:
+    """
+    Okapi-BM25 über eine Liste von Texten mit Präfix-Matching der Suchbegriffe.
+
+    Mehrwortbegriffe ("mittlere reife") zählen als Treffer, wenn die Tokens
+    direkt aufeinander folgen.
+    """
+
+    def __init__(self, texts, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.docs = [tokenize(t) for t in texts]
+        self.lengths = [len(d) for d in self.docs]
+        self.avg_len = (sum(self.lengths) / len(self.docs)) if self.docs else 0.0
+        self._tf_cache = {}
+
+    def _tf(self, doc_idx, term):
+        key = (doc_idx, term)
+        if key not in self._tf_cache:
+            tokens = self.docs[doc_idx]
+            *head, last = _term_tokens(term)
+            n = len(head)
+            self._tf_cache[key] = sum(
+                1 for i in range(n, len(tokens))
+                if tokens[i].startswith(last) and tokens[i - n:i] == head
+            )
+        return self._tf_cache[key]
+
+    def idf(self, term):
+        n_docs = len(self.docs)
+        df = sum(1 for i in range(n_docs) if self._tf(i, term))
+        return math.log((n_docs - df + 0.5) / (df + 0.5) + 1.0)
+
+    def scores(self, terms=EDUCATION_TERMS):
+        result = [0.0] * len(self.docs)
+        if not self.docs:
+            return result
+        for term in terms:
+            idf = self.idf(term)
+            for i, length in enumerate(self.lengths):
+                tf = self._tf(i, term)
+                if tf:
+                    norm = self.k1 * (1 - self.b + self.b * length / (self.avg_len or 1.0))
+                    result[i] += idf * tf * (self.k1 + 1) / (tf + norm)
+        return result
+
+
+def lexical_top_k(sections, top_k=10, terms=EDUCATION_TERMS):
+    """
+    Rangiert Abschnitte per BM25 gegen die Bildungsbegriffe.
+
+    Rückgabe im Format von find_top_k_sections (section, similarity, content_preview),
+    damit assemble_user_payload die Liste direkt verarbeiten kann.
+    """
+    scores = BM25Index([s['section_content'] for s in sections]).scores(terms)
+    ranked = sorted(range(len(sections)), key=lambda i: scores[i], reverse=True)[:top_k]
+    return [{
+        'section': sections[i],
+        'similarity': scores[i],
+        'content_preview': sections[i]['section_content'][:300] + "...",
+    } for i in ranked]
+
+
+def lexical_prefilter(sections, top_n=10, terms=EDUCATION_TERMS):
+    """
+    Reduziert die zu embeddenden Chunks auf die top_n lexikalischen Kandidaten.
+
+    Trifft kein Chunk einen Bildungsbegriff, bleiben alle Chunks erhalten
+    (Rückfall auf reine Embedding-Suche).
+    """
+    if len(sections) <= top_n:
+        return sections
+    scores = BM25Index([s['section_content'] for s in sections]).scores(terms)
+    if not any(scores):
+        return sections
+    keep = sorted(sorted(range(len(sections)), key=lambda i: scores[i], reverse=True)[:top_n])
+    return [sections[i] for i in keep]
+
+
+# ---------------------------------------------------------------------------
+# Neo4j-Volltextindex
+# ---------------------------------------------------------------------------
+
+def lucene_query(terms=EDUCATION_TERMS):
+    """Bildungsbegriffe als Lucene-Query: Präfix-Wildcards, Mehrwortbegriffe als Phrase"""
+    parts = []
+    for term in terms:
+        tokens = _term_tokens(term)
+        parts.append(f'"{" ".join(tokens)}"' if len(tokens) > 1 else f"{tokens[0]}*")
+    return " OR ".join(parts)
+
+
+def ensure_fulltext_index(driver):
+    with driver.session() as session:
+        session.run(FULLTEXT_INDEX_QUERY).consume()
+
+
+def fulltext_top_n(driver, element_ids, top_n=10, terms=EDUCATION_TERMS):
+    """{elementId(Politiker): [{content_id, score}, ...]} aus dem Volltextindex"""
+    with driver.session() as session:
+        result = session.run(FULLTEXT_SEARCH_QUERY, query=lucene_query(terms),
+                             ids=list(element_ids), top_n=top_n)
+        return {record["id"]: record["hits"] for record in result}
+
+
+# ---------------------------------------------------------------------------
+# Evaluation gegen die reine Embedding-Retrieval
+# ---------------------------------------------------------------------------
+
+def _probe(text, size=100):
+    """Textausschnitt aus der Mitte eines Chunks (vom Overlap-Abzug nicht betroffen)"""
+    text = " ".join(text.split())
+    if len(text) <= size:
+        return text
+    start = (len(text) - size) // 2
+    return text[start:start + size]
+
+
+def _content_list(person):
+    content = person.get('neo4j_content', [])
+    return ast.literal_eval(content) if isinstance(content, str) else content
+
+
+def evaluate(test_data_path="testdata/filtered_minister_with_content.json",
+             log_path="test_log_files/gpt-4.1_v6_openai_embedding.json",
+             top_n=10):
+    """
+    Vergleicht den BM25-Prefilter mit der Embedding-Retrieval eines früheren Laufs.
+
+    Recall: Anteil der Chunks, die die Embedding-Suche in den Prompt gebracht hat
+    (laut retrieved_content im Log), die auch unter den top_n BM25-Kandidaten sind.
+    Token-Reduktion: eingesparte Embedding-Tokens, wenn nur die Kandidaten
+    embedded werden.
+    """
+    from embedding_retrieval import chunk_content_sections
+    from utils import count_tokens
+
+    with open(test_data_path, encoding="utf-8") as f:
+        people = {p['ID']: p for p in json.load(f)}
+    with open(log_path, encoding="utf-8") as f:
+        log = {e['ID']: e for e in json.load(f)}
+
+    hits = relevant = 0
+    tokens_all = tokens_kept = 0
+    for pid, entry in log.items():
+        person = people.get(pid)
+        if person is None:
+            continue
+        sections = [{
+            'politician_name': f"{person['Vorname']} {person['Nachname']}",
+            'content_id': c['content_id'],
+            'section_content': c['section_content'],
+        } for c in _content_list(person)]
+        chunks = chunk_content_sections(sections)
+        if not chunks:
+            continue
+
+        retrieved = " ".join(str(entry.get('retrieved_content', '')).split())
+        selected = {c['content_id'] for c in chunks if _probe(c['section_content']) in retrieved}
+        kept = lexical_prefilter(chunks, top_n=top_n)
+        kept_ids = {c['content_id'] for c in kept}
+
+        relevant += len(selected)
+        hits += len(selected & kept_ids)
+        tokens_all += sum(count_tokens(c['section_content']) for c in chunks)
+        tokens_kept += sum(count_tokens(c['section_content']) for c in kept)
+
+    recall = hits / relevant if relevant else 0.0
+    reduction = 1 - tokens_kept / tokens_all if tokens_all else 0.0
+    print(f"📊 BM25-Prefilter (top_n={top_n}) gegen Embedding-Retrieval ({len(log)} Politiker)")
+    print(f"   Recall der Embedding-Top-Chunks: {recall:.1%} ({hits}/{relevant})")
+    print(f"   Embedding-Tokens: {tokens_all} → {tokens_kept} (−{reduction:.1%})")
+    return {"recall": recall, "hits": hits, "relevant": relevant,
+            "tokens_all": tokens_all, "tokens_kept": tokens_kept, "token_reduction": reduction}
+
+
+if __name__ == '__main__':
+    for n in (5, 10, 15):
+        evaluate(top_n=n)
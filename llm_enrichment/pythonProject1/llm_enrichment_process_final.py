@@ -1,9 +1,17 @@
 from text_to_dqr import text_to_dqr, calculate_cost, SYSTEM_PROMPT, PRICE_DATA_LLM, PRICE_DATA_EMBEDDING
 from embedding_retrieval import extract_content_sections, chunk_content_sections, embed_sections_openai, find_top_k_sections, EDUCATION_QUERY
+from education_signals import scan_person, signal_terms, NO_SIGNAL_RESULT
+from dqr_rules import apply_rules
+from lexical_retrieval import lexical_prefilter, lexical_top_k
+from prompt_assembly import assemble_user_payload, PROMPT_CACHE_KEY
+from completion_cache import CompletionCache
+from model_cascade import CascadeRouter
+from result_store import ResultStore
+from neo4j_export import iter_politicians
 from utils import timer_decorator
 from datetime import datetime
+from itertools import batched
 import os
-import json
 
 
 
@@ -24,53 +32,53 @@ Todos:
 - [ ] 
 """
 
-def embedding_process(person, query_embedding):
-    sections = extract_content_sections(person)
-    chunked_sections = chunk_content_sections(sections)
-    embeddings, embedding_tokens = embed_sections_openai(chunked_sections)  # NEU: embedding_tokens
+def embedding_process(person, query_embedding, embed_fn=embed_sections_openai, precomputed=None,
+                      prefilter_top_n=None, vector_store=None, stored=False):
+    """
+    Wählt die Top-5 Abschnitte eines Politikers für den Prompt.
+
+    query_embedding=None: rein lexikalisch (BM25 gegen EDUCATION_TERMS), ohne Embeddings.
+    prefilter_top_n: nur die top_n BM25-Kandidaten embedden statt aller Chunks.
+    vector_store: ChunkVectorStore; neue Chunk-Embeddings werden dort vorgemerkt,
+        bei stored=True liegen sie schon im Graphen und werden nur abgefragt.
+    """
+    if query_embedding is None:
+        chunked_sections = chunk_content_sections(extract_content_sections(person))
+        top_5 = assemble_user_payload(lexical_top_k(chunked_sections), num_sections=5)
+        return top_5, 0
+
+    if vector_store is not None and stored:
+        top_k_sections = vector_store.top_k(query_embedding, k=10, politician_id=person["neo4j_element_id"])
+        return assemble_user_payload(top_k_sections, num_sections=5), 0
+
+    if precomputed is None:
+        sections = extract_content_sections(person)
+        chunked_sections = chunk_content_sections(sections)
+        if prefilter_top_n:
+            chunked_sections = lexical_prefilter(chunked_sections, top_n=prefilter_top_n)
+        embeddings, embedding_tokens = embed_fn(chunked_sections)  # NEU: embedding_tokens
+    else:
+        # Lokales Backend: Chunks + Embeddings wurden für den ganzen Batch vorab berechnet
+        chunked_sections, embeddings = precomputed
+        embedding_tokens = 0
+    if vector_store is not None:
+        vector_store.add(person, chunked_sections, embeddings)
     top_k_sections = find_top_k_sections(query_embedding, embeddings, chunked_sections)
 
-    num_sections = min(5, len(top_k_sections))
-    top_5 = " ".join([top_k_sections[i]['section']['section_content'] for i in range(num_sections)])
+    # Top-5 ohne doppelte Overlap-Texte und mit Token-Budget
+    top_5 = assemble_user_payload(top_k_sections, num_sections=5)
 
     return top_5, embedding_tokens  
 
 
-def llm_process(language_model, SYSTEM_PROMPT, top_5):
-    return text_to_dqr(language_model, SYSTEM_PROMPT, top_5)
+def llm_process(language_model, SYSTEM_PROMPT, top_5, completion_cache=None):
+    return text_to_dqr(language_model, SYSTEM_PROMPT, top_5, prompt_cache_key=PROMPT_CACHE_KEY,
+                       cache=completion_cache)
 
 
-def create_or_load_batches(data, batch_size=100):
-    """
-    Erstellt Batches oder lädt sie aus dem Cache
-    """
-    batch_structure_file = "final_data/batches/batch_structure.json"
-    
-    # Prüfen ob Batches bereits existieren
-    if os.path.exists(batch_structure_file):
-        print("📂 Lade gespeicherte Batch-Struktur...")
-        with open(batch_structure_file, 'r') as f:
-            batches = json.load(f)
-        print(f"✅ {len(batches)} Batches aus Cache geladen")
-        return batches
-    
-    # Neue Batches erstellen
-    print("🆕 Erstelle neue Batch-Struktur...")
-    batches = []
-    for i in range(0, len(data), batch_size):
-        batch = data[i:i + batch_size]
-        batches.append(batch)
-    
-    # Batches speichern
-    os.makedirs("final_data/batches", exist_ok=True)
-    with open(batch_structure_file, 'w') as f:
-        json.dump(batches, f, ensure_ascii=False, indent=2)
-    
-    print(f"�� {len(batches)} Batches gespeichert")
-    return batches
-
 @timer_decorator
-def process_batch(batch_data, batch_num, query_embedding, language_model):
+def process_batch(batch_data, batch_num, query_embedding, language_model, store, embedder=None,
+                  prefilter_top_n=None, vector_store=None, completion_cache=None, cascade=None):
     """
     Verarbeitet einen Batch von Politikern
     
@@ -79,12 +87,20 @@ def process_batch(batch_data, batch_num, query_embedding, language_model):
         batch_num: Nummer des Batches
         query_embedding: Embedding der Bildungs-Query
         language_model: Zu verwendendes LLM-Modell
+        store: ResultStore, in den jedes Ergebnis sofort geschrieben wird (mit vector_store erst
+            nach dessen flush(), sonst gälte ein Politiker ohne gespeicherte Chunks als erledigt)
+        embedder: Optionaler LocalEmbedder; sonst OpenAI-Embeddings
+        prefilter_top_n: BM25-Prefilter vor dem Embedding (None = alle Chunks)
+        vector_store: Optionaler ChunkVectorStore (Chunk-Embeddings im Graphen speichern/abfragen)
+        completion_cache: Optionaler CompletionCache (gleiche Anfrage ⇒ kein erneuter API-Aufruf)
+        cascade: Optionaler CascadeRouter (günstiges Modell zuerst, language_model nur bei Eskalation)
     
     Returns:
-        dict: Ergebnisse des Batches mit Metadaten
+        dict: Metadaten des Batches (Ergebnisse stehen im ResultStore)
     """
-    batch_results = []
-    batch_errors = []
+    successful = 0
+    failed = 0
+    pending_results = []
     
     # Batch-spezifische Metriken
     batch_start_time = datetime.now()
@@ -92,31 +108,94 @@ def process_batch(batch_data, batch_num, query_embedding, language_model):
     batch_llm_costs = 0
     batch_embedding_time = 0
     batch_llm_time = 0
-
+    batch_prompt_tokens = 0
+    batch_cached_tokens = 0
     
     print(f"🚀 Starte Batch {batch_num} mit {len(batch_data)} Politikern")
+
+    # Bildungssignal-Scan: wer in keinem Abschnitt ein Signal hat, bekommt ohne
+    # Embedding und LLM-Aufruf das 0-Ergebnis aus dem SYSTEM_PROMPT
+    signals = {p["neo4j_element_id"]: scan_person(p) for p in batch_data}
+    avoided_llm_calls = 0
+    avoided_embedding_calls = 0
+    rule_decisions = 0
+
+    # Politiker, deren Chunk-Embeddings zum aktuellen Inhalt schon im Vektorindex liegen,
+    # werden nicht neu embedded
+    stored = set()
+    if vector_store is not None:
+        stored = vector_store.chunked_politicians(batch_data)
+    batch_data_to_embed = [
+        p for p in batch_data
+        if p["neo4j_element_id"] not in stored and signals[p["neo4j_element_id"]]
+    ]
+
+    # Lokales Backend: alle Abschnitte des Batches in einem großen Encode-Aufruf
+    precomputed = {}
+    if embedder is not None:
+        embedding_start = datetime.now()
+        precomputed = embedder.embed_people(batch_data_to_embed)
+        batch_embedding_time += (datetime.now() - embedding_start).total_seconds()
     
     for i, person in enumerate(batch_data):
         try:
-            # Embedding-Prozess
-            embedding_start = datetime.now()
-            top_5, embedding_tokens = embedding_process(person, query_embedding)
-            embedding_duration = (datetime.now() - embedding_start).total_seconds()
-            batch_embedding_time += embedding_duration
+            hits = signals[person["neo4j_element_id"]]
+            if not hits:
+                dqr_predict, comment_predict, confidence_score = NO_SIGNAL_RESULT
+                top_5, embedding_tokens = "", 0
+                prompt_tokens = completion_tokens = cached_tokens = 0
+                embedding_duration = llm_duration = 0.0
+                estimated_costs = 0.0
+                avoided_llm_calls += 1
+                decided_by = "signals"
+                model_used = None
+                if embedder is None and person["neo4j_element_id"] not in stored:
+                    avoided_embedding_calls += 1
+            else:
+                # Embedding-Prozess
+                embedding_start = datetime.now()
+                top_5, embedding_tokens = embedding_process(
+                    person, query_embedding, precomputed=precomputed.get(person["neo4j_element_id"]),
+                    prefilter_top_n=prefilter_top_n,
+                    vector_store=vector_store, stored=person["neo4j_element_id"] in stored,
+                )
+                embedding_duration = (datetime.now() - embedding_start).total_seconds()
+                batch_embedding_time += embedding_duration
             
-            embedding_costs = calculate_cost("text-embedding-3-small", embedding_tokens, 0, PRICE_DATA_EMBEDDING)
-            batch_embedding_costs += embedding_costs
+                embedding_costs = calculate_cost("text-embedding-3-small", embedding_tokens, 0, PRICE_DATA_EMBEDDING)
+                batch_embedding_costs += embedding_costs
+
+                # Eindeutige Abschlussnennungen entscheidet die Regel-Engine ohne LLM
+                rule_result = apply_rules(top_5)
+                if rule_result is not None:
+                    dqr_predict, comment_predict, confidence_score = rule_result
+                    prompt_tokens = completion_tokens = cached_tokens = 0
+                    llm_duration = 0.0
+                    estimated_costs = 0.0
+                    rule_decisions += 1
+                    decided_by = "rules"
+                    model_used = None
+                else:
+                    # LLM-Prozess
+                    decided_by = "llm"
+                    llm_start = datetime.now()
+                    if cascade is not None:
+                        (dqr_predict, comment_predict, confidence_score, prompt_tokens, completion_tokens,
+                         cached_tokens), cascade_info = cascade.classify(SYSTEM_PROMPT, top_5)
+                        model_used = cascade_info["model"]
+                        estimated_costs = cascade_info["costs"]
+                    else:
+                        dqr_predict, comment_predict, confidence_score, prompt_tokens, completion_tokens, cached_tokens = llm_process(language_model, SYSTEM_PROMPT, top_5, completion_cache)
+                        model_used = language_model
+                        # Kosten berechnen (gecachte Prompt-Tokens sind günstiger)
+                        estimated_costs = calculate_cost(language_model, prompt_tokens, completion_tokens, PRICE_DATA_LLM, cached_tokens)
+                    llm_duration = (datetime.now() - llm_start).total_seconds()
+                    batch_llm_time += llm_duration
+
+                    batch_llm_costs += estimated_costs
+                    batch_prompt_tokens += prompt_tokens
+                    batch_cached_tokens += cached_tokens
 
-            # LLM-Prozess
-            llm_start = datetime.now()
-            dqr_predict, comment_predict, confidence_score, prompt_tokens, completion_tokens, cached_tokens = llm_process(language_model, SYSTEM_PROMPT, top_5)
-            llm_duration = (datetime.now() - llm_start).total_seconds()
-            batch_llm_time += llm_duration
-            
-            # Kosten berechnen
-            estimated_costs = calculate_cost(language_model, prompt_tokens, completion_tokens, PRICE_DATA_LLM)
-            batch_llm_costs += estimated_costs
-            
             # Erfolgreichen Datensatz speichern
             entry = {
                 "neo4j_element_id": person["neo4j_element_id"],
@@ -130,12 +209,20 @@ def process_batch(batch_data, batch_num, query_embedding, language_model):
                 "confidence_score": confidence_score,
                 "prompt_tokens": prompt_tokens,
                 "completion_tokens": completion_tokens,
+                "cached_tokens": cached_tokens,
                 "estimated_costs": estimated_costs,
                 "retrieved_content": top_5,
+                "signal_terms": signal_terms(hits),
+                "decided_by": decided_by,
+                "model": model_used,
                 "embedding_duration": embedding_duration,
                 "llm_duration": llm_duration
             }
-            batch_results.append(entry)
+            if vector_store is None:
+                store.append_result(entry)
+            else:
+                pending_results.append(entry)
+            successful += 1
             
             print(f"✅ Batch {batch_num}: Politiker {i+1}/{len(batch_data)} verarbeitet")
             
@@ -150,104 +237,130 @@ def process_batch(batch_data, batch_num, query_embedding, language_model):
                 "batch_num": batch_num,
                 "person_index": i
             }
-            batch_errors.append(error_entry)
+            store.append_error(error_entry)
+            failed += 1
             print(f"❌ Batch {batch_num}: Fehler bei Politiker {i+1}: {e}")
     
+    if vector_store is not None:
+        # schlägt der Flush fehl, bleiben die Politiker offen und werden beim nächsten Lauf neu verarbeitet
+        vector_store.flush()
+        for entry in pending_results:
+            store.append_result(entry)
+
     # Batch-Metadaten
     batch_duration = (datetime.now() - batch_start_time).total_seconds()
+    cache_hit_ratio = batch_cached_tokens / batch_prompt_tokens if batch_prompt_tokens else 0.0
     
     batch_summary = {
         "batch_num": batch_num,
         "batch_size": len(batch_data),
-        "successful_processing": len(batch_results),
-        "failed_processing": len(batch_errors),
+        "successful_processing": successful,
+        "failed_processing": failed,
         "batch_start_time": batch_start_time.isoformat(),
         "batch_duration": batch_duration,
         "total_embedding_time": batch_embedding_time,
         "total_llm_time": batch_llm_time,
         "total_llm_costs": batch_llm_costs,
         "total_embedding_costs": batch_embedding_costs,
-        "results": batch_results,
-        "errors": batch_errors
+        "total_prompt_tokens": batch_prompt_tokens,
+        "total_cached_tokens": batch_cached_tokens,
+        "cache_hit_ratio": cache_hit_ratio,
+        "avoided_llm_calls": avoided_llm_calls,
+        "avoided_embedding_calls": avoided_embedding_calls,
+        "rule_decisions": rule_decisions,
     }
+    if completion_cache is not None:
+        batch_summary["completion_cache"] = completion_cache.stats()
+    if cascade is not None:
+        batch_summary["cascade"] = cascade.stats()
     
-    print(f"🎯 Batch {batch_num} abgeschlossen: {len(batch_results)} erfolgreich, {len(batch_errors)} Fehler")
+    print(f"🎯 Batch {batch_num} abgeschlossen: {successful} erfolgreich, {failed} Fehler")
+    print(f"⏭️ Batch {batch_num}: {avoided_llm_calls} Politiker ohne Bildungssignal – "
+          f"{avoided_llm_calls} LLM- und {avoided_embedding_calls} Embedding-Aufrufe gespart")
+    print(f"📏 Batch {batch_num}: {rule_decisions} Politiker per Regel-Engine ohne LLM entschieden")
+    if completion_cache is not None:
+        completion_cache.print_stats()
+    if cascade is not None:
+        cascade.print_stats()
+    print(f"💰 Batch {batch_num} Kosten: LLM {batch_llm_costs:.4f}$ | Embedding {batch_embedding_costs:.4f}$ | Cache-Hit-Ratio {cache_hit_ratio:.1%}")
     
     return batch_summary
 
-def save_batch_results(batch_num, batch_summary):
-    """
-    Speichert Batch-Ergebnisse in separate JSON-Dateien
-    
-    Args:
-        batch_num: Nummer des Batches
-        batch_summary: Ergebnisse des Batches
-    """
-    # Ordner erstellen falls nicht vorhanden
-    os.makedirs("final_data/batches", exist_ok=True)
-    os.makedirs("final_data/errors", exist_ok=True)
-    
-    # Batch-Ergebnisse speichern
-    batch_file = f"final_data/batches/batch_{batch_num:03d}.json"
-    with open(batch_file, 'w', encoding='utf-8') as f:
-        json.dump(batch_summary, f, ensure_ascii=False, indent=2)
-    
-    # Fehler-Log speichern (falls Fehler aufgetreten sind)
-    if batch_summary["failed_processing"] > 0:
-        error_file = f"final_data/errors/errors_batch_{batch_num:03d}.json"
-        with open(error_file, 'w', encoding='utf-8') as f:
-            json.dump(batch_summary["errors"], f, ensure_ascii=False, indent=2)
-    
-    # Checkpoint aktualisieren
-    checkpoint_file = "final_data/checkpoint.json"
-    checkpoint_data = {
-        "last_completed_batch": batch_num,
-        "timestamp": datetime.now().isoformat(),
-        "total_batches_processed": batch_num + 1
-    }
-    with open(checkpoint_file, 'w', encoding='utf-8') as f:
-        json.dump(checkpoint_data, f, ensure_ascii=False, indent=2)
-    
-    print(f"💾 Batch {batch_num} gespeichert: {batch_file}")
-    if batch_summary["failed_processing"] > 0:
-        print(f"⚠️ Fehler-Log gespeichert: {error_file}")
-    print(f"📝 Checkpoint aktualisiert: {checkpoint_file}")
-
-
-
 @timer_decorator
 def main():
     # Ordner erstellen
     os.makedirs("final_data", exist_ok=True)
     
-    # Daten laden
-    data_path = os.path.join("final_data", "neo4j_data_politicians_filtered.json")
-    with open(data_path, "r") as f:
-        data = json.load(f)
+    # Ergebnis-Log öffnen; bereits fertige Politiker werden übersprungen
+    store = ResultStore("final_data/run")
+    if not store.completed:
+        store.import_legacy_batches("final_data/batches")
+    print(f"📝 Bereits verarbeitet: {len(store.completed)} Politiker")
 
-    # Batches erstellen/laden
-    batches = create_or_load_batches(data, batch_size=100)
+    # Export aus neo4j_export.py streamen (JSONL/Parquet), nur offene Politiker
+    data_path = os.path.join("final_data", "neo4j_data_politicians_filtered.jsonl")
+    if not os.path.exists(data_path):
+        data_path = os.path.join("final_data", "neo4j_data_politicians_filtered.json")
+    # Politiker mit geänderten Abschnitten (content_changed_at) werden erneut verarbeitet
+    pending = (
+        person for person in iter_politicians(data_path)
+        if not store.is_completed(person["neo4j_element_id"], person.get("content_changed_at"))
+    )
     
-    # Query-Embedding erstellen (einmal für alle Batches)
-    query_embedding, _ = embed_sections_openai([{'section_content': EDUCATION_QUERY[0]}])
+    # Query-Embedding erstellen (einmal für alle Batches, mit demselben Backend wie die Abschnitte)
+    embedding_backend = "openai"  # oder "local" / "lexical" (nur BM25, keine Embeddings)
+    # BM25-Prefilter: nur die besten N Chunks embedden (siehe lexical_retrieval.evaluate)
+    prefilter_top_n = 10
+    # Chunk-Embeddings als Vektorindex im Graphen ablegen (dann alle Chunks embedden, kein Prefilter)
+    store_vectors = False
+    vector_store = None
+    driver = None
+    embedder = None
+    if embedding_backend == "lexical":
+        query_embedding = [None]
+    elif embedding_backend == "local":
+        from local_embedding import LocalEmbedder, load_local_model
+        embedder = LocalEmbedder(load_local_model(backend="onnx", int8=True))
+        query_embedding, _ = embedder.embed_sections([{'section_content': EDUCATION_QUERY[0]}])
+    else:
+        query_embedding, _ = embed_sections_openai([{'section_content': EDUCATION_QUERY[0]}])
     query_embedding = query_embedding[0]  # Erste Zeile als 1D-Array
+    if store_vectors and embedding_backend != "lexical":
+        from neo4j import GraphDatabase
+        from neo4j_writer import NEO4J_URI, NEO4J_AUTH
+        from vector_store import ChunkVectorStore
+        driver = GraphDatabase.driver(NEO4J_URI, auth=NEO4J_AUTH)
+        model = "local" if embedder is not None else "text-embedding-3-small"
+        vector_store = ChunkVectorStore(driver, model=model, dimensions=len(query_embedding))
+        vector_store.ensure_index()
+        prefilter_top_n = None
     language_model = "gpt-4.1"
+    # Completion-Cache: Wiederholungsläufe zahlen identische Anfragen nicht erneut;
+    # cache_only=True für deterministische Offline-Läufe (Fehlschläge landen in errors.jsonl)
+    completion_cache = CompletionCache(os.path.join("final_data", "completion_cache.sqlite"), cache_only=False)
+    # Modell-Kaskade: gpt-4.1-mini zuerst, language_model nur bei Confidence < 3 oder Formatfehler.
+    # Aus, bis model_cascade.evaluate auf einem vollständigen gpt-4.1-mini-Testlauf ausgewertet ist
+    use_cascade = False
+    cascade = None
+    if use_cascade:
+        cascade = CascadeRouter(["gpt-4.1-mini", language_model], prompt_cache_key=PROMPT_CACHE_KEY,
+                                cache=completion_cache)
     
-    print(f"🚀 Starte Verarbeitung von {len(batches)} Batches")
-    print(f"📊 Test: Batches 6-25")
-    
-    # TEST: Nächste 5 Batches verarbeiten
-    for batch_num in range(35, 46):  # Batches 1, 2, 3, 4, 5
-        print(f"\n�� Verarbeite Batch {batch_num}...")
-        batch_result = process_batch(batches[batch_num], batch_num, query_embedding, language_model)
-        
-        # Batch-Ergebnisse speichern
-        save_batch_results(batch_num, batch_result)
-        
-        print(f"✅ Batch {batch_num} abgeschlossen!")
+    try:
+        for batch_num, batch in enumerate(batched(pending, 100), start=store.next_batch_num()):
+            print(f"\n📦 Verarbeite Batch {batch_num}...")
+            batch_summary = process_batch(list(batch), batch_num, query_embedding, language_model, store, embedder,
+                                          prefilter_top_n, vector_store, completion_cache, cascade)
+            store.append_batch_summary(batch_summary)
+            print(f"✅ Batch {batch_num} abgeschlossen!")
+    finally:
+        store.close()
+        completion_cache.close()
+        if driver is not None:
+            driver.close()
     
-    print(f"\n�� Test der nächsten 5 Batches abgeschlossen!")
-    print(f"📁 Ergebnisse in final_data/batches/ gespeichert")
+    print(f"\n🎉 Verarbeitung abgeschlossen: {len(store.completed)} Politiker im Ergebnis-Log")
+    print(f"📁 Ergebnisse in {store.results_path} gespeichert")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,137 @@
+import os
+import time
+
+import numpy as np
+import torch
+from sentence_transformers import SentenceTransformer
+
+from embedding_retrieval import extract_content_sections, chunk_content_sections
+from result_store import iter_people
+
+DEFAULT_LOCAL_MODEL = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"
+
+# Dateiname, den sentence_transformers.export_dynamic_quantized_onnx_model erzeugt
+DEFAULT_INT8_ONNX_FILE = "onnx/model_qint8_avx512_vnni.onnx"
+
+
+def load_local_model(model_name=DEFAULT_LOCAL_MODEL, backend="torch", int8=False,
+                     onnx_file=None, num_threads=None, max_seq_length=512):
+    """
+    Lädt ein lokales Embedding-Modell für CPU-Inferenz.
+
+    Args:
+        model_name: HuggingFace-Name oder lokaler Pfad
+        backend: "torch" oder "onnx" (ONNX-Export des Modells)
+        int8: int8-quantisiertes Modell verwenden
+        onnx_file: Expliziter ONNX-Dateiname im Modellordner (überschreibt int8)
+        num_threads: CPU-Threads (Standard: alle Kerne)
+        max_seq_length: Kappung der Eingabelänge in Tokens
+    """
+    num_threads = num_threads or os.cpu_count()
+    torch.set_num_threads(num_threads)
+
+    if backend == "onnx":
+        model_kwargs = {"provider": "CPUExecutionProvider"}
+        if onnx_file or int8:
+            model_kwargs["file_name"] = onnx_file or DEFAULT_INT8_ONNX_FILE
+        model = SentenceTransformer(model_name, device="cpu", backend="onnx", model_kwargs=model_kwargs)
+    else:
+        model = SentenceTransformer(model_name, device="cpu")
+        if int8:
+            # Dynamische Quantisierung der Linear-Layer (Gewichte int8, Aktivierungen float)
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    model.max_seq_length = max_seq_length
+    print(f"Lokales Embedding-Modell geladen: {model_name} ({backend}{', int8' if int8 else ''}, {num_threads} Threads)")
+    return model
+
+
+class LocalEmbedder:
+    """
+    Lokales Embedding-Backend mit großen, längensortierten Encode-Aufrufen.
+
+    Abschnitte vieler Politiker werden in einem Aufruf gebündelt; encode() sortiert
+    innerhalb des Aufrufs nach Länge, sodass ähnlich lange Texte im selben Batch
+    landen und kaum Padding entsteht.
+    """
+
+    def __init__(self, model, batch_size=64):
+        self.model = model
+        self.batch_size = batch_size
+
+    def encode(self, texts):
+        if not texts:
+            return np.zeros((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        with torch.inference_mode():
+            return self.model.encode(
+                texts,
+                batch_size=self.batch_size,
+                convert_to_numpy=True,
+                show_progress_bar=False,
+            )
+
+    def embed_sections(self, sections):
+        """Gleiche Signatur wie embed_sections_openai: (Embeddings, Token-Anzahl)"""
+        texts = [section['section_content'] for section in sections]
+        return self.encode(texts), 0
+
+    def embed_people(self, people):
+        """
+        Chunkt und embeddet alle Abschnitte mehrerer Politiker in einem Encode-Aufruf.
+
+        Returns:
+            dict: neo4j_element_id -> (chunked_sections, embeddings)
+        """
+        chunked_per_person = []
+        texts = []
+        for person in people:
+            chunked_sections = chunk_content_sections(extract_content_sections(person))
+            chunked_per_person.append((person["neo4j_element_id"], chunked_sections))
+            texts.extend(section['section_content'] for section in chunked_sections)
+
+        embeddings = self.encode(texts)
+
+        result = {}
+        offset = 0
+        for element_id, chunked_sections in chunked_per_person:
+            result[element_id] = (chunked_sections, embeddings[offset:offset + len(chunked_sections)])
+            offset += len(chunked_sections)
+        return result
+
+
+def benchmark_local_embedding(data_path, embedder, people_per_call=256, limit=None):
+    """Misst den Durchsatz (Abschnitte/Sekunde) für das Embedding des Korpus"""
+    total_sections = 0
+    total_seconds = 0.0
+    group = []
+
+    def run(group):
+        start = time.perf_counter()
+        embedded = embedder.embed_people(group)
+        return sum(len(chunks) for chunks, _ in embedded.values()), time.perf_counter() - start
+
+    for i, person in enumerate(iter_people(data_path)):
+        if limit is not None and i >= limit:
+            break
+        group.append(person)
+        if len(group) >= people_per_call:
+            sections, seconds = run(group)
+            total_sections += sections
+            total_seconds += seconds
+            group = []
+    if group:
+        sections, seconds = run(group)
+        total_sections += sections
+        total_seconds += seconds
+
+    rate = total_sections / total_seconds if total_seconds else 0.0
+    print(f"📊 {total_sections} Abschnitte in {total_seconds:.1f} s → {rate:.1f} Abschnitte/s")
+    return {"sections": total_sections, "seconds": total_seconds, "sections_per_sec": rate}
+
+
+if __name__ == '__main__':
+    data_path = os.path.join("final_data", "neo4j_data_politicians_filtered.jsonl")
+    for backend, int8 in (("torch", False), ("torch", True), ("onnx", False)):
+        embedder = LocalEmbedder(load_local_model(backend=backend, int8=int8))
+        print(f"\n🚀 Benchmark {backend}{' int8' if int8 else ''}")
+        benchmark_local_embedding(data_path, embedder, limit=500)
@@ -0,0 +1,157 @@
+import json
+import sys
+import time
+
+from text_to_dqr import text_to_dqr, calculate_cost, PRICE_DATA_LLM
+
+# Günstige Modelle zuerst; das letzte Modell entscheidet immer
+DEFAULT_TIERS = ["gpt-4.1-mini", "gpt-4.1"]
+
+# Confidence laut SYSTEM_PROMPT: 3 = explizite Nennung, 2 = plausibel, 1 = vage.
+# 0-Ergebnisse ohne Confidence („-“) gehen ebenfalls weiter: nach dem Bildungssignal-Scan
+# (education_signals.py) enthält jeder Text, der hier ankommt, mindestens ein Signal.
+DEFAULT_MIN_CONFIDENCE = 3
+
+
+def _empty_tier_stats():
+    return {"calls": 0, "accepted": 0, "escalated": 0, "parse_errors": 0,
+            "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0,
+            "costs": 0.0, "latency": 0.0}
+
+
+class CascadeRouter:
+    """
+    Modell-Kaskade um text_to_dqr.
+
+    Jede Stufe klassifiziert; ein wohlgeformtes Ergebnis mit confidence >= min_confidence
+    wird übernommen, sonst (niedrige Confidence, 0 ohne Confidence, Formatfehler) geht
+    der Text an die nächste Stufe. Die letzte Stufe entscheidet endgültig.
+
+    Pro Stufe werden Aufrufe, Übernahmen, Eskalationen, Tokens, Kosten und Latenz
+    gezählt (kumuliert über alle Batches).
+    """
+
+    def __init__(self, tiers=DEFAULT_TIERS, min_confidence=DEFAULT_MIN_CONFIDENCE,
+                 prompt_cache_key=None, cache=None):
+        if not tiers:
+            raise ValueError("Mindestens ein Modell nötig")
+        self.tiers = list(tiers)
+        self.min_confidence = min_confidence
+        self.prompt_cache_key = prompt_cache_key
+        self.cache = cache
+        self.tier_stats = {model: _empty_tier_stats() for model in self.tiers}
+
+    def accepts(self, dqr, confidence):
+        return confidence is not None and confidence >= self.min_confidence
+
+    def classify(self, system_prompt, text):
+        """
+        Returns:
+            (Tupel wie text_to_dqr mit Tokens summiert über alle Stufen, info)
+            info = {"model": entscheidende Stufe, "escalations": Anzahl, "costs": Kosten in $}
+        """
+        prompt_tokens = completion_tokens = cached_tokens = 0
+        costs = 0.0
+        last = len(self.tiers) - 1
+        for level, model in enumerate(self.tiers):
+            stats = self.tier_stats[model]
+            stats["calls"] += 1
+            start = time.perf_counter()
+            try:
+                dqr, comment, confidence, p_tok, c_tok, ca_tok = text_to_dqr(
+                    model, system_prompt, text,
+                    prompt_cache_key=self.prompt_cache_key, cache=self.cache,
+                )
+            except ValueError:
+                # Unparsebare Antwort: nächste Stufe, in der letzten Stufe weiterreichen
+                stats["latency"] += time.perf_counter() - start
+                stats["parse_errors"] += 1
+                if level == last:
+                    raise
+                stats["escalated"] += 1
+                continue
+            stats["latency"] += time.perf_counter() - start
+
+            tier_costs = calculate_cost(model, p_tok, c_tok, PRICE_DATA_LLM, ca_tok)
+            stats["prompt_tokens"] += p_tok
+            stats["completion_tokens"] += c_tok
+            stats["cached_tokens"] += ca_tok
+            stats["costs"] += tier_costs
+            prompt_tokens += p_tok
+            completion_tokens += c_tok
+            cached_tokens += ca_tok
+            costs += tier_costs
+
+            if level == last or self.accepts(dqr, confidence):
+                stats["accepted"] += 1
+                info = {"model": model, "escalations": level, "costs": costs}
+                return (dqr, comment, confidence, prompt_tokens, completion_tokens, cached_tokens), info
+            stats["escalated"] += 1
+
+    def stats(self):
+        first = self.tier_stats[self.tiers[0]]
+        return {
+            "tiers": {model: dict(s) for model, s in self.tier_stats.items()},
+            "escalation_rate": first["escalated"] / first["calls"] if first["calls"] else 0.0,
+            "total_costs": sum(s["costs"] for s in self.tier_stats.values()),
+        }
+
+    def print_stats(self):
+        for model, s in self.tier_stats.items():
+            avg = s["latency"] / s["calls"] if s["calls"] else 0.0
+            print(f"🪜 {model}: {s['calls']} Aufrufe, {s['accepted']} übernommen, {s['escalated']} eskaliert "
+                  f"({s['parse_errors']} Formatfehler) | {s['costs']:.4f}$ | Ø {avg:.2f} s")
+
+
+# ---------------------------------------------------------------------------
+# Evaluation aus zwei Testläufen (test_process.py mit günstigem und teurem Modell)
+# ---------------------------------------------------------------------------
+
+def evaluate(cheap_log_path, strong_log_path="test_log_files/gpt-4.1_v6_openai_embedding.json",
+             min_confidence=DEFAULT_MIN_CONFIDENCE):
+    """
+    Simuliert die zweistufige Kaskade auf denselben Politikern.
+
+    Übernommen wird die Antwort des günstigen Modells bei confidence >= min_confidence,
+    sonst die des teuren Modells; Kosten = günstiger Lauf + teurer Lauf für die Eskalationen.
+    """
+    with open(cheap_log_path, encoding="utf-8") as f:
+        cheap = {e['ID']: e for e in json.load(f)}
+    with open(strong_log_path, encoding="utf-8") as f:
+        strong = {e['ID']: e for e in json.load(f)}
+
+    ids = [pid for pid in strong if pid in cheap]
+    router = CascadeRouter(min_confidence=min_confidence)
+    escalated = correct = strong_correct = cheap_correct = 0
+    costs = 0.0
+    for pid in ids:
+        c, s = cheap[pid], strong[pid]
+        expected = int(c['dqr_original'])
+        costs += c['estimated_costs']
+        cheap_correct += c['dqr_predict'] == expected
+        strong_correct += s['dqr_predict'] == expected
+        if router.accepts(c['dqr_predict'], c.get('confidence_score')):
+            correct += c['dqr_predict'] == expected
+        else:
+            escalated += 1
+            costs += s['estimated_costs']
+            correct += s['dqr_predict'] == expected
+
+    n = len(ids)
+    strong_costs = sum(strong[pid]['estimated_costs'] for pid in ids)
+    print(f"📊 Kaskade ({cheap_log_path} → {strong_log_path}), {n} Politiker, min_confidence={min_confidence}")
+    if n == 0:
+        print("   ⚠️ Keine gemeinsamen Politiker in beiden Logs")
+    else:
+        print(f"   Eskalationsrate: {escalated / n:.1%} ({escalated}/{n})")
+        print(f"   Genauigkeit: günstig {cheap_correct / n:.1%} | teuer {strong_correct / n:.1%} | Kaskade {correct / n:.1%}")
+    saving = f" (−{1 - costs / strong_costs:.1%})" if strong_costs else ""
+    print(f"   Kosten: teuer {strong_costs:.4f}$ → Kaskade {costs:.4f}${saving}")
+    return {"n": n, "escalated": escalated, "correct": correct, "strong_correct": strong_correct,
+            "cheap_correct": cheap_correct, "costs": costs, "strong_costs": strong_costs}
+
+
+if __name__ == '__main__':
+    # Günstiger Lauf per test_process.py (language_model = "gpt-4.1-mini"), z. B.
+    # python model_cascade.py log_files/gpt-4.1-mini_v6_openai_embedding.json
+    evaluate(sys.argv[1])
@@ -0,0 +1,173 @@
+import json
+import os
+import time
+from itertools import batched
+
+from neo4j import GraphDatabase
+
+from result_store import iter_jsonl, iter_people
+
+NEO4J_URI = "bolt://localhost:7687"
+NEO4J_AUTH = ("neo4j", "bundestag_password")
+
+# Abschnitte ohne Bildungsinformationen (wie in prepare_neo4j_data.ipynb)
+DEFAULT_EXCLUDED_HEADERS = [
+    'Weblinks',
+    'Einzelnachweise',
+    'Literatur',
+    'Abgeordneter',
+    'Abgeordnete',
+    'Siehe auch',
+]
+
+# Keyset-Pagination über den Index der Constraint politician_detail_page
+# (angelegt vom Crawler, bundestags_scraper.pipelines.ensure_constraints)
+POLITICIAN_PAGE_QUERY = """
+MATCH (p:Politician)
+WHERE p.detail_page > $after
+RETURN p, elementId(p) AS element_id
+ORDER BY p.detail_page
+LIMIT $page_size
+"""
+
+CONTENT_QUERY = """
+UNWIND $ids AS id
+MATCH (p:Politician)
+WHERE elementId(p) = id
+OPTIONAL MATCH (p)-[:HAS_CONTENT]->(c:Content)
+WHERE NOT c.section_header IN $excluded
+RETURN id,
+       collect(c {content_id: c.id, .section_header, .section_content}) AS neo4j_content
+"""
+
+# Feste Spalten für Parquet; alle weiteren Politiker-Properties landen als JSON in "properties"
+CORE_COLUMNS = ['neo4j_element_id', 'detail_page', 'full_name', 'firstname', 'lastname', 'birth_year', 'death_year']
+YEAR_COLUMNS = {'birth_year', 'death_year'}
+
+
+def iter_politicians_from_neo4j(driver, page_size=500, content_chunk_size=100, excluded_headers=None):
+    """
+    Liefert Politiker mit ihren Content-Abschnitten seitenweise aus Neo4j.
+
+    Politiker werden per Keyset-Pagination über detail_page geholt, ihre Abschnitte
+    in Chunks von content_chunk_size Politikern. Der Speicherbedarf hängt nur von
+    page_size ab, nicht von der Größe des Korpus.
+    """
+    excluded = list(excluded_headers or [])
+    after = ""
+    with driver.session() as session:
+        while True:
+            records = list(session.run(POLITICIAN_PAGE_QUERY, after=after, page_size=page_size))
+            if not records:
+                return
+            page = []
+            for record in records:
+                politician = dict(record["p"])
+                politician["neo4j_element_id"] = record["element_id"]
+                page.append(politician)
+
+            contents = {}
+            for id_chunk in batched([p["neo4j_element_id"] for p in page], content_chunk_size):
+                for record in session.run(CONTENT_QUERY, ids=list(id_chunk), excluded=excluded):
+                    contents[record["id"]] = record["neo4j_content"]
+
+            for politician in page:
+                politician["neo4j_content"] = contents.get(politician["neo4j_element_id"], [])
+                yield politician
+            after = page[-1]["detail_page"]
+
+
+def _write_jsonl(politicians, output_file):
+    count = 0
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for politician in politicians:
+            # default=str für Neo4j-Zeittypen
+            f.write(json.dumps(politician, ensure_ascii=False, default=str) + "\n")
+            count += 1
+    return count
+
+
+def _year(value):
+    """Jahreszahl als int (Neo4j speichert teils Strings); unbrauchbare Werte -> None"""
+    try:
+        year = int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+    return year if -32768 <= year <= 32767 else None
+
+
+def _write_parquet(politicians, output_file, row_group_size=500):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    content_type = pa.list_(pa.struct([
+        ('content_id', pa.string()),
+        ('section_header', pa.string()),
+        ('section_content', pa.string()),
+    ]))
+    schema = pa.schema(
+        [(col, pa.int16() if col in YEAR_COLUMNS else pa.string()) for col in CORE_COLUMNS]
+        + [('properties', pa.string()), ('neo4j_content', content_type)]
+    )
+
+    def to_row(politician):
+        row = {col: None if politician.get(col) is None else str(politician[col]) for col in CORE_COLUMNS}
+        for col in YEAR_COLUMNS:
+            row[col] = _year(politician.get(col))
+        extra = {k: v for k, v in politician.items() if k not in CORE_COLUMNS and k != 'neo4j_content'}
+        row['properties'] = json.dumps(extra, ensure_ascii=False, default=str)
+        row['neo4j_content'] = politician.get('neo4j_content', [])
+        return row
+
+    count = 0
+    with pq.ParquetWriter(output_file, schema, compression='zstd') as writer:
+        for chunk in batched(politicians, row_group_size):
+            writer.write_table(pa.Table.from_pylist([to_row(p) for p in chunk], schema=schema))
+            count += len(chunk)
+    return count
+
+
+def export_politicians_with_content(driver, output_file="final_data/neo4j_data_politicians_filtered.jsonl",
+                                    page_size=500, content_chunk_size=100, excluded_headers=DEFAULT_EXCLUDED_HEADERS):
+    """
+    Exportiert alle Politiker mit Content als JSONL oder Parquet (nach Dateiendung).
+
+    Returns:
+        int: Anzahl exportierter Politiker
+    """
+    os.makedirs(os.path.dirname(output_file) or ".", exist_ok=True)
+    start = time.perf_counter()
+    politicians = iter_politicians_from_neo4j(driver, page_size, content_chunk_size, excluded_headers)
+    if output_file.endswith(".parquet"):
+        count = _write_parquet(politicians, output_file)
+    else:
+        count = _write_jsonl(politicians, output_file)
+    duration = time.perf_counter() - start
+    print(f"✅ {count} Politiker in {output_file} exportiert ({duration:.1f} s)")
+    return count
+
+
+def iter_politicians(path, batch_size=500):
+    """
+    Iterator über einen Export: JSONL, Parquet oder (Legacy) JSON-Liste.
+    """
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        parquet_file = pq.ParquetFile(path)
+        for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+            for row in record_batch.to_pylist():
+                extra = json.loads(row.pop('properties') or "{}")
+                yield {**row, **extra}
+    elif path.endswith(".jsonl"):
+        yield from iter_jsonl(path)
+    else:
+        yield from iter_people(path)
+
+
+if __name__ == '__main__':
+    driver = GraphDatabase.driver(NEO4J_URI, auth=NEO4J_AUTH)
+    try:
+        export_politicians_with_content(driver)
+    finally:
+        driver.close()
@@ -0,0 +1,117 @@
+import json
+import os
+import time
+from itertools import batched
+
+from neo4j import GraphDatabase
+
+from result_store import iter_jsonl
+
+NEO4J_URI = "bolt://localhost:7687"
+NEO4J_AUTH = ("neo4j", "bundestag_password")
+
+# MERGE statt CREATE: ein erneuter Push überschreibt die Klassifikation statt sie zu duplizieren
+CLASSIFICATION_QUERY = """
+UNWIND $rows AS row
+MATCH (p:Politician)
+WHERE elementId(p) = row.id
+MERGE (p)-[:HAS_CLASSIFICATION]->(c:Classification)
+SET c.dqr_level  = row.dqr_level,
+    c.comment    = row.comment,
+    c.confidence = row.confidence
+"""
+
+GENDER_QUERY = """
+UNWIND $rows AS row
+MATCH (p:Politician {detail_page: row.id})
+SET p.geschlecht            = row.geschlecht,
+    p.geschlecht_confidence = row.confidence
+"""
+
+# Period.number ist ein int (bundestags_scraper.dimensions); Nummern aus Notebooks kommen teils als String
+PERIOD_YEARS_QUERY = """
+UNWIND $rows AS row
+MATCH (p:Period {number: toInteger(row.id)})
+SET p.start_jahr = row.start_jahr,
+    p.ende_jahr  = row.ende_jahr,
+    p.dauer      = row.dauer
+"""
+
+
+def iter_results(source):
+    """
+    Streamt Enrichment-Ergebnisse aus einer der Ausgabeformen des Laufs:
+    results.jsonl, einem Ordner mit batch_XXX.json oder der konsolidierten JSON-Datei.
+    """
+    if os.path.isdir(source):
+        for name in sorted(os.listdir(source)):
+            if name.startswith("batch_") and name.endswith(".json") and name != "batch_structure.json":
+                with open(os.path.join(source, name), "r", encoding="utf-8") as f:
+                    yield from json.load(f).get("results", [])
+    elif source.endswith(".jsonl"):
+        yield from iter_jsonl(source)
+    else:
+        with open(source, "r", encoding="utf-8") as f:
+            yield from json.load(f)["results"]
+
+
+def classification_rows(results):
+    """Mappt Ergebniseinträge auf die Parameterzeilen für CLASSIFICATION_QUERY"""
+    for entry in results:
+        yield {
+            "id": entry["neo4j_element_id"],
+            "dqr_level": entry["dqr_predict"],
+            "comment": entry["comment_predict"],
+            "confidence": entry["confidence_score"],
+        }
+
+
+def write_rows(driver, query, rows, chunk_size=1000):
+    """
+    Schreibt Zeilen in Chunks per UNWIND; ein Chunk = eine Transaktion.
+
+    Returns:
+        dict: Anzahl Zeilen, Dauer und Durchsatz (Zeilen/Sekunde)
+    """
+    total = 0
+    start = time.perf_counter()
+    with driver.session() as session:
+        for chunk in batched(rows, chunk_size):
+            chunk = list(chunk)
+            session.execute_write(lambda tx: tx.run(query, rows=chunk).consume())
+            total += len(chunk)
+    duration = time.perf_counter() - start
+    rate = total / duration if duration else 0.0
+    print(f"✅ {total} Zeilen in {duration:.2f} s geschrieben ({rate:.0f} Zeilen/s, Chunk-Größe {chunk_size})")
+    return {"rows": total, "duration": duration, "rows_per_sec": rate}
+
+
+def push_classifications(driver, source="final_data/run/results.jsonl", chunk_size=1000):
+    """Schreibt die DQR-Klassifikationen aus dem Enrichment-Lauf nach Neo4j"""
+    return write_rows(driver, CLASSIFICATION_QUERY, classification_rows(iter_results(source)), chunk_size)
+
+
+def push_genders(driver, results, chunk_size=1000):
+    """results: Dicts mit detail_page, geschlecht, confidence"""
+    rows = (
+        {"id": r["detail_page"], "geschlecht": r["geschlecht"], "confidence": r["confidence"]}
+        for r in results
+    )
+    return write_rows(driver, GENDER_QUERY, rows, chunk_size)
+
+
+def push_period_years(driver, periods, chunk_size=1000):
+    """periods: Dicts mit number, start_jahr, ende_jahr, dauer"""
+    rows = (
+        {"id": p["number"], "start_jahr": p["start_jahr"], "ende_jahr": p["ende_jahr"], "dauer": p["dauer"]}
+        for p in periods
+    )
+    return write_rows(driver, PERIOD_YEARS_QUERY, rows, chunk_size)
+
+
+if __name__ == '__main__':
+    driver = GraphDatabase.driver(NEO4J_URI, auth=NEO4J_AUTH)
+    try:
+        push_classifications(driver)
+    finally:
+        driver.close()
@@ -0,0 +1,110 @@
+import hashlib
+import re
+from functools import lru_cache
+
+import tiktoken
+
+from text_to_dqr import SYSTEM_PROMPT
+
+# Token-Budget für den User-Teil des Prompts (Top-5 Abschnitte à max. 1000 Tokens)
+DEFAULT_TOKEN_BUDGET = 4000
+
+# Der System-Prompt ist der statische Prefix jeder Anfrage. Er muss Byte für Byte
+# identisch bleiben, damit das Prompt-Caching des Providers greift.
+PREFIX_SHA256 = hashlib.sha256(SYSTEM_PROMPT.encode("utf-8")).hexdigest()
+PROMPT_CACHE_KEY = f"dqr-{PREFIX_SHA256[:16]}"
+
+_CHUNK_ID = re.compile(r"^#(\d+)_(.+)$")
+
+
+@lru_cache(maxsize=None)
+def _encoding(model):
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def _split_chunk_id(content_id):
+    """'#03_<cid>' -> ('<cid>', 3); ungechunkte Abschnitte -> ('<cid>', None)"""
+    m = _CHUNK_ID.match(content_id)
+    if m:
+        return m.group(2), int(m.group(1))
+    return content_id, None
+
+
+def _strip_overlap(previous, current):
+    """Entfernt den Anfang von `current`, der mit dem Ende von `previous` übereinstimmt"""
+    prev_words = previous.split()
+    cur_words = current.split()
+    max_overlap = min(len(prev_words), len(cur_words))
+    for size in range(max_overlap, 0, -1):
+        if prev_words[-size:] == cur_words[:size]:
+            return " ".join(cur_words[size:])
+    return current
+
+
+def dedupe_sections(sections):
+    """
+    Entfernt doppelte Texte und den Overlap benachbarter Chunks desselben Abschnitts.
+
+    Die Reihenfolge (Retrieval-Ranking) bleibt erhalten.
+    """
+    texts = [section['section_content'] for section in sections]
+    positions = {}
+    for idx, section in enumerate(sections):
+        base_id, chunk_nr = _split_chunk_id(section['content_id'])
+        if chunk_nr is not None:
+            positions[(base_id, chunk_nr)] = idx
+
+    # Chunks in Dokumentreihenfolge verarbeiten, damit immer der spätere Chunk gekürzt wird
+    for (base_id, chunk_nr), idx in sorted(positions.items()):
+        prev_idx = positions.get((base_id, chunk_nr - 1))
+        if prev_idx is not None:
+            texts[idx] = _strip_overlap(sections[prev_idx]['section_content'], texts[idx])
+
+    deduped = []
+    seen = set()
+    for section, text in zip(sections, texts):
+        key = " ".join(text.split())
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        deduped.append({**section, 'section_content': text})
+    return deduped
+
+
+def cap_to_token_budget(texts, token_budget=DEFAULT_TOKEN_BUDGET, model="gpt-4.1"):
+    """Übernimmt Texte in Reihenfolge, bis das Token-Budget erschöpft ist"""
+    encoding = _encoding(model)
+    capped = []
+    remaining = token_budget
+    for text in texts:
+        tokens = encoding.encode(text)
+        if len(tokens) <= remaining:
+            capped.append(text)
+            remaining -= len(tokens)
+        else:
+            if remaining > 0:
+                capped.append(encoding.decode(tokens[:remaining]))
+            break
+    return capped
+
+
+def assemble_user_payload(top_k_sections, num_sections=5, token_budget=DEFAULT_TOKEN_BUDGET, model="gpt-4.1"):
+    """
+    Baut den User-Teil des Prompts aus den Retrieval-Ergebnissen.
+
+    Args:
+        top_k_sections: Ergebnis von find_top_k_sections (absteigend nach Ähnlichkeit)
+        num_sections: Anzahl der Abschnitte, die in den Prompt gehen
+        token_budget: Obergrenze für die Tokens des User-Teils
+        model: Modell, dessen Tokenizer für das Budget genutzt wird
+
+    Returns:
+        str: Deduplizierte, gekappte Abschnitte
+    """
+    sections = [entry['section'] for entry in top_k_sections[:num_sections]]
+    sections = dedupe_sections(sections)
+    texts = cap_to_token_budget([s['section_content'] for s in sections], token_budget, model)
+    return " ".join(texts)
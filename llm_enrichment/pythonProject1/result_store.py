@@ -0,0 +1,208 @@
+import json
+import os
+from datetime import datetime
+
+
+def _repair_tail(path):
+    """Schneidet eine beim Absturz nur halb geschriebene letzte Zeile ab"""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b"\n":
+            return
+        # Rückwärts bis zum letzten vollständigen Zeilenende suchen
+        pos = size - 1
+        while pos > 0:
+            step = min(4096, pos)
+            f.seek(pos - step)
+            block = f.read(step)
+            nl = block.rfind(b"\n")
+            if nl != -1:
+                f.truncate(pos - step + nl + 1)
+                return
+            pos -= step
+        f.truncate(0)
+
+
+def iter_jsonl(path):
+    """Liest eine JSONL-Datei zeilenweise; defekte Zeilen werden übersprungen"""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def iter_people(path):
+    """
+    Liefert die Politiker einer Eingabedatei einzeln.
+
+    JSONL wird gestreamt; klassische JSON-Listen werden (Legacy) komplett geladen.
+    """
+    if path.endswith(".jsonl"):
+        yield from iter_jsonl(path)
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from json.load(f)
+
+
+class ResultStore:
+    """
+    Append-only Ergebnisablage für den Enrichment-Lauf.
+
+    - results.jsonl:   eine Zeile pro erfolgreich verarbeitetem Politiker
+    - errors.jsonl:    eine Zeile pro Fehler (diese Politiker werden erneut versucht)
+    - completed.tsv:   Index "neo4j_element_id<TAB>timestamp" der fertigen Politiker
+    - batches.jsonl:   Batch-Zusammenfassungen ohne Einzelergebnisse
+
+    Nach einem Absturz wird exakt dort weitergemacht, wo der letzte Datensatz
+    geschrieben wurde.
+    """
+
+    def __init__(self, directory="final_data/run", fsync_every=10):
+        self.directory = directory
+        self.fsync_every = fsync_every
+        os.makedirs(directory, exist_ok=True)
+
+        self.results_path = os.path.join(directory, "results.jsonl")
+        self.errors_path = os.path.join(directory, "errors.jsonl")
+        self.index_path = os.path.join(directory, "completed.tsv")
+        self.batches_path = os.path.join(directory, "batches.jsonl")
+
+        for path in (self.results_path, self.errors_path, self.index_path, self.batches_path):
+            _repair_tail(path)
+
+        self.completed = self._load_index()
+        self._files = {
+            path: open(path, "a", encoding="utf-8")
+            for path in (self.results_path, self.errors_path, self.index_path, self.batches_path)
+        }
+        self._unsynced = 0
+
+    # –– Index ------------------------------------------------------------
+    def _load_index(self):
+        completed = {}
+        if not os.path.exists(self.index_path):
+            return completed
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            for line in f:
+                element_id, _, timestamp = line.rstrip("\n").partition("\t")
+                if element_id:
+                    completed[element_id] = timestamp
+        return completed
+
+    def is_completed(self, element_id, content_changed_at=None):
+        """
+        Fertig = im Index und nicht älter als die letzte Inhaltsänderung.
+
+        content_changed_at: Politician.content_changed_at aus Neo4j (Epoch-ms),
+        gesetzt vom Scraper, wenn sich ein Abschnitt geändert hat.
+        """
+        timestamp = self.completed.get(element_id)
+        if timestamp is None:
+            return False
+        if content_changed_at is None:
+            return True
+        try:
+            completed_ms = datetime.fromisoformat(timestamp).timestamp() * 1000
+        except ValueError:
+            return True
+        return completed_ms >= float(content_changed_at)
+
+    def next_batch_num(self):
+        """Nächste freie Batch-Nummer (fortlaufend über Neustarts hinweg)"""
+        last = -1
+        for summary in iter_jsonl(self.batches_path):
+            last = max(last, summary.get("batch_num", -1))
+        return last + 1
+
+    # –– Schreiben ----------------------------------------------------------
+    def _append(self, path, record):
+        f = self._files[path]
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        f.flush()
+
+    def _maybe_sync(self, force=False):
+        self._unsynced += 1
+        if force or self._unsynced >= self.fsync_every:
+            self.sync()
+
+    def sync(self):
+        for f in self._files.values():
+            f.flush()
+            os.fsync(f.fileno())
+        self._unsynced = 0
+
+    def append_result(self, entry):
+        """Ergebnis zuerst ins Log, danach in den Index (Index nie vor dem Ergebnis)"""
+        element_id = entry["neo4j_element_id"]
+        timestamp = entry.get("timestamp") or datetime.now().isoformat()
+        self._append(self.results_path, entry)
+        self._files[self.index_path].write(f"{element_id}\t{timestamp}\n")
+        self._files[self.index_path].flush()
+        self.completed[element_id] = timestamp
+        self._maybe_sync()
+
+    def append_error(self, error_entry):
+        self._append(self.errors_path, error_entry)
+        self._maybe_sync()
+
+    def append_batch_summary(self, batch_summary):
+        self._append(self.batches_path, batch_summary)
+        self.sync()
+
+    # –– Lesen --------------------------------------------------------------
+    def iter_results(self):
+        """
+        Alle Ergebnisse, pro Politiker nur das neueste (doppelte Zeilen entstehen
+        durch einen Absturz zwischen Log und Index oder durch erneute Verarbeitung
+        nach einer Inhaltsänderung)
+        """
+        latest = {}
+        for entry in iter_jsonl(self.results_path):
+            latest[entry.get("neo4j_element_id")] = entry
+        yield from latest.values()
+
+    # –– Migration ------------------------------------------------------------
+    def import_legacy_batches(self, batch_dir="final_data/batches"):
+        """Übernimmt Ergebnisse aus alten batch_XXX.json-Dateien in das Log"""
+        if not os.path.isdir(batch_dir):
+            return 0
+        imported = 0
+        for name in sorted(os.listdir(batch_dir)):
+            if not (name.startswith("batch_") and name.endswith(".json")) or name == "batch_structure.json":
+                continue
+            with open(os.path.join(batch_dir, name), "r", encoding="utf-8") as f:
+                batch_data = json.load(f)
+            for entry in batch_data.get("results", []):
+                if not self.is_completed(entry["neo4j_element_id"]):
+                    self.append_result(entry)
+                    imported += 1
+            summary = {k: v for k, v in batch_data.items() if k not in ("results", "errors")}
+            self.append_batch_summary(summary)
+        self.sync()
+        print(f"📥 {imported} Ergebnisse aus {batch_dir} übernommen")
+        return imported
+
+    # –– Lifecycle --------------------------------------------------------------
+    def close(self):
+        self.sync()
+        for f in self._files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,5 +1,5 @@
-from text_to_dqr import create_sample, process_and_log, system_prompt, text_to_dqr, PRICE_DATA, calculate_cost
-from embedding_retrieval import extract_content_sections, embed_sections, find_top_k_sections, chunk_content_sections, embed_sections_openai, education_query
+from text_to_dqr import create_sample, process_and_log, SYSTEM_PROMPT, text_to_dqr, PRICE_DATA_LLM, calculate_cost
+from embedding_retrieval import extract_content_sections, embed_sections, find_top_k_sections, chunk_content_sections, embed_sections_openai, EDUCATION_QUERY
 import json
 from datetime import datetime
 from sentence_transformers import SentenceTransformer
@@ -7,6 +7,7 @@ from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 import os
 from utils import timer_decorator, count_tokens
+from completion_cache import CompletionCache
 
 
 @timer_decorator
@@ -38,23 +39,28 @@ def main():
   
     #embedding_model = SentenceTransformer('sentence-transformers/paraphrase-multilingual-mpnet-base-v2')
 
-    query_embedding = embed_sections_openai([{'section_content': education_query[0]}])[0]
+    query_embedding, _ = embed_sections_openai([{'section_content': EDUCATION_QUERY[0]}])
+    query_embedding = query_embedding[0]  # Erste Zeile als 1D-Array
 
     language_model = "gpt-4.1"
 
+    # Wiederholte Testläufe bezahlen identische Anfragen nicht erneut;
+    # cache_only=True für Benchmarks ohne API-Aufrufe
+    completion_cache = CompletionCache(os.path.join("log_files", "completion_cache.sqlite"))
+
     for i, person in enumerate(data):
         sections = extract_content_sections(person)
         chunked_sections = chunk_content_sections(sections)
-        embeddings = embed_sections_openai(chunked_sections)
+        embeddings, _ = embed_sections_openai(chunked_sections)
         top_k_sections = find_top_k_sections(query_embedding, embeddings, chunked_sections)
 
         num_sections = min(5, len(top_k_sections))
         top_5 = " ".join([top_k_sections[i]['section']['section_content'] for i in range(num_sections)])
 
-        dqr_predict, comment_predict, confidence_score, prompt_tokens, completion_tokens, cached_tokens = text_to_dqr(language_model, system_prompt, top_5)
+        dqr_predict, comment_predict, confidence_score, prompt_tokens, completion_tokens, cached_tokens = text_to_dqr(language_model, SYSTEM_PROMPT, top_5, cache=completion_cache)
         print(dqr_predict, comment_predict, confidence_score)
         print(f"Prompt tokens: {prompt_tokens}, Completion tokens: {completion_tokens}, Cached tokens: {cached_tokens}")
-        estimated_costs = calculate_cost(language_model, prompt_tokens, completion_tokens, PRICE_DATA)
+        estimated_costs = calculate_cost(language_model, prompt_tokens, completion_tokens, PRICE_DATA_LLM, cached_tokens)
 
         entry = {
             "ID": person["ID"],
@@ -77,6 +83,9 @@ def main():
 
         print(f"Processed {i+1} of {len(data)}")
 
+    completion_cache.print_stats()
+    completion_cache.close()
+
     # Stelle sicher, dass der log_files Ordner existiert
     os.makedirs("log_files", exist_ok=True)
     
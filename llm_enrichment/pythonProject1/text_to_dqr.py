@@ -10,34 +10,42 @@ PRICE_DATA_LLM = {
     "gpt-5": {
         "prompt": 1.25,
         "completion": 10.00,
+        "cached_prompt": 0.125,
     },
     "gpt-4.1": {
         "prompt":     2.00,
         "completion": 8.00,
+        "cached_prompt": 0.50,
     },
     "gpt-4.1-mini": {
         "prompt":     0.40,
         "completion": 1.60,
+        "cached_prompt": 0.10,
     },
     "gpt-4.1-nano": {
         "prompt":     0.10,
         "completion": 0.40,
+        "cached_prompt": 0.025,
     },
     "gpt-4.5-preview": {
         "prompt":     75.00,
         "completion": 150.00,
+        "cached_prompt": 37.50,
     },
     "gpt-4o": {
         "prompt":     2.50,
         "completion": 10.00,
+        "cached_prompt": 1.25,
     },
     "gpt-4o-mini": {
         "prompt":     0.15,
         "completion": 0.60,
+        "cached_prompt": 0.075,
     },
     "o1": {
         "prompt":     15.00,
         "completion": 60.00,
+        "cached_prompt": 7.50,
     },
     "o1-pro": {
         "prompt":     150.00,
@@ -46,18 +54,22 @@ PRICE_DATA_LLM = {
     "o3": {
         "prompt":     10.00,
         "completion": 40.00,
+        "cached_prompt": 2.50,
     },
     "o4-mini": {
         "prompt":     1.10,
         "completion": 4.40,
+        "cached_prompt": 0.275,
     },
     "o3-mini": {
         "prompt":     1.10,
         "completion": 4.40,
+        "cached_prompt": 0.55,
     },
     "o1-mini": {
         "prompt":     1.10,
         "completion": 4.40,
+        "cached_prompt": 0.55,
     },
 }
 
@@ -68,17 +80,20 @@ PRICE_DATA_EMBEDDING = {
     }
 }
 
-def calculate_cost(model, prompt_tokens, completion_tokens, PRICE_DATA):
+def calculate_cost(model, prompt_tokens, completion_tokens, PRICE_DATA, cached_tokens=0):
     # Prüfen ob es sich um ein Embedding-Modell handelt
     if model in PRICE_DATA_EMBEDDING["openai"]:
         # Embedding-Kosten (pro 1000 Token)
         total_tokens = prompt_tokens + completion_tokens
         return total_tokens * PRICE_DATA_EMBEDDING["openai"][model] / 1_000_000
     else:
-        # LLM-Kosten (pro 1M Token)
-        prompt_costs = prompt_tokens * PRICE_DATA[model]["prompt"] / 1_000_000
-        completion_costs = completion_tokens * PRICE_DATA[model]["completion"] / 1_000_000
-        return prompt_costs + completion_costs
+        # LLM-Kosten (pro 1M Token); gecachte Tokens sind in prompt_tokens enthalten
+        prices = PRICE_DATA[model]
+        cached_tokens = cached_tokens or 0
+        prompt_costs = (prompt_tokens - cached_tokens) * prices["prompt"] / 1_000_000
+        cached_costs = cached_tokens * prices.get("cached_prompt", prices["prompt"]) / 1_000_000
+        completion_costs = completion_tokens * prices["completion"] / 1_000_000
+        return prompt_costs + cached_costs + completion_costs
 
 # .env-Datei laden
 load_dotenv()
@@ -240,11 +255,38 @@ def create_sample(path, sample_size):
     return random.sample(lst, sample_size)
 
 
-def text_to_dqr(model, system_prompt, bio_text, temperature=0.1):
+def _parse_result(result):
+    if ";" not in result:
+        raise ValueError(f"Unerwartetes Format: '{result}'")
+    try:
+        dqr_level_str, comment, conf_str = [p.strip() for p in result.split(";", 2)]
+        confidence = None if conf_str == "-" else int(conf_str)
+        return int(dqr_level_str), comment, confidence
+    except Exception as e:
+        raise ValueError(f"Fehler beim Parsen der Modellantwort: '{result}'") from e
+
+
+def text_to_dqr(model, system_prompt, bio_text, temperature=0.1, prompt_cache_key=None, cache=None):
+    """
+    Args:
+        cache: Optionaler CompletionCache (completion_cache.py). Bei einem Treffer wird
+               die gespeicherte Antwort ohne API-Aufruf geparst; Tokens und Kosten sind dann 0.
+    """
 
     if model.startswith("o"):
         temperature = 1.0
 
+    cache_key = None
+    if cache is not None:
+        cache_key, cached = cache.lookup(model, temperature, system_prompt, bio_text)
+        if cached is not None:
+            return (*_parse_result(cached["content"]), 0, 0, 0)
+
+    # System-Prompt zuerst: nur ein identischer Prefix wird vom Provider gecacht
+    request_kwargs = {}
+    if prompt_cache_key:
+        request_kwargs["prompt_cache_key"] = prompt_cache_key
+
     response = openai.chat.completions.create(
         model=model,
         temperature=temperature,
@@ -252,24 +294,27 @@ def text_to_dqr(model, system_prompt, bio_text, temperature=0.1):
         messages=[
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": bio_text}
-        ]
+        ],
+        **request_kwargs
     )
 
     usage = response.usage
     prompt_tokens = usage.prompt_tokens
     completion_tokens = usage.completion_tokens
-    cached_tokens = usage.prompt_tokens_details.cached_tokens
+    details = usage.prompt_tokens_details
+    cached_tokens = (details.cached_tokens or 0) if details else 0
 
     result = result = response.choices[0].message.content.strip()
 
-    if ";" not in result:
-        raise ValueError(f"Unerwartetes Format: '{result}'")
-    try:
-        dqr_level_str, comment, conf_str = [p.strip() for p in result.split(";", 2)]
-        confidence = None if conf_str == "-" else int(conf_str)
-        return int(dqr_level_str), comment, confidence, prompt_tokens, completion_tokens, cached_tokens
-    except Exception as e:
-        raise ValueError(f"Fehler beim Parsen der Modellantwort: '{result}'") from e
+    parsed = _parse_result(result)
+    # Nur parsebare Antworten speichern, sonst würde ein Formatfehler dauerhaft wiederholt
+    if cache is not None:
+        cache.put(cache_key, model, {
+            "content": result,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+        })
+    return (*parsed, prompt_tokens, completion_tokens, cached_tokens)
 
 
 def process_and_log(model, temperature, file_name, data):
@@ -284,8 +329,9 @@ def process_and_log(model, temperature, file_name, data):
         comment_original = minister["Höchster Abschluss nach DQR"]
         bio_text = minister["bio_section"]
         bio_text = "\n\n".join(bio_text)
-        dqr_predict, comment_predict, prompt_tokens, completion_tokens = text_to_dqr(model, temperature, system_prompt, bio_text)
-        estimated_costs = calculate_cost(model, prompt_tokens, completion_tokens, PRICE_DATA)
+        dqr_predict, comment_predict, confidence_score, prompt_tokens, completion_tokens, cached_tokens = text_to_dqr(
+            model, SYSTEM_PROMPT, bio_text, temperature=temperature)
+        estimated_costs = calculate_cost(model, prompt_tokens, completion_tokens, PRICE_DATA_LLM, cached_tokens)
 
         entry = {
             "ID": id,
@@ -298,6 +344,7 @@ def process_and_log(model, temperature, file_name, data):
             "comment_original": comment_original,
             "dqr_predict": dqr_predict,
             "comment_predict": comment_predict,
+            "confidence_score": confidence_score,
             "prompt_tokens": prompt_tokens,
             "completion_tokens": completion_tokens,
             "estimated_costs": estimated_costs
@@ -0,0 +1,234 @@
+import hashlib
+import time
+
+from neo4j import GraphDatabase
+
+from neo4j_writer import write_rows, NEO4J_URI, NEO4J_AUTH
+
+# Ein Vektorindex je Dimension (Label Chunk<dim>), z. B. chunk_embedding_1536 für OpenAI und
+# chunk_embedding_384 für das lokale Modell; innerhalb davon trennt ch.model die Modelle.
+VECTOR_INDEX = "chunk_embedding"
+
+# Chunk-Knoten hängen am Politiker und (falls vorhanden) am Content-Abschnitt, aus dem sie stammen.
+# Der Vektor wird über setNodeVectorProperty als float-Array gespeichert (kompakter als eine Liste).
+# ch.source_hash = Hash der Abschnitte des Politikers beim Embedden (siehe content_hash).
+CHUNK_QUERY = """
+UNWIND $rows AS row
+MATCH (p:Politician)
+WHERE elementId(p) = row.politician_id
+MERGE (ch:Chunk {{id: row.id}})
+SET ch:{label},
+    ch.section_id  = row.section_id,
+    ch.text        = row.text,
+    ch.chunk_index = row.chunk_index,
+    ch.content_id  = row.content_id,
+    ch.model       = row.model,
+    ch.dimensions  = row.dimensions,
+    ch.source_hash = row.source_hash
+MERGE (p)-[:HAS_CHUNK]->(ch)
+WITH ch, row
+CALL db.create.setNodeVectorProperty(ch, 'embedding', row.embedding)
+WITH ch, row
+OPTIONAL MATCH (c:Content {{id: row.content_id}})
+FOREACH (_ IN CASE WHEN c IS NULL THEN [] ELSE [1] END | MERGE (c)-[:HAS_CHUNK]->(ch))
+"""
+
+# Vor dem Neuschreiben: alte Chunks des Politikers (gleiches Modell/gleiche Dimension) entfernen,
+# sonst blieben Chunks weggefallener Abschnitte im Index
+DELETE_CHUNKS_QUERY = """
+UNWIND $ids AS id
+MATCH (p:Politician)-[:HAS_CHUNK]->(ch:Chunk)
+WHERE elementId(p) = id AND ch.model = $model AND ch.dimensions = $dimensions
+DETACH DELETE ch
+"""
+
+CHUNK_CONSTRAINT = "CREATE CONSTRAINT chunk_id IF NOT EXISTS FOR (ch:Chunk) REQUIRE ch.id IS UNIQUE"
+
+# Korpusweite Suche: ANN über den Vektorindex der Dimension, Treffer anderer Modelle fallen weg
+VECTOR_SEARCH_QUERY = """
+CALL db.index.vector.queryNodes($index, $k, $vector) YIELD node, score
+WHERE node.model = $model
+MATCH (p:Politician)-[:HAS_CHUNK]->(node)
+RETURN elementId(p) AS politician_id, p.full_name AS politician_name,
+       node.section_id AS content_id, node.text AS section_content, score
+ORDER BY score DESC
+"""
+
+# Suche innerhalb eines Politikers: queryNodes liefert nur die korpusweiten Top-k, ein Filter
+# danach würde die meisten Politiker leer ausgehen lassen. Die paar Dutzend Chunks eines
+# Politikers werden deshalb exakt per Kosinus verglichen.
+POLITICIAN_SEARCH_QUERY = """
+MATCH (p:Politician)-[:HAS_CHUNK]->(ch:Chunk)
+WHERE elementId(p) = $politician_id AND ch.model = $model AND ch.dimensions = $dimensions
+WITH p, ch, vector.similarity.cosine(ch.embedding, $vector) AS score
+ORDER BY score DESC
+LIMIT $k
+RETURN elementId(p) AS politician_id, p.full_name AS politician_name,
+       ch.section_id AS content_id, ch.text AS section_content, score
+"""
+
+# Aktuell ist ein Politiker nur, wenn alle seine Chunks dieses Modells zum heutigen Inhalt passen
+CHUNKED_POLITICIANS_QUERY = """
+UNWIND $rows AS row
+MATCH (p:Politician)-[:HAS_CHUNK]->(ch:Chunk)
+WHERE elementId(p) = row.id AND ch.model = $model AND ch.dimensions = $dimensions
+WITH row, collect(DISTINCT ch.source_hash) AS hashes
+WHERE hashes = [row.hash]
+RETURN row.id AS id
+"""
+
+
+def content_hash(person):
+    """sha1 über die Content-Abschnitte eines Politikers (ID und Text, in Exportreihenfolge)"""
+    digest = hashlib.sha1()
+    for content in person.get('neo4j_content', []):
+        digest.update(str(content['content_id']).encode("utf-8"))
+        digest.update(b"\x1f")
+        digest.update((content['section_content'] or "").encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def _split_chunk_id(chunk_id):
+    """'#03_<cid>' -> ('<cid>', 3); ungechunkte Abschnitte -> ('<cid>', 0)"""
+    if chunk_id.startswith("#") and "_" in chunk_id:
+        index, content_id = chunk_id[1:].split("_", 1)
+        return content_id, int(index)
+    return chunk_id, 0
+
+
+def _as_results(records):
+    """Neo4j-Treffer im Format von find_top_k_sections"""
+    return [{
+        'section': {
+            'politician_name': r['politician_name'],
+            'content_id': r['content_id'],
+            'section_content': r['section_content'],
+        },
+        'similarity': r['score'],
+        'content_preview': r['section_content'][:300] + "...",
+        'politician_id': r['politician_id'],
+    } for r in records]
+
+
+class ChunkVectorStore:
+    """
+    Chunk-Embeddings als (:Chunk)-Knoten mit Neo4j-Vektorindex.
+
+    Im Enrichment-Lauf sammelt add() die Chunks eines Politikers, flush() schreibt
+    sie gebündelt per UNWIND. Spätere Abfragen (Bildung, Beruf, Religion, ...)
+    brauchen dann nur noch das Query-Embedding statt eines neuen Embedding-Laufs.
+    """
+
+    def __init__(self, driver, model="text-embedding-3-small", dimensions=1536,
+                 similarity="cosine", chunk_size=500):
+        self.driver = driver
+        self.model = model
+        self.dimensions = int(dimensions)
+        self.similarity = similarity
+        self.chunk_size = chunk_size
+        self.index_label = f"Chunk{self.dimensions}"
+        self.index_name = f"{VECTOR_INDEX}_{self.dimensions}"
+        self._rows = []
+        self._replace = set()
+
+    def ensure_index(self):
+        """Constraint auf Chunk.id und Vektorindex dieser Dimension anlegen (idempotent)"""
+        index_query = (
+            f"CREATE VECTOR INDEX {self.index_name} IF NOT EXISTS "
+            f"FOR (ch:{self.index_label}) ON ch.embedding "
+            f"OPTIONS {{indexConfig: {{`vector.dimensions`: {int(self.dimensions)}, "
+            f"`vector.similarity_function`: '{self.similarity}'}}}}"
+        )
+        with self.driver.session() as session:
+            session.run(CHUNK_CONSTRAINT).consume()
+            session.run(index_query).consume()
+
+    def wait_for_index(self, timeout=300):
+        with self.driver.session() as session:
+            session.run("CALL db.awaitIndex($name, $timeout)", name=self.index_name, timeout=timeout).consume()
+
+    # ------------------------------------------------------------------
+    # Schreiben
+    # ------------------------------------------------------------------
+
+    def add(self, person, chunked_sections, embeddings):
+        """Chunks + Embeddings eines Politikers vormerken; ersetzt beim flush() seine bisherigen Chunks"""
+        source_hash = content_hash(person)
+        self._replace.add(person["neo4j_element_id"])
+        for section, vector in zip(chunked_sections, embeddings):
+            content_id, chunk_index = _split_chunk_id(section['content_id'])
+            self._rows.append({
+                # Modell und Dimension im Schlüssel: Chunks verschiedener Backends koexistieren
+                "id": f"{self.model}/{self.dimensions}/{section['content_id']}",
+                "section_id": section['content_id'],
+                "content_id": content_id,
+                "chunk_index": chunk_index,
+                "politician_id": person["neo4j_element_id"],
+                "text": section['section_content'],
+                "model": self.model,
+                "dimensions": self.dimensions,
+                "source_hash": source_hash,
+                "embedding": [float(x) for x in vector],
+            })
+
+    def flush(self):
+        """Alte Chunks der vorgemerkten Politiker löschen, neue schreiben (je chunk_size Zeilen eine Transaktion)"""
+        if not self._rows:
+            return {"rows": 0, "duration": 0.0, "rows_per_sec": 0.0}
+        rows, self._rows = self._rows, []
+        replace, self._replace = list(self._replace), set()
+        with self.driver.session() as session:
+            session.execute_write(lambda tx: tx.run(
+                DELETE_CHUNKS_QUERY, ids=replace, model=self.model, dimensions=self.dimensions).consume())
+        return write_rows(self.driver, CHUNK_QUERY.format(label=self.index_label), rows, self.chunk_size)
+
+    # ------------------------------------------------------------------
+    # Lesen
+    # ------------------------------------------------------------------
+
+    def chunked_politicians(self, people):
+        """
+        IDs der Politiker, deren Chunks dieses Modells schon im Graphen liegen und
+        zum aktuellen Inhalt passen (content_hash); alle anderen werden neu embedded.
+        """
+        rows = [{"id": p["neo4j_element_id"], "hash": content_hash(p)} for p in people]
+        with self.driver.session() as session:
+            result = session.run(CHUNKED_POLITICIANS_QUERY, rows=rows,
+                                 model=self.model, dimensions=self.dimensions)
+            return {record["id"] for record in result}
+
+    def top_k(self, query_embedding, k=10, politician_id=None):
+        """
+        Ähnlichste Chunks zu einem Query-Embedding.
+
+        Mit politician_id: exakte Suche in den Chunks dieses Politikers,
+        sonst korpusweit über db.index.vector.queryNodes.
+        """
+        vector = [float(x) for x in query_embedding]
+        with self.driver.session() as session:
+            if politician_id is None:
+                records = session.run(VECTOR_SEARCH_QUERY, index=self.index_name, k=k, vector=vector,
+                                      model=self.model).data()
+            else:
+                records = session.run(POLITICIAN_SEARCH_QUERY, k=k, vector=vector, politician_id=politician_id,
+                                      model=self.model, dimensions=self.dimensions).data()
+        return _as_results(records)
+
+
+if __name__ == '__main__':
+    # Beispiel: korpusweite Suche nach Bildungsabschnitten über den Index
+    from embedding_retrieval import embed_sections_openai, EDUCATION_QUERY
+
+    driver = GraphDatabase.driver(NEO4J_URI, auth=NEO4J_AUTH)
+    try:
+        store = ChunkVectorStore(driver)
+        store.ensure_index()
+        query_embedding, _ = embed_sections_openai([{'section_content': EDUCATION_QUERY[0]}])
+        start = time.perf_counter()
+        hits = store.top_k(query_embedding[0], k=10)
+        print(f"🔎 {len(hits)} Treffer in {time.perf_counter() - start:.3f} s")
+        for hit in hits:
+            print(f"  {hit['similarity']:.3f} | {hit['section']['politician_name']} | {hit['content_preview'][:80]}")
+    finally:
+        driver.close()
@@ -0,0 +1,113 @@
+"""
+A Neo4j outage must not turn pending sections into "unchanged" ones:
+content hashes are only recorded after the write has committed.
+
+    python -m unittest discover tests
+"""
+
+import tempfile
+import unittest
+from pathlib import Path
+
+from neo4j.exceptions import ServiceUnavailable
+
+from bundestags_scraper.ingest_worker import IngestWorker
+from bundestags_scraper.write_queue import WriteQueue
+
+SECTION = {
+    "item_type": "politician_content",
+    "source_page": "https://de.wikipedia.org/wiki/Erika_Muster",
+    "section_header": "Leben",
+    "section_content": "Erika Muster studierte Rechtswissenschaften.",
+}
+
+
+class _Result:
+    def single(self):
+        return {"changed": True}
+
+    def consume(self):
+        return None
+
+    def __iter__(self):
+        return iter(())
+
+
+class _Tx:
+    def __init__(self, log):
+        self.log = log
+
+    def run(self, query, parameters=None, **kwargs):
+        self.log.append((" ".join(query.split()), kwargs))
+        return _Result()
+
+
+class _Session:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **kwargs):
+        return _Result()
+
+    def execute_write(self, fn, *args):
+        if self.driver.failures:
+            self.driver.failures -= 1
+            raise ServiceUnavailable("injected outage")
+        log = []
+        result = fn(_Tx(log), *args)
+        self.driver.committed.extend(log)   # only a successful call commits
+        return result
+
+
+class _FlakyDriver:
+    """Fails the first ``failures`` write transactions with ServiceUnavailable."""
+
+    def __init__(self, failures=1):
+        self.failures = failures
+        self.committed = []
+
+    def session(self):
+        return _Session(self)
+
+
+class RetryAfterOutageTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.queue = WriteQueue(Path(self._tmp.name) / "queue.sqlite")
+
+    def tearDown(self):
+        self.queue._db.close()
+        self._tmp.cleanup()
+
+    def test_section_is_written_on_retry(self):
+        self.queue.append(SECTION["item_type"], SECTION)
+        driver = _FlakyDriver(failures=1)
+        worker = IngestWorker(self.queue, driver)
+
+        worker.run(follow=False, poll_interval=0)
+
+        content_writes = [kw for query, kw in driver.committed if query.startswith("MERGE (c:Content")]
+        self.assertEqual(len(content_writes), 1)
+        self.assertEqual(content_writes[0]["txt"], SECTION["section_content"])
+        self.assertEqual(worker.skipped, 0)
+        self.assertEqual(self.queue.pending(), 0)
+
+    def test_committed_section_is_skipped_afterwards(self):
+        self.queue.append(SECTION["item_type"], SECTION)
+        self.queue.append(SECTION["item_type"], SECTION)
+        driver = _FlakyDriver(failures=0)
+        worker = IngestWorker(self.queue, driver, batch_size=1)
+
+        worker.run(follow=False, poll_interval=0)
+
+        self.assertEqual(worker.skipped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
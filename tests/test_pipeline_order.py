@@ -0,0 +1,136 @@
+"""
+Domain, page and politician items may reach the batch buffer in any order:
+every statement that creates a BELONGS_TO_DOMAIN edge MERGEs both of its
+ends, so no edge depends on the domain batch having been flushed first.
+
+    python -m unittest discover tests
+"""
+
+import random
+import unittest
+from urllib.parse import urlparse
+
+from bundestags_scraper.pipelines import _BatchBuffer
+
+_SUFFIX = ".order.invalid"
+
+
+class _Result:
+    def single(self):
+        return {"changed": True}
+
+    def consume(self):
+        return None
+
+    def __iter__(self):
+        return iter(())
+
+
+class _Tx:
+    def __init__(self, log):
+        self.log = log
+
+    def run(self, query, parameters=None, **kwargs):
+        self.log.append((" ".join(query.split()), kwargs))
+        return _Result()
+
+
+class _Session:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, fn, *args):
+        return fn(_Tx(self.driver.committed), *args)
+
+
+class _Driver:
+    def __init__(self):
+        self.committed = []
+
+    def session(self):
+        return _Session(self)
+
+
+def make_items(n_domains: int, pages_per_domain: int):
+    items = []
+    for i in range(n_domains):
+        domain = f"d{i}{_SUFFIX}"
+        items.append(("domain", {"item_type": "domain", "domain": domain,
+                                 "description": f"Domain {i}"}))
+        for j in range(pages_per_domain):
+            items.append(("page", {
+                "item_type": "page", "url": f"https://{domain}/p{j}",
+                "title": f"Page {j}", "full_html": "<html></html>",
+                "source_domain": domain,
+            }))
+        items.append(("politician", {
+            "item_type": "politician", "full_name": f"Erika Muster {i}",
+            "source_page": f"https://{domain}/p0",
+            "detail_page": f"https://{domain}/Erika_Muster_{i}",
+            "legislative_period_number": 20, "political_party": "SPD",
+        }))
+    return items
+
+
+def domain_edges(committed):
+    """(page url, domain) of every BELONGS_TO_DOMAIN edge that was written."""
+    edges = set()
+    for query, kw in committed:
+        if "BELONGS_TO_DOMAIN" not in query:
+            continue
+        if query.startswith("UNWIND"):
+            edges.update((row["url"], row["dom"]) for row in kw["rows"])
+        else:
+            edges.add((kw["url"], kw["domain"]))
+    return edges
+
+
+class PageOrderTest(unittest.TestCase):
+    def test_edge_statements_merge_both_ends(self):
+        for seed in range(5):
+            with self.subTest(seed=seed):
+                rng = random.Random(seed)
+                items = make_items(n_domains=6, pages_per_domain=8)
+                rng.shuffle(items)
+
+                driver = _Driver()
+                buffer = _BatchBuffer(driver, batch_size=rng.randint(1, 7))
+                for item_type, data in items:
+                    buffer.add(item_type, data)
+                    if rng.random() < 0.05:
+                        buffer.flush_all()
+                buffer.flush_all()
+
+                edge_queries = [q for q, _ in driver.committed if "BELONGS_TO_DOMAIN" in q]
+                self.assertTrue(edge_queries)
+                for query in edge_queries:
+                    self.assertIn("MERGE (d:Domain", query)
+                    self.assertRegex(query, r"MERGE \(pg?:Page")
+
+                expected = set()
+                for item_type, data in items:
+                    if item_type == "page":
+                        expected.add((data["url"], data["source_domain"]))
+                    elif item_type == "politician":
+                        for url in (data["source_page"], data["detail_page"]):
+                            expected.add((url, urlparse(url).netloc))
+                self.assertEqual(domain_edges(driver.committed), expected)
+
+                descriptions = {
+                    row["name"]: row["desc"]
+                    for q, kw in driver.committed if q.startswith("UNWIND $rows AS row MERGE (d:Domain {name:row.name})")
+                    for row in kw["rows"]
+                }
+                self.assertEqual(descriptions, {
+                    data["domain"]: data["description"] for t, data in items if t == "domain"
+                })
+
+
+if __name__ == "__main__":
+    unittest.main()